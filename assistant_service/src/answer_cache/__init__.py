@@ -0,0 +1,172 @@
+import re
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import numpy as np
+from core.logger import get_logger
+from intent import QUERY_PREFIX
+
+logger = get_logger(__name__)
+
+SPACES_PATTERN = re.compile(r"\s+")
+
+
+def normalize_question(text: str) -> str:
+    """Вопрос без регистра, лишних пробелов и знаков препинания на концах, "ё" заменена на "е"."""
+    return SPACES_PATTERN.sub(" ", text.lower().replace("ё", "е")).strip(" ?!.,;:\"'«»")
+
+
+@dataclass
+class CachedAnswer:
+    question: str
+    system_prompt: str
+    reply: str
+    version: int
+    expires_at: float
+    used_at: float
+
+
+@dataclass
+class AnswerLookup:
+    question: str
+    vector: np.ndarray
+    version: int
+    answer: CachedAnswer | None = None
+    similarity: float = 0.0
+
+
+class SemanticAnswerCache:
+    def __init__(self,
+                 encode: Callable[[list[str]], Awaitable[list[list[float]]]],
+                 get_version: Callable[[], Awaitable[int]],
+                 min_similarity: float,
+                 ttl: float,
+                 max_entries: int,
+                 version_check_interval: float = 0):
+        """
+        Кэш ответов ассистента по смыслу вопроса.
+
+        Вопросы хранятся нормированными векторами в одной матрице, поиск ближайшего -
+        точное скалярное произведение, для нескольких тысяч записей это быстрее любого ANN индекса.
+        Записи живут ttl секунд, при переполнении вытесняется давно не использованная запись,
+        при смене версии коллекции документов кэш очищается целиком.
+
+        Args:
+            encode: кодирование списка текстов одним вызовом
+            get_version: текущая версия коллекции документов
+            min_similarity: минимальная косинусная близость вопросов для попадания
+            ttl: время жизни ответа в секундах, 0 - без ограничения
+            max_entries: максимум ответов в кэше
+            version_check_interval: интервал перечитывания версии коллекции в секундах
+        """
+        self._encode = encode
+        self._get_version = get_version
+        self.min_similarity = min_similarity
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version_check_interval = version_check_interval
+
+        self._vectors: np.ndarray | None = None
+        self._answers: list[CachedAnswer | None] = [None] * max_entries
+        self._version: int | None = None
+        self._version_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return sum(answer is not None for answer in self._answers)
+
+    def clear(self) -> None:
+        self._answers = [None] * self.max_entries
+        if self._vectors is not None:
+            self._vectors[:] = 0
+
+    async def _check_version(self) -> int:
+        now = time.monotonic()
+        if self._version is not None and now - self._version_checked_at < self.version_check_interval:
+            return self._version
+
+        version = await self._get_version()
+        self._version_checked_at = now
+        if version != self._version:
+            if self._version is not None:
+                logger.info(f"Document collection version changed: {self._version} -> {version}, "
+                            f"{len(self)} cached answers dropped")
+            self.clear()
+            self._version = version
+        return version
+
+    async def lookup(self, question: str) -> AnswerLookup:
+        """
+        Ищет ответ на близкий вопрос.
+
+        Args:
+            question (str): вопрос пользователя
+
+        Returns:
+            AnswerLookup: вектор вопроса для store и найденный ответ, если он есть
+        """
+        version = await self._check_version()
+        normalized = normalize_question(question)
+        vector = np.asarray((await self._encode([QUERY_PREFIX + normalized]))[0], dtype=np.float32)
+        vector /= np.linalg.norm(vector) or 1.0
+        lookup = AnswerLookup(question=normalized, vector=vector, version=version)
+
+        if self._vectors is not None:
+            now = time.monotonic()
+            for slot, answer in enumerate(self._answers):
+                if answer is not None and answer.expires_at and answer.expires_at < now:
+                    self._answers[slot] = None
+                    self._vectors[slot] = 0
+
+            similarities = self._vectors @ vector
+            slot = int(np.argmax(similarities))
+            answer = self._answers[slot]
+            lookup.similarity = float(similarities[slot])
+            if answer is not None and lookup.similarity >= self.min_similarity:
+                answer.used_at = now
+                lookup.answer = answer
+
+        if lookup.answer is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        logger.info(f"Answer cache {'hit' if lookup.answer else 'miss'}, similarity {lookup.similarity:.3f}, "
+                    f"hit rate {self.hit_rate:.0%}")
+        return lookup
+
+    def store(self, lookup: AnswerLookup, system_prompt: str, reply: str) -> None:
+        """
+        Сохраняет ответ на вопрос, найденный по lookup.
+
+        Ответ, полученный до смены версии коллекции, не сохраняется.
+
+        Args:
+            lookup (AnswerLookup): результат lookup этого вопроса
+            system_prompt (str): системный промпт с контекстом RAG
+            reply (str): ответ ассистента
+        """
+        if lookup.version != self._version:
+            return
+
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, lookup.vector.shape[0]), dtype=np.float32)
+
+        # Свободное место или давно не использованный ответ
+        free = [slot for slot, answer in enumerate(self._answers) if answer is None]
+        slot = free[0] if free else min(range(self.max_entries), key=lambda i: self._answers[i].used_at)
+
+        now = time.monotonic()
+        self._vectors[slot] = lookup.vector
+        self._answers[slot] = CachedAnswer(question=lookup.question,
+                                           system_prompt=system_prompt,
+                                           reply=reply,
+                                           version=lookup.version,
+                                           expires_at=now + self.ttl if self.ttl else 0,
+                                           used_at=now)
@@ -1,8 +1,10 @@
+import json
 from http import HTTPStatus
 
 from core.logger import get_logger
 from dialog_manager import DialogManager, get_db_dialogue_manager
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from schemes import ChatMessage, ReplyResponseModel, UserMessage
 from services.auth import AuthService, get_auth_service
@@ -14,6 +16,11 @@ security = HTTPBearer()
 logger = get_logger(__name__)
 
 
+def _sse_event(data: dict, event: str | None = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @router.post("/chat",
              status_code=HTTPStatus.OK,
              response_model=ReplyResponseModel)
@@ -45,3 +52,42 @@ async def chat(
     await dialog_manager.save_dialog(dialog_id=dialog_id, messages=messages)
 
     return ReplyResponseModel(messages=messages)
+
+
+@router.post("/chat/stream",
+             status_code=HTTPStatus.OK,
+             response_class=StreamingResponse)
+async def chat_stream(
+        request: Request,
+        question_message: UserMessage | list[ChatMessage],
+        credentials: HTTPAuthorizationCredentials = Depends(security),
+        chat_service: ChatService = Depends(get_chat_service),
+        auth_service: AuthService = Depends(get_auth_service),
+        dialog_manager: DialogManager = Depends(get_db_dialogue_manager)
+):
+    """Ответ потоком server-sent events: delta для каждой части ответа, в конце done с сообщениями диалога или error."""
+    access_token = credentials.credentials
+    user = await auth_service.get_current_user(
+        access_token,
+        request_id=request.headers.get('X-Request-Id'),
+        external_validation=True
+    )
+
+    dialog_id = await dialog_manager.create_dialog(user.email)
+    messages = [question_message]
+
+    async def events():
+        try:
+            async for delta in chat_service.stream_answer(messages=messages, user=user.email):
+                yield _sse_event({"delta": delta})
+        except ServiceException:
+            yield _sse_event({"detail": HTTPStatus.INTERNAL_SERVER_ERROR.phrase}, event="error")
+            return
+
+        # Диалог сохраняется только после полного ответа
+        await dialog_manager.save_dialog(dialog_id=dialog_id, messages=messages)
+        yield _sse_event(ReplyResponseModel(messages=messages).model_dump(mode="json"), event="done")
+
+    return StreamingResponse(events(),
+                             media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
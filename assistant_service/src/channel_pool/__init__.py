@@ -0,0 +1,40 @@
+from itertools import count
+from typing import Any
+
+import grpc
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ChannelPool:
+    def __init__(self, address: str, size: int = 1, options: dict[str, Any] | None = None):
+        """
+        Пул долгоживущих gRPC каналов к одному адресу.
+
+        Каналы открываются один раз при старте сервиса, вызовы распределяются по ним по кругу.
+
+        Args:
+            address: Адрес сервиса host:port
+            size: Количество каналов в пуле
+            options: Опции gRPC канала
+        """
+        self.address = address
+        # Отдельный пул сабканалов, иначе каналы с одинаковыми параметрами делят одно TCP соединение
+        options = {"grpc.use_local_subchannel_pool": 1, **(options or {})}
+        self._channels = [grpc.aio.insecure_channel(address, options=list(options.items())) for _ in range(size)]
+        self._counter = count()
+        logger.info(f"Opened gRPC channel pool: {size} channels to {address}")
+
+    @property
+    def channel(self) -> grpc.aio.Channel:
+        if not self._channels:
+            msg = f"gRPC channel pool to {self.address} is closed."
+            raise RuntimeError(msg)
+        return self._channels[next(self._counter) % len(self._channels)]
+
+    async def close(self) -> None:
+        for channel in self._channels:
+            await channel.close()
+        self._channels = []
+        logger.info(f"gRPC channel pool to {self.address} closed.")
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,6 +21,9 @@ class AuthServiceSettings(BaseSettings):
 class IntentSettings(BaseSettings):
     SERVICE: Annotated[int, Field(gt=0, lt=5)]
     MODEL: Annotated[str, Field(min_length=1)]
+    LOCAL_ENABLED: bool = True  # Classify confident messages by example centroids without the LLM.
+    LOCAL_MIN_SIMILARITY: Annotated[float, Field(ge=0, le=1)] = 0.88  # e5 cosine similarities are high.
+    LOCAL_MIN_MARGIN: Annotated[float, Field(ge=0, le=1)] = 0.03  # Over the second best intent.
 
     model_config = SettingsConfigDict(
         env_prefix='INTENT_',
@@ -34,6 +37,13 @@ class RAGSettings(BaseSettings):
     SERVICE: Annotated[int, Field(gt=0, lt=5)]
     MODEL: Annotated[str, Field(min_length=1)]
     MAX_TOKEN: Annotated[int, Field(gt=0, lt=65_536)]
+    SEARCH_MODE: Literal["dense", "hybrid", "sparse"] = "dense"  # Hybrid needs a collection with BM25 vectors.
+    SEARCH_LIMIT: Annotated[int, Field(gt=0, le=10)] = 5  # Fragments added to the RAG prompt.
+    RERANK: bool = False  # Needs RERANK_ENABLED=true in text_vector_service.
+    CONTEXT_TOKENS: Annotated[int, Field(gt=0)] = 2_000  # Token budget of fragments in the RAG prompt.
+    MODEL_CONTEXT_TOKENS: dict[str, int] = {}  # Per-model budgets, JSON: {"gpt-4o-mini": 4000}.
+    SPECULATIVE: bool = True  # Search by the raw message while the LLM classifies the intent.
+    SPECULATIVE_MIN_SIMILARITY: Annotated[float, Field(ge=0, le=1)] = 0.92  # Raw vs rewritten query.
 
     model_config = SettingsConfigDict(
         env_prefix='RAG_',
@@ -42,10 +52,47 @@ class RAGSettings(BaseSettings):
         env_file_encoding='utf-8'
     )
 
+    @property
+    def context_budget(self) -> int:
+        return self.MODEL_CONTEXT_TOKENS.get(self.MODEL, self.CONTEXT_TOKENS)
+
+
+class GRPCClientSettings(BaseSettings):
+    POOL_SIZE: Annotated[int, Field(gt=0)] = 2  # Persistent channels, calls are spread round-robin.
+    TIMEOUT: Annotated[float, Field(gt=0)] = 30  # Call deadline in seconds.
+    KEEPALIVE_TIME_MS: Annotated[int, Field(gt=0)] = 60_000
+    KEEPALIVE_TIMEOUT_MS: Annotated[int, Field(gt=0)] = 10_000
+
+    @property
+    def channel_options(self) -> dict[str, int]:
+        # Пинги только во время вызовов: серверы grpc по умолчанию отвечают GOAWAY на частые пинги без вызовов
+        return {
+            "grpc.keepalive_time_ms": self.KEEPALIVE_TIME_MS,
+            "grpc.keepalive_timeout_ms": self.KEEPALIVE_TIMEOUT_MS,
+            "grpc.keepalive_permit_without_calls": 0,
+        }
+
+
+class AnswerCacheSettings(BaseSettings):
+    ENABLED: bool = True
+    MIN_SIMILARITY: Annotated[float, Field(ge=0, le=1)] = 0.95  # Cosine similarity of normalized questions.
+    TTL: Annotated[int, Field(ge=0)] = 86_400  # Seconds, 0 - no expiration.
+    MAX_ENTRIES: Annotated[int, Field(gt=0)] = 2_000
+    COLLECTION: Annotated[str, Field(min_length=1)] = "docs"  # Answers are dropped when its version changes.
+    VERSION_CHECK_INTERVAL: Annotated[float, Field(ge=0)] = 5  # Seconds between collection version reads.
+
+    model_config = SettingsConfigDict(
+        env_prefix='ANSWER_CACHE_',
+        env_file='.env',
+        extra='ignore',
+        env_file_encoding='utf-8'
+    )
+
 
-class LLMService(BaseSettings):
+class LLMService(GRPCClientSettings):
     HOST: Annotated[str, Field(min_length=1)]
     PORT: Annotated[int, Field(gt=1023, lt=65536)]
+    TIMEOUT: Annotated[float, Field(gt=0)] = 120  # Completions of long answers.
     DEFAULT_SERVICE: Annotated[int, Field(gt=0, lt=5)]
     DEFAULT_MODEL: Annotated[str, Field(min_length=1)]
 
@@ -61,9 +108,10 @@ class LLMService(BaseSettings):
         return f"{self.HOST}:{self.PORT}"
 
 
-class TextVectorService(BaseSettings):
+class TextVectorService(GRPCClientSettings):
     HOST: Annotated[str, Field(min_length=1)]
     PORT: Annotated[int, Field(gt=1023, lt=65536)]
+    TIMEOUT: Annotated[float, Field(gt=0)] = 10
     DEFAULT_MODEL: Annotated[str, Field(min_length=1)]
 
     model_config = SettingsConfigDict(
@@ -111,6 +159,7 @@ class Settings(BaseSettings):
     TEXT_VECTOR: TextVectorService = TextVectorService()
     INTENT: IntentSettings = IntentSettings()
     RAG: RAGSettings = RAGSettings()
+    ANSWER_CACHE: AnswerCacheSettings = AnswerCacheSettings()
 
     model_config = SettingsConfigDict(
         env_prefix='SERVICE_',
@@ -24,19 +24,27 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17similarity_search.proto\x12\x11similarity_search\"@\n\rSearchRequest\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x12\n\ncollection\x18\x02 \x01(\t\x12\r\n\x05limit\x18\x03 \x01(\x05\";\n\x0e\x46ragmentResult\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x0c\n\x04meta\x18\x02 \x01(\t\x12\r\n\x05score\x18\x03 \x01(\x02\"N\n\x0eSearchResponse\x12<\n\x11similar_fragments\x18\x01 \x03(\x0b\x32!.similarity_search.FragmentResult2x\n\x17SimilaritySearchService\x12]\n\x16SearchSimilarFragments\x12 .similarity_search.SearchRequest\x1a!.similarity_search.SearchResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17similarity_search.proto\x12\x11similarity_search\"b\n\x0cSearchFilter\x12\x0c\n\x04lang\x18\x01 \x01(\t\x12\x10\n\x08page_ids\x18\x02 \x03(\x03\x12\x19\n\x11time_request_from\x18\x03 \x01(\t\x12\x17\n\x0ftime_request_to\x18\x04 \x01(\t\"\xe6\x02\n\rSearchRequest\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x12\n\ncollection\x18\x02 \x01(\t\x12\r\n\x05limit\x18\x03 \x01(\x05\x12\x0f\n\x07hnsw_ef\x18\x04 \x01(\x05\x12\x12\n\x05\x65xact\x18\x05 \x01(\x08H\x00\x88\x01\x01\x12+\n\x04mode\x18\x06 \x01(\x0e\x32\x1d.similarity_search.SearchMode\x12\x0e\n\x06rerank\x18\x07 \x01(\x08\x12\x12\n\ncandidates\x18\x08 \x01(\x05\x12/\n\x06\x66ilter\x18\t \x01(\x0b\x32\x1f.similarity_search.SearchFilter\x12\x14\n\x0cwith_payload\x18\n \x03(\t\x12\x17\n\x0fscore_threshold\x18\x0b \x01(\x02\x12\x13\n\x0bgroup_pages\x18\x0c \x01(\x08\x12\x1b\n\x13max_chunks_per_page\x18\r \x01(\x05\x12\x12\n\nmax_tokens\x18\x0e \x01(\x05\x42\x08\n\x06_exact\"\xbc\x01\n\x0e\x46ragmentResult\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\r\n\x05score\x18\x03 \x01(\x02\x12\x0f\n\x07page_id\x18\x04 \x01(\x03\x12\r\n\x05title\x18\x05 \x01(\t\x12\x14\n\x0ctime_request\x18\x06 \x01(\t\x12\x13\n\x0brevision_id\x18\x07 \x01(\x03\x12\x13\n\x0b\x63hunk_index\x18\x08 \x01(\x05\x12\x0c\n\x04lang\x18\t \x01(\t\x12\x13\n\x0b\x63hunk_count\x18\n \x01(\x05J\x04\x08\x02\x10\x03R\x04meta\"N\n\x0eSearchResponse\x12<\n\x11similar_fragments\x18\x01 \x03(\x0b\x32!.similarity_search.FragmentResult\".\n\x18\x43ollectionVersionRequest\x12\x12\n\ncollection\x18\x01 \x01(\t\",\n\x19\x43ollectionVersionResponse\x12\x0f\n\x07version\x18\x01 \x01(\x03*S\n\nSearchMode\x12\x15\n\x11SEARCH_MODE_DENSE\x10\x00\x12\x16\n\x12SEARCH_MODE_HYBRID\x10\x01\x12\x16\n\x12SEARCH_MODE_SPARSE\x10\x02\x32\xeb\x01\n\x17SimilaritySearchService\x12]\n\x16SearchSimilarFragments\x12 .similarity_search.SearchRequest\x1a!.similarity_search.SearchResponse\x12q\n\x14GetCollectionVersion\x12+.similarity_search.CollectionVersionRequest\x1a,.similarity_search.CollectionVersionResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'similarity_search_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_SEARCHREQUEST']._serialized_start=46
-  _globals['_SEARCHREQUEST']._serialized_end=110
-  _globals['_FRAGMENTRESULT']._serialized_start=112
-  _globals['_FRAGMENTRESULT']._serialized_end=171
-  _globals['_SEARCHRESPONSE']._serialized_start=173
-  _globals['_SEARCHRESPONSE']._serialized_end=251
-  _globals['_SIMILARITYSEARCHSERVICE']._serialized_start=253
-  _globals['_SIMILARITYSEARCHSERVICE']._serialized_end=373
+  _globals['_SEARCHMODE']._serialized_start=872
+  _globals['_SEARCHMODE']._serialized_end=955
+  _globals['_SEARCHFILTER']._serialized_start=46
+  _globals['_SEARCHFILTER']._serialized_end=144
+  _globals['_SEARCHREQUEST']._serialized_start=147
+  _globals['_SEARCHREQUEST']._serialized_end=505
+  _globals['_FRAGMENTRESULT']._serialized_start=508
+  _globals['_FRAGMENTRESULT']._serialized_end=696
+  _globals['_SEARCHRESPONSE']._serialized_start=698
+  _globals['_SEARCHRESPONSE']._serialized_end=776
+  _globals['_COLLECTIONVERSIONREQUEST']._serialized_start=778
+  _globals['_COLLECTIONVERSIONREQUEST']._serialized_end=824
+  _globals['_COLLECTIONVERSIONRESPONSE']._serialized_start=826
+  _globals['_COLLECTIONVERSIONRESPONSE']._serialized_end=870
+  _globals['_SIMILARITYSEARCHSERVICE']._serialized_start=958
+  _globals['_SIMILARITYSEARCHSERVICE']._serialized_end=1193
 # @@protoc_insertion_point(module_scope)
@@ -39,6 +39,11 @@ class SimilaritySearchServiceStub(object):
                 request_serializer=similarity__search__pb2.SearchRequest.SerializeToString,
                 response_deserializer=similarity__search__pb2.SearchResponse.FromString,
                 _registered_method=True)
+        self.GetCollectionVersion = channel.unary_unary(
+                '/similarity_search.SimilaritySearchService/GetCollectionVersion',
+                request_serializer=similarity__search__pb2.CollectionVersionRequest.SerializeToString,
+                response_deserializer=similarity__search__pb2.CollectionVersionResponse.FromString,
+                _registered_method=True)
 
 
 class SimilaritySearchServiceServicer(object):
@@ -50,6 +55,12 @@ class SimilaritySearchServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetCollectionVersion(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_SimilaritySearchServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -58,6 +69,11 @@ def add_SimilaritySearchServiceServicer_to_server(servicer, server):
                     request_deserializer=similarity__search__pb2.SearchRequest.FromString,
                     response_serializer=similarity__search__pb2.SearchResponse.SerializeToString,
             ),
+            'GetCollectionVersion': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetCollectionVersion,
+                    request_deserializer=similarity__search__pb2.CollectionVersionRequest.FromString,
+                    response_serializer=similarity__search__pb2.CollectionVersionResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'similarity_search.SimilaritySearchService', rpc_method_handlers)
@@ -95,3 +111,30 @@ class SimilaritySearchService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def GetCollectionVersion(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/similarity_search.SimilaritySearchService/GetCollectionVersion',
+            similarity__search__pb2.CollectionVersionRequest.SerializeToString,
+            similarity__search__pb2.CollectionVersionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,103 @@
+import asyncio
+import math
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from core.logger import get_logger
+
+from .examples import INTENT_EXAMPLES
+
+logger = get_logger(__name__)
+
+# Префикс запросов модели e5, одинаковый для примеров и сообщений пользователя
+QUERY_PREFIX = "query: "
+
+
+def _normalize(vector: list[float]) -> list[float]:
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def _centroid(vectors: list[list[float]]) -> list[float]:
+    return _normalize([sum(values) / len(vectors) for values in zip(*vectors)])
+
+
+@dataclass
+class IntentPrediction:
+    name: str
+    similarity: float
+    margin: float
+    confident: bool
+
+
+class IntentClassifier:
+    def __init__(self, encode: Callable[[list[str]], Awaitable[list[list[float]]]], min_similarity: float,
+                 min_margin: float, examples: dict[str, list[str]] | None = None):
+        """
+        Локальная классификация интента по центроидам размеченных примеров.
+
+        Сообщение кодируется тем же энкодером, что и поиск, и сравнивается косинусом
+        с центроидом примеров каждого интента. Уверенным считается ответ с высокой близостью
+        и отрывом от второго интента, остальные сообщения классифицирует LLM.
+
+        Args:
+            encode: кодирование списка текстов одним вызовом
+            min_similarity: минимальная близость к центроиду лучшего интента
+            min_margin: минимальный отрыв лучшего интента от второго
+            examples: примеры по интентам, по умолчанию INTENT_EXAMPLES
+        """
+        self._encode = encode
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.examples = examples or INTENT_EXAMPLES
+        self._centroids: dict[str, list[float]] | None = None
+        self._lock = asyncio.Lock()
+        self.requests = 0
+        self.fast_path = 0
+
+    async def _get_centroids(self) -> dict[str, list[float]]:
+        # Примеры кодируются при первом запросе: энкодер может ещё не работать при старте сервиса
+        async with self._lock:
+            if self._centroids is None:
+                names = list(self.examples)
+                texts = [QUERY_PREFIX + text for name in names for text in self.examples[name]]
+                vectors = [_normalize(vector) for vector in await self._encode(texts)]
+
+                centroids, start = {}, 0
+                for name in names:
+                    end = start + len(self.examples[name])
+                    centroids[name] = _centroid(vectors[start:end])
+                    start = end
+                self._centroids = centroids
+                logger.info(f"Intent centroids are built from {len(texts)} examples")
+        return self._centroids
+
+    async def classify(self, text: str) -> IntentPrediction:
+        """
+        Args:
+            text (str): сообщение пользователя
+
+        Returns:
+            IntentPrediction: лучший интент, его близость и отрыв от второго
+        """
+        centroids = await self._get_centroids()
+        vector = _normalize((await self._encode([QUERY_PREFIX + text]))[0])
+
+        similarities = sorted(((sum(a * b for a, b in zip(vector, centroid)), name)
+                               for name, centroid in centroids.items()), reverse=True)
+        similarity, name = similarities[0]
+        margin = similarity - similarities[1][0] if len(similarities) > 1 else similarity
+        return IntentPrediction(name=name,
+                                similarity=similarity,
+                                margin=margin,
+                                confident=similarity >= self.min_similarity and margin >= self.min_margin)
+
+    @property
+    def fast_path_share(self) -> float:
+        return self.fast_path / self.requests if self.requests else 0.0
+
+    def record(self, fast_path: bool) -> None:
+        """Учитывает запрос, обработанный без LLM-классификации (fast_path) или с ней."""
+        self.requests += 1
+        self.fast_path += fast_path
+        logger.info(f"Intent fast path: {self.fast_path} of {self.requests} requests ({self.fast_path_share:.0%})")
@@ -1,7 +1,9 @@
 import sys
 import warnings
+from collections.abc import AsyncIterator
 from pathlib import Path
 
+from channel_pool import ChannelPool
 from core.logger import get_logger
 from llm.exception import LLMException
 from schemes import LLMResponse
@@ -26,10 +28,14 @@ from grpc_generated import (
 
 
 class LLMClient:
-    def __init__(self, address: str):
+    def __init__(self, address: str, pool_size: int = 1, timeout: float | None = None,
+                 channel_options: dict | None = None):
         self.address = address
-        self.channel: grpc.aio.Channel | None = None
-        self.stub: llm_pb2_grpc.LlmServiceStub | None = None
+        self.timeout = timeout
+        self._pool = ChannelPool(address, size=pool_size, options=channel_options)
+
+    async def close(self) -> None:
+        await self._pool.close()
 
     async def get_completion(
             self,
@@ -39,29 +45,55 @@ class LLMClient:
             max_tokens: int,
             messages: str
     ) -> LLMResponse:
-        async with grpc.aio.insecure_channel(self.address) as channel:
-            stub = llm_pb2_grpc.LlmServiceStub(channel)
-
-            request = llm_pb2.LLMRequest(
-                service=service,
-                model=model,
-                system=system,
-                max_tokens=max_tokens,
-                messages=messages
+        stub = llm_pb2_grpc.LlmServiceStub(self._pool.channel)
+
+        request = llm_pb2.LLMRequest(
+            service=service,
+            model=model,
+            system=system,
+            max_tokens=max_tokens,
+            messages=messages
+        )
+
+        try:
+            response: llm_pb2.LLMResponse = await stub.GetCompletion(request, timeout=self.timeout)
+
+            return LLMResponse(
+                status_code=response.status_code,
+                reply=response.reply,
+                response=response.response
             )
+        except grpc.aio.AioRpcError as e:
+            msg = f"gRPC error: {e.code()} - {e.details()}"
+            logger.error(msg)
+            raise LLMException(msg)
 
-            try:
-                response: llm_pb2.LLMResponse = await stub.GetCompletion(request)
-
-                return LLMResponse(
-                    status_code=response.status_code,
-                    reply=response.reply,
-                    response=response.response
-                )
-            except grpc.aio.AioRpcError as e:
-                msg = f"gRPC error: {e.code()} - {e.details()}"
-                logger.error(msg)
-                raise LLMException(msg)
+    async def stream_completion(
+            self,
+            service: llm_pb2.ApiServiceName,
+            model: str,
+            system: str,
+            max_tokens: int,
+            messages: str
+    ) -> AsyncIterator[str]:
+        stub = llm_pb2_grpc.LlmServiceStub(self._pool.channel)
+
+        request = llm_pb2.LLMRequest(
+            service=service,
+            model=model,
+            system=system,
+            max_tokens=max_tokens,
+            messages=messages
+        )
+
+        try:
+            async for chunk in stub.StreamCompletion(request, timeout=self.timeout):
+                if chunk.delta:
+                    yield chunk.delta
+        except grpc.aio.AioRpcError as e:
+            msg = f"gRPC error: {e.code()} - {e.details()}"
+            logger.error(msg)
+            raise LLMException(msg)
 
     async def get_functions(
             self,
@@ -74,29 +106,28 @@ class LLMClient:
             function_call: str
     ) -> LLMResponse:
 
-        async with grpc.aio.insecure_channel(self.address) as channel:
-            stub = llm_pb2_grpc.LlmServiceStub(channel)
-
-            request = llm_pb2.LLMFunctionRequest(
-                service=service,
-                model=model,
-                system=system,
-                max_tokens=max_tokens,
-                messages=messages,
-                functions=functions,
-                function_call=function_call
+        stub = llm_pb2_grpc.LlmServiceStub(self._pool.channel)
+
+        request = llm_pb2.LLMFunctionRequest(
+            service=service,
+            model=model,
+            system=system,
+            max_tokens=max_tokens,
+            messages=messages,
+            functions=functions,
+            function_call=function_call
+        )
+
+        try:
+            response: llm_pb2.LLMFunctionResponse = await stub.GetFunctions(request, timeout=self.timeout)
+            logger.info(response)
+
+            return LLMResponse(
+                status_code=response.status_code,
+                reply=response.reply,
+                response=response.response
             )
-
-            try:
-                response: llm_pb2.LLMFunctionResponse = await stub.GetFunctions(request)
-                logger.info(response)
-
-                return LLMResponse(
-                    status_code=response.status_code,
-                    reply=response.reply,
-                    response=response.response
-                )
-            except grpc.aio.AioRpcError as e:
-                msg = f"gRPC error: {e.code()} - {e.details()}"
-                logger.error(msg)
-                raise LLMException(msg)
+        except grpc.aio.AioRpcError as e:
+            msg = f"gRPC error: {e.code()} - {e.details()}"
+            logger.error(msg)
+            raise LLMException(msg)
@@ -19,14 +19,23 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Service started")
     app.state.mongo = AsyncMongoClient(settings.MONGO.uri)
-    app.state.llm = LLMClient(address=settings.LLM.address)
-    app.state.text_vector = TextVectorClient(address=settings.TEXT_VECTOR.address)
+    # Каналы открываются один раз и переиспользуются всеми запросами
+    app.state.llm = LLMClient(address=settings.LLM.address,
+                              pool_size=settings.LLM.POOL_SIZE,
+                              timeout=settings.LLM.TIMEOUT,
+                              channel_options=settings.LLM.channel_options)
+    app.state.text_vector = TextVectorClient(address=settings.TEXT_VECTOR.address,
+                                             pool_size=settings.TEXT_VECTOR.POOL_SIZE,
+                                             timeout=settings.TEXT_VECTOR.TIMEOUT,
+                                             channel_options=settings.TEXT_VECTOR.channel_options)
 
     # Shutdown
     try:
         yield
     finally:
 
+        await app.state.llm.close()
+        await app.state.text_vector.close()
         await app.state.mongo.close()
         logger.info("Service stopped")
 
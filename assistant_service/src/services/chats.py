@@ -1,15 +1,21 @@
+import asyncio
 import json
+from collections.abc import AsyncIterator
 from functools import lru_cache
 
+from answer_cache import AnswerLookup, SemanticAnswerCache
 from core.config import settings
 from core.logger import get_logger
 from dependencies import get_llm_client, get_text_vector_client
 from fastapi import Depends
 from grpc.aio import AioRpcError
+from intent import QUERY_PREFIX, IntentClassifier
 from llm import LLMClient
 from prompts import get_system_prompt_for_function, get_system_prompt_for_rag
 from schemes import AssistantMessage, SystemMessage, UserMessage
+from services.context_packer import ContextPacker
 from services.exception import ChatException
+from utilities import cosine_similarity
 
 from text_vector_service import TextVectorClient
 
@@ -20,10 +26,119 @@ class ChatService:
     def __init__(self, llm_client: LLMClient, text_vector_client: TextVectorClient):
         self._llm = llm_client
         self._text_vector = text_vector_client
+        self._context_packer = ContextPacker(count_tokens=text_vector_client.count_tokens)
+        self._intent_classifier = IntentClassifier(encode=text_vector_client.encode,
+                                                   min_similarity=settings.INTENT.LOCAL_MIN_SIMILARITY,
+                                                   min_margin=settings.INTENT.LOCAL_MIN_MARGIN)
+        self._answer_cache = None
+        if settings.ANSWER_CACHE.ENABLED:
+            self._answer_cache = SemanticAnswerCache(
+                encode=text_vector_client.encode,
+                get_version=lambda: text_vector_client.get_collection_version(settings.ANSWER_CACHE.COLLECTION),
+                min_similarity=settings.ANSWER_CACHE.MIN_SIMILARITY,
+                ttl=settings.ANSWER_CACHE.TTL,
+                max_entries=settings.ANSWER_CACHE.MAX_ENTRIES,
+                version_check_interval=settings.ANSWER_CACHE.VERSION_CHECK_INTERVAL
+            )
 
     async def get_answer(self, messages: list[UserMessage | AssistantMessage], user: str):
 
-        intent_function: dict = await self._determine_intent([msg.model_dump() for msg in messages])
+        lookup = await self._lookup_cached_answer(messages)
+        if lookup is not None and lookup.answer is not None:
+            self._apply_cached_answer(messages, lookup)
+            return messages
+
+        method, arguments = await self._resolve_intent(messages)
+        messages = await getattr(self, method)(messages, **arguments)
+
+        if lookup is not None and method == "get_information_from_rag":
+            self._answer_cache.store(lookup, system_prompt=messages[0].content, reply=messages[-1].content)
+        return messages
+
+    async def stream_answer(self, messages: list[UserMessage | AssistantMessage], user: str) -> AsyncIterator[str]:
+        """
+        Потоковый вариант get_answer: отдаёт ответ ассистента частями по мере генерации.
+
+        После окончания потока messages дополнен так же, как в get_answer, и готов к сохранению.
+
+        Args:
+            messages (list): сообщения диалога, дополняются на месте
+            user (str): пользователь
+
+        Returns:
+            AsyncIterator[str]: части ответа ассистента
+        """
+        lookup = await self._lookup_cached_answer(messages)
+        if lookup is not None and lookup.answer is not None:
+            self._apply_cached_answer(messages, lookup)
+            yield lookup.answer.reply
+            return
+
+        method, arguments = await self._resolve_intent(messages)
+        if method != "get_information_from_rag":
+            await getattr(self, method)(messages, **arguments)
+            yield messages[-1].content
+            return
+
+        system_prompt = await self._get_rag_system_prompt(arguments["rus"], arguments.get("speculative"))
+
+        reply = []
+        try:
+            async for delta in self._llm.stream_completion(service=settings.RAG.SERVICE,
+                                                           model=settings.RAG.MODEL,
+                                                           system=system_prompt,
+                                                           max_tokens=settings.RAG.MAX_TOKEN,
+                                                           messages=json.dumps([msg.model_dump() for msg in messages], ensure_ascii=False),
+                                                           ):
+                reply.append(delta)
+                yield delta
+        except AioRpcError as e:
+            logger.error(str(e))
+            raise ChatException(e)
+        except Exception as e:  # noqa BLE001
+            logger.error(str(e))
+            raise ChatException(e)
+
+        if not reply:
+            msg = "Streaming completion returned an empty reply"
+            logger.error(msg)
+            raise ChatException(msg)
+
+        messages.insert(0, SystemMessage(role="system", content=system_prompt))
+        messages.append(AssistantMessage(role="assistant", content="".join(reply)))
+        if lookup is not None:
+            self._answer_cache.store(lookup, system_prompt=system_prompt, reply=messages[-1].content)
+
+    async def _lookup_cached_answer(self, messages: list) -> AnswerLookup | None:
+        # Ответ зависит от истории диалога, поэтому кэшируются только отдельные вопросы
+        if self._answer_cache is None or len(messages) != 1 or not isinstance(messages[0], UserMessage):
+            return None
+
+        try:
+            return await self._answer_cache.lookup(messages[0].content)
+        except AioRpcError as e:
+            logger.warning(f"Answer cache is skipped: {e.code()} - {e.details()}")
+            return None
+
+    @staticmethod
+    def _apply_cached_answer(messages: list, lookup: AnswerLookup) -> None:
+        logger.info(f"Returning cached answer to '{lookup.answer.question}' for '{lookup.question}'")
+        messages.insert(0, SystemMessage(role="system", content=lookup.answer.system_prompt))
+        messages.append(AssistantMessage(role="assistant", content=lookup.answer.reply))
+
+    async def _resolve_intent(self, messages: list) -> tuple[str, dict]:
+
+        intent_function = await self._classify_intent_locally(messages)
+        self._intent_classifier.record(fast_path=intent_function is not None)
+        speculative = None
+        if intent_function is None:
+            speculative = self._start_speculative_retrieval(messages)
+            try:
+                intent_function = await self._determine_intent([msg.model_dump() for msg in messages])
+            except ChatException:
+                if speculative is not None:
+                    speculative.cancel()
+                raise
 
         # Пример intent_function на запрос - "какой актер играл Ломоносова"
         # intent_function = {"arguments": '{"eng": "Which actor played Lomonosov?", "rus": "Какой актер играл Ломоносова?"}',
@@ -33,11 +148,77 @@ class ChatService:
             method = intent_function["name"]
             arguments = json.loads(intent_function["arguments"])
         except KeyError:
+            if speculative is not None:
+                speculative.cancel()
             raise ChatException
 
-        messages = await getattr(self, method)(messages, **arguments)
+        if speculative is not None:
+            if method == "get_information_from_rag":
+                arguments["speculative"] = speculative
+            else:
+                speculative.cancel()
 
-        return messages
+        return method, arguments
+
+    async def _classify_intent_locally(self, messages: list) -> dict | None:
+        # Уточняющий вопрос без LLM не переформулировать, поэтому локально - только отдельное сообщение
+        if not settings.INTENT.LOCAL_ENABLED or len(messages) != 1 or not isinstance(messages[0], UserMessage):
+            return None
+
+        text = messages[0].content
+        try:
+            prediction = await self._intent_classifier.classify(text)
+        except AioRpcError as e:
+            logger.warning(f"Local intent classification is skipped: {e.code()} - {e.details()}")
+            return None
+
+        logger.info(f"Local intent: {prediction}")
+        if not prediction.confident:
+            return None
+
+        # Сообщение пользователя и есть поисковый запрос, перевод нужен только LLM-классификатору
+        arguments = {"eng": text, "rus": text} if prediction.name == "get_information_from_rag" else {"answer": ""}
+        return {"name": prediction.name, "arguments": json.dumps(arguments, ensure_ascii=False)}
+
+    def _start_speculative_retrieval(self, messages: list) -> asyncio.Task | None:
+        text = getattr(messages[-1], "content", None) if messages else None
+        if not settings.RAG.SPECULATIVE or not text:
+            return None
+
+        async def retrieve() -> tuple[str, str, list[float]]:
+            context, vectors = await asyncio.gather(self._enrich_data_for_rag(text_query=text),
+                                                    self._text_vector.encode([QUERY_PREFIX + text]))
+            return text, context, vectors[0]
+
+        task = asyncio.create_task(retrieve())
+        # Ошибка отменённого или ненужного поиска не должна попадать в лог как необработанная
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return task
+
+    async def _get_speculative_context(self, speculative: asyncio.Task, text_query: str) -> str | None:
+        """
+        Возвращает контекст поиска по исходному сообщению, если запрос LLM близок к нему.
+
+        Args:
+            speculative (asyncio.Task): поиск, запущенный вместе с классификацией интента
+            text_query (str): поисковый запрос, сформулированный LLM
+
+        Returns:
+            str | None: контекст для промпта или None, если нужен новый поиск
+        """
+        try:
+            text, context, vector = await speculative
+            if text == text_query:
+                similarity = 1.0
+            else:
+                similarity = cosine_similarity(vector, (await self._text_vector.encode([QUERY_PREFIX + text_query]))[0])
+        except (ChatException, AioRpcError) as e:
+            logger.warning(f"Speculative retrieval is skipped: {e}")
+            return None
+
+        reuse = similarity >= settings.RAG.SPECULATIVE_MIN_SIMILARITY
+        logger.info(f"Speculative retrieval {'reused' if reuse else 'discarded'}, query similarity {similarity:.3f}")
+        return context if reuse else None
 
     async def _determine_intent(self, messages, **kwargs):
 
@@ -87,7 +268,8 @@ class ChatService:
 
         return result
 
-    async def get_information_from_rag(self, messages: list, eng: str, rus: str) -> list:
+    async def get_information_from_rag(self, messages: list, eng: str, rus: str,
+                                       speculative: asyncio.Task | None = None) -> list:
         """
         {
             "description": "Extracts the main intent of the user's query and forms a search query in both Russian and English.",
@@ -108,9 +290,7 @@ class ChatService:
         }
         """
 
-        enrich_data = await self._enrich_data_for_rag(text_query=rus)
-
-        system_prompt = get_system_prompt_for_rag(enrich_data)
+        system_prompt = await self._get_rag_system_prompt(rus, speculative)
 
         try:
             response = await self._llm.get_completion(service=settings.RAG.SERVICE,
@@ -136,10 +316,25 @@ class ChatService:
         logger.error(msg)
         raise ChatException(msg)
 
-    async def _enrich_data_for_rag(self, text_query: str, limit=10) -> str:
+    async def _get_rag_system_prompt(self, text_query: str, speculative: asyncio.Task | None = None) -> str:
+        enrich_data = await self._get_speculative_context(speculative, text_query) if speculative is not None else None
+        if enrich_data is None:
+            enrich_data = await self._enrich_data_for_rag(text_query=text_query)
+
+        return get_system_prompt_for_rag(enrich_data)
 
+    async def _enrich_data_for_rag(self, text_query: str, limit: int | None = None) -> str:
+
+        # Гибридный поиск находит точные названия и имена, поэтому хватает меньшего числа фрагментов
         try:
-            response = await self._text_vector.get_similar_fragments(text=text_query, limit=limit)
+            response = await self._text_vector.get_similar_fragments(text=text_query,
+                                                                     limit=limit or settings.RAG.SEARCH_LIMIT,
+                                                                     mode=settings.RAG.SEARCH_MODE,
+                                                                     rerank=settings.RAG.RERANK,
+                                                                     fields=("text",))
+            # Размер промпта ограничен бюджетом модели, а не числом фрагментов
+            context = await self._context_packer.pack(response if isinstance(response, list) else [],
+                                                      budget=settings.RAG.context_budget)
         except AioRpcError as e:
             logger.error(str(e))
             raise ChatException(e)
@@ -147,12 +342,7 @@ class ChatService:
             logger.error(str(e))
             raise ChatException(e)
 
-        result = []
-        if isinstance(response, list):
-            for item in response:
-                result.append(item.get("text", ""))
-
-        return "\n".join(result)
+        return context.text
 
     async def handle_unknown_intent(self, messages: list, answer: str) -> list:
         """
@@ -0,0 +1,62 @@
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PackedContext:
+    fragments: list[str] = field(default_factory=list)
+    tokens: int = 0
+    budget: int = 0
+    dropped_fragments: int = 0
+    dropped_tokens: int = 0
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.fragments)
+
+
+class ContextPacker:
+    def __init__(self, count_tokens: Callable[[list[str]], Awaitable[list[int]]]):
+        """
+        Упаковка найденных фрагментов в контекст RAG-промпта с ограничением по токенам.
+
+        Args:
+            count_tokens: подсчёт токенов списка текстов одним вызовом
+        """
+        self._count_tokens = count_tokens
+
+    async def pack(self, fragments: list[dict], budget: int) -> PackedContext:
+        """
+        Жадно набирает фрагменты по убыванию score, пока они помещаются в бюджет.
+
+        Фрагмент, который не помещается, пропускается, следующие более короткие ещё могут войти.
+
+        Args:
+            fragments (list[dict]): фрагменты с полями text и score
+            budget (int): бюджет токенов контекста
+
+        Returns:
+            PackedContext: вошедшие фрагменты и статистика отброшенных
+        """
+        ranked = sorted((fragment for fragment in fragments if fragment.get("text")),
+                        key=lambda fragment: fragment.get("score", 0.0),
+                        reverse=True)
+        texts = [fragment["text"] for fragment in ranked]
+        token_counts = await self._count_tokens(texts) if texts else []
+
+        packed = PackedContext(budget=budget)
+        for text, tokens in zip(texts, token_counts):
+            if packed.tokens + tokens <= budget:
+                packed.fragments.append(text)
+                packed.tokens += tokens
+            else:
+                packed.dropped_fragments += 1
+                packed.dropped_tokens += tokens
+
+        logger.info(f"RAG context: {len(packed.fragments)} fragments, {packed.tokens} of {budget} tokens, "
+                    f"dropped {packed.dropped_fragments} fragments, {packed.dropped_tokens} tokens")
+        return packed
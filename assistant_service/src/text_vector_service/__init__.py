@@ -2,6 +2,7 @@ import sys
 import warnings
 from pathlib import Path
 
+from channel_pool import ChannelPool
 from core.logger import get_logger
 from schemes import LLMResponse
 
@@ -17,6 +18,8 @@ grpc_generated_path = current_dir / 'grpc_generated'
 sys.path.insert(0, str(grpc_generated_path))
 
 from grpc_generated import (
+    encoder_pb2,
+    encoder_pb2_grpc,
     llm_pb2,
     llm_pb2_grpc,
     similarity_search_pb2,
@@ -25,28 +28,65 @@ from grpc_generated import (
 
 
 class TextVectorClient:
-    def __init__(self, address: str):
+    def __init__(self, address: str, pool_size: int = 1, timeout: float | None = None,
+                 channel_options: dict | None = None):
         self.address = address
-        self.channel: grpc.aio.Channel | None = None
-        self.stub: llm_pb2_grpc.LlmServiceStub | None = None
-
-    async def get_similar_fragments(self, text: str, limit: int = 5) -> list:
-        async with grpc.aio.insecure_channel(self.address) as channel:
-            similarity_stub = similarity_search_pb2_grpc.SimilaritySearchServiceStub(channel)
-            similarity_request = similarity_search_pb2.SearchRequest(
-                text=text,
-                collection="docs",
-                limit=limit
-            )
+        self.timeout = timeout
+        self._pool = ChannelPool(address, size=pool_size, options=channel_options)
+
+    async def close(self) -> None:
+        await self._pool.close()
+
+    async def get_similar_fragments(self, text: str, limit: int = 5, mode: str = "dense", rerank: bool = False,
+                                    fields: tuple[str, ...] = ("text", "page_id", "title", "time_request")) -> list:
+        similarity_stub = similarity_search_pb2_grpc.SimilaritySearchServiceStub(self._pool.channel)
+        similarity_request = similarity_search_pb2.SearchRequest(
+            text=text,
+            collection="docs",
+            limit=limit,
+            mode=similarity_search_pb2.SearchMode.Value(f"SEARCH_MODE_{mode.upper()}"),
+            rerank=rerank,
+            with_payload=fields
+        )
+
+        try:
+            similarity_response = await similarity_stub.SearchSimilarFragments(similarity_request,
+                                                                               timeout=self.timeout)
+        except grpc.aio.AioRpcError as e:
+            # Коллекция без BM25 векторов или сервис с выключенным BM25 - повтор плотным поиском
+            if mode == "dense" or e.code() not in (grpc.StatusCode.FAILED_PRECONDITION, grpc.StatusCode.INTERNAL):
+                raise
+            logger.warning(f"Search mode '{mode}' failed, falling back to dense search: {e.code()} - {e.details()}")
+            similarity_request.mode = similarity_search_pb2.SEARCH_MODE_DENSE
+            similarity_response = await similarity_stub.SearchSimilarFragments(similarity_request,
+                                                                               timeout=self.timeout)
+
+        similar_fragments = [
+            {"score": result.score, **{field: getattr(result, field) for field in fields}}
+            for result in similarity_response.similar_fragments
+        ]
+
+        return similar_fragments
+
+    async def get_collection_version(self, collection: str = "docs") -> int:
+        stub = similarity_search_pb2_grpc.SimilaritySearchServiceStub(self._pool.channel)
+        response = await stub.GetCollectionVersion(similarity_search_pb2.CollectionVersionRequest(collection=collection),
+                                                   timeout=self.timeout)
+
+        return response.version
 
-            similarity_response = await similarity_stub.SearchSimilarFragments(similarity_request)
+    async def encode(self, texts: list[str]) -> list[list[float]]:
+        stub = encoder_pb2_grpc.EncoderServiceStub(self._pool.channel)
+        response = await stub.EncodeBatch(encoder_pb2.EncodeBatchRequest(texts=texts), timeout=self.timeout)
 
-            similar_fragments = [
-                {"text": result.text, "score": result.score, "meta": result.meta}
-                for result in similarity_response.similar_fragments
-            ]
+        return [list(vector.vector) for vector in response.vectors]
 
-            return similar_fragments
+    async def count_tokens(self, texts: list[str]) -> list[int]:
+        stub = encoder_pb2_grpc.EncoderServiceStub(self._pool.channel)
+        response = await stub.CountTokensBatch(encoder_pb2.CountTokensBatchRequest(texts=texts),
+                                               timeout=self.timeout)
+
+        return list(response.token_counts)
 
     async def get_completion(
             self,
@@ -56,29 +96,28 @@ class TextVectorClient:
             max_tokens: int,
             messages: str
     ) -> LLMResponse:
-        async with grpc.aio.insecure_channel(self.address) as channel:
-            stub = llm_pb2_grpc.LlmServiceStub(channel)
-
-            request = llm_pb2.LLMRequest(
-                service=service,
-                model=model,
-                system=system,
-                max_tokens=max_tokens,
-                messages=messages
+        stub = llm_pb2_grpc.LlmServiceStub(self._pool.channel)
+
+        request = llm_pb2.LLMRequest(
+            service=service,
+            model=model,
+            system=system,
+            max_tokens=max_tokens,
+            messages=messages
+        )
+
+        try:
+            response: llm_pb2.LLMResponse = await stub.GetCompletion(request, timeout=self.timeout)
+
+            return LLMResponse(
+                status_code=response.status_code,
+                reply=response.reply,
+                response=response.response
             )
-
-            try:
-                response: llm_pb2.LLMResponse = await stub.GetCompletion(request)
-
-                return LLMResponse(
-                    status_code=response.status_code,
-                    reply=response.reply,
-                    response=response.response
-                )
-            except grpc.aio.AioRpcError as e:
-                msg = f"gRPC error: {e.code()} - {e.details()}"
-                logger.error(msg)
-                raise
+        except grpc.aio.AioRpcError as e:
+            msg = f"gRPC error: {e.code()} - {e.details()}"
+            logger.error(msg)
+            raise
 
     async def get_functions(
             self,
@@ -90,28 +129,27 @@ class TextVectorClient:
             functions: str,
             function_call: str
     ) -> LLMResponse:
-        async with grpc.aio.insecure_channel(self.address) as channel:
-            stub = llm_pb2_grpc.LlmServiceStub(channel)
-
-            request = llm_pb2.LLMFunctionRequest(
-                service=service,
-                model=model,
-                system=system,
-                max_tokens=max_tokens,
-                messages=messages,
-                functions=functions,
-                function_call=function_call
+        stub = llm_pb2_grpc.LlmServiceStub(self._pool.channel)
+
+        request = llm_pb2.LLMFunctionRequest(
+            service=service,
+            model=model,
+            system=system,
+            max_tokens=max_tokens,
+            messages=messages,
+            functions=functions,
+            function_call=function_call
+        )
+
+        try:
+            response: llm_pb2.LLMFunctionResponse = await stub.GetFunctions(request, timeout=self.timeout)
+
+            return LLMResponse(
+                status_code=response.status_code,
+                reply=response.reply,
+                response=response.response
             )
-
-            try:
-                response: llm_pb2.LLMFunctionResponse = await stub.GetFunctions(request)
-
-                return LLMResponse(
-                    status_code=response.status_code,
-                    reply=response.reply,
-                    response=response.response
-                )
-            except grpc.aio.AioRpcError as e:
-                msg = f"gRPC error: {e.code()} - {e.details()}"
-                logger.error(msg)
-                raise
+        except grpc.aio.AioRpcError as e:
+            msg = f"gRPC error: {e.code()} - {e.details()}"
+            logger.error(msg)
+            raise
@@ -1,5 +1,11 @@
+import math
 from datetime import UTC, datetime
 
 
 def get_current_time() -> datetime:
     return datetime.now(UTC)
+
+
+def cosine_similarity(first: list[float], second: list[float]) -> float:
+    norm = math.sqrt(sum(value * value for value in first)) * math.sqrt(sum(value * value for value in second))
+    return sum(a * b for a, b in zip(first, second)) / norm if norm else 0.0
@@ -0,0 +1,120 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+from answer_cache import SemanticAnswerCache, normalize_question
+from intent import QUERY_PREFIX
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+VOCABULARY = ["чапаев", "снял", "кто", "фильм", "играл", "ломоносова", "актер"]
+
+
+async def encode(texts: list[str]) -> list[list[float]]:
+    vectors = []
+    for text in texts:
+        words = text.removeprefix(QUERY_PREFIX).split()
+        vectors.append([float(words.count(word)) for word in VOCABULARY])
+    return vectors
+
+
+class TestNormalizeQuestion(unittest.TestCase):
+
+    def test_normalize(self):
+        self.assertEqual(normalize_question("  Кто  снял\n«Чапаева» в 1934?! "), "кто снял «чапаева» в 1934")
+        self.assertEqual(normalize_question("Актёр"), "актер")
+
+
+class TestSemanticAnswerCache(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.version = 1
+        self.version_reads = 0
+        self.cache = self.make_cache()
+
+    async def get_version(self) -> int:
+        self.version_reads += 1
+        return self.version
+
+    def make_cache(self, ttl: float = 0, max_entries: int = 10) -> SemanticAnswerCache:
+        return SemanticAnswerCache(encode=encode, get_version=self.get_version, min_similarity=0.95,
+                                   ttl=ttl, max_entries=max_entries)
+
+    async def store(self, cache: SemanticAnswerCache, question: str, reply: str) -> None:
+        lookup = await cache.lookup(question)
+        cache.store(lookup, system_prompt=f"prompt: {question}", reply=reply)
+
+    async def test_hit_on_normalized_question(self):
+        await self.store(self.cache, "Кто снял Чапаев?", "Братья Васильевы")
+        lookup = await self.cache.lookup("кто  СНЯЛ чапаев")
+
+        self.assertIsNotNone(lookup.answer)
+        self.assertEqual(lookup.answer.reply, "Братья Васильевы")
+        self.assertEqual(lookup.answer.system_prompt, "prompt: Кто снял Чапаев?")
+        self.assertAlmostEqual(lookup.similarity, 1.0, places=5)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    async def test_miss_on_different_question(self):
+        await self.store(self.cache, "кто снял чапаев", "Братья Васильевы")
+        lookup = await self.cache.lookup("кто играл ломоносова")
+
+        self.assertIsNone(lookup.answer)
+        self.assertLess(lookup.similarity, 0.95)
+
+    async def test_cleared_on_version_change(self):
+        await self.store(self.cache, "кто снял чапаев", "Братья Васильевы")
+        self.version = 2
+
+        self.assertIsNone((await self.cache.lookup("кто снял чапаев")).answer)
+        self.assertEqual(len(self.cache), 0)
+
+    async def test_answer_from_previous_version_not_stored(self):
+        lookup = await self.cache.lookup("кто снял чапаев")
+        self.version = 2
+        await self.cache.lookup("кто играл ломоносова")
+        self.cache.store(lookup, system_prompt="", reply="Братья Васильевы")
+
+        self.assertEqual(len(self.cache), 0)
+
+    async def test_version_read_once_per_interval(self):
+        cache = SemanticAnswerCache(encode=encode, get_version=self.get_version, min_similarity=0.95,
+                                    ttl=0, max_entries=10, version_check_interval=5)
+        with patch("answer_cache.time.monotonic", return_value=100.0):
+            await cache.lookup("кто снял чапаев")
+        with patch("answer_cache.time.monotonic", return_value=104.0):
+            await cache.lookup("кто снял чапаев")
+        self.assertEqual(self.version_reads, 1)
+
+        with patch("answer_cache.time.monotonic", return_value=106.0):
+            await cache.lookup("кто снял чапаев")
+        self.assertEqual(self.version_reads, 2)
+
+    async def test_expired_answer_dropped(self):
+        cache = self.make_cache(ttl=60)
+        with patch("answer_cache.time.monotonic", return_value=100.0):
+            await self.store(cache, "кто снял чапаев", "Братья Васильевы")
+        with patch("answer_cache.time.monotonic", return_value=159.0):
+            self.assertIsNotNone((await cache.lookup("кто снял чапаев")).answer)
+        with patch("answer_cache.time.monotonic", return_value=161.0):
+            self.assertIsNone((await cache.lookup("кто снял чапаев")).answer)
+        self.assertEqual(len(cache), 0)
+
+    async def test_least_recently_used_evicted(self):
+        cache = self.make_cache(max_entries=2)
+        with patch("answer_cache.time.monotonic", return_value=1.0):
+            await self.store(cache, "кто снял чапаев", "Братья Васильевы")
+        with patch("answer_cache.time.monotonic", return_value=2.0):
+            await self.store(cache, "кто играл ломоносова", "Борис Ливанов")
+        with patch("answer_cache.time.monotonic", return_value=3.0):
+            await cache.lookup("кто снял чапаев")
+        with patch("answer_cache.time.monotonic", return_value=4.0):
+            await self.store(cache, "актер фильм", "Бабочкин")
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone((await cache.lookup("кто снял чапаев")).answer)
+        self.assertIsNone((await cache.lookup("кто играл ломоносова")).answer)
+
+
+if __name__ == '__main__':
+    unittest.main()
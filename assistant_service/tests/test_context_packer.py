@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+
+from services.context_packer import ContextPacker
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+
+async def count_words(texts: list[str]) -> list[int]:
+    return [len(text.split()) for text in texts]
+
+
+class TestContextPacker(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.packer = ContextPacker(count_tokens=count_words)
+
+    async def test_fragments_ordered_by_score(self):
+        fragments = [{"text": "два слова", "score": 0.5}, {"text": "одно", "score": 0.9}]
+        packed = await self.packer.pack(fragments, budget=10)
+
+        self.assertEqual(packed.fragments, ["одно", "два слова"])
+        self.assertEqual(packed.tokens, 3)
+        self.assertEqual(packed.text, "одно\nдва слова")
+
+    async def test_oversized_fragment_skipped(self):
+        fragments = [
+            {"text": "а б в г", "score": 0.9},
+            {"text": "а б в г д е ж", "score": 0.8},
+            {"text": "а б", "score": 0.7},
+        ]
+        packed = await self.packer.pack(fragments, budget=6)
+
+        self.assertEqual(packed.fragments, ["а б в г", "а б"])
+        self.assertEqual(packed.tokens, 6)
+        self.assertEqual((packed.dropped_fragments, packed.dropped_tokens), (1, 7))
+
+    async def test_empty_texts_ignored(self):
+        calls = []
+
+        async def count_tokens(texts):
+            calls.append(texts)
+            return await count_words(texts)
+
+        packed = await ContextPacker(count_tokens=count_tokens).pack([{"text": "", "score": 1.0}, {"score": 0.5}],
+                                                                    budget=10)
+        self.assertEqual(packed.fragments, [])
+        self.assertEqual(calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import unittest
+
+from intent import QUERY_PREFIX, IntentClassifier
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+EXAMPLES = {
+    "search": ["найди фильм", "какой фильм"],
+    "greeting": ["привет", "здравствуй"],
+}
+# Одно измерение на слово, примеры интента близки к его оси
+VOCABULARY = ["фильм", "привет", "здравствуй", "найди", "какой", "погода"]
+
+
+class FakeEncoder:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(texts)
+        vectors = []
+        for text in texts:
+            words = text.removeprefix(QUERY_PREFIX).split()
+            vectors.append([float(words.count(word)) for word in VOCABULARY])
+        return vectors
+
+
+class TestIntentClassifier(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.encoder = FakeEncoder()
+        self.classifier = IntentClassifier(encode=self.encoder, min_similarity=0.6, min_margin=0.2,
+                                           examples=EXAMPLES)
+
+    async def test_confident_prediction(self):
+        prediction = await self.classifier.classify("найди фильм")
+
+        self.assertEqual(prediction.name, "search")
+        self.assertTrue(prediction.confident)
+        self.assertGreater(prediction.margin, 0.2)
+
+    async def test_low_similarity_is_not_confident(self):
+        prediction = await self.classifier.classify("погода")
+        self.assertFalse(prediction.confident)
+
+    async def test_small_margin_is_not_confident(self):
+        prediction = await self.classifier.classify("фильм привет")
+        self.assertFalse(prediction.confident)
+        self.assertLess(prediction.margin, 0.2)
+
+    async def test_examples_encoded_once_with_query_prefix(self):
+        await self.classifier.classify("привет")
+        await self.classifier.classify("найди фильм")
+
+        self.assertEqual(len(self.encoder.calls), 3)
+        self.assertEqual(len(self.encoder.calls[0]), 4)
+        self.assertTrue(all(text.startswith(QUERY_PREFIX) for calls in self.encoder.calls for text in calls))
+
+    def test_fast_path_share(self):
+        self.assertEqual(self.classifier.fast_path_share, 0.0)
+        for fast_path in (True, False, True, True):
+            self.classifier.record(fast_path)
+        self.assertEqual(self.classifier.fast_path_share, 0.75)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -44,6 +44,11 @@ class LlmServiceStub(object):
                 request_serializer=llm__pb2.LLMFunctionRequest.SerializeToString,
                 response_deserializer=llm__pb2.LLMFunctionResponse.FromString,
                 _registered_method=True)
+        self.StreamCompletion = channel.unary_stream(
+                '/llmservice.LlmService/StreamCompletion',
+                request_serializer=llm__pb2.LLMRequest.SerializeToString,
+                response_deserializer=llm__pb2.LLMStreamChunk.FromString,
+                _registered_method=True)
 
 
 class LlmServiceServicer(object):
@@ -61,6 +66,12 @@ class LlmServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamCompletion(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_LlmServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -74,6 +85,11 @@ def add_LlmServiceServicer_to_server(servicer, server):
                     request_deserializer=llm__pb2.LLMFunctionRequest.FromString,
                     response_serializer=llm__pb2.LLMFunctionResponse.SerializeToString,
             ),
+            'StreamCompletion': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamCompletion,
+                    request_deserializer=llm__pb2.LLMRequest.FromString,
+                    response_serializer=llm__pb2.LLMStreamChunk.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'llmservice.LlmService', rpc_method_handlers)
@@ -138,3 +154,30 @@ class LlmService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamCompletion(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/llmservice.LlmService/StreamCompletion',
+            llm__pb2.LLMRequest.SerializeToString,
+            llm__pb2.LLMStreamChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
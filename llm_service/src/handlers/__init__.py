@@ -15,6 +15,7 @@ from grpc_generated.llm_pb2 import (
     LLMFunctionResponse,
     LLMRequest,
     LLMResponse,
+    LLMStreamChunk,
 )
 from networking.exception import NetworkException
 from services.factory import get_llm_service
@@ -87,6 +88,44 @@ class LLMHandler(llm_pb2_grpc.LlmServiceServicer):
                 response=str(e)
             )
 
+    async def StreamCompletion(
+            self,
+            request: LLMRequest,
+            context: grpc.aio.ServicerContext
+    ):
+
+        try:
+            service_name: str = llm_pb2.ApiServiceName.Name(request.service)
+            logger.info(f"Received streaming request with service: {service_name} and model: {request.model}")
+            service = get_llm_service(service_name)
+
+            messages: list[dict] = json.loads(request.messages)
+
+            data = service.prepare_stream_data(
+                model_name=request.model,
+                system_prompt=request.system,
+                max_tokens=request.max_tokens,
+                messages=messages
+            )
+            headers = service.prepare_headers()
+
+            async for chunk in service.stream_post(data=data, headers=headers):
+                delta, finish_reason = service.get_delta(chunk)
+                if delta or finish_reason:
+                    yield LLMStreamChunk(delta=delta, finish_reason=finish_reason)
+
+            logger.info("Streaming request processed successfully")
+
+        except NetworkException as e:
+            logger.error(f"NetworkException encountered:{e}")
+            context.set_code(StatusCode.UNAVAILABLE)
+            context.set_details(str(e))
+        except Exception as e:  # noqa: BLE001
+            msg = f"Unhandled exception encountered:{e}"
+            logger.error(msg)
+            context.set_code(StatusCode.INTERNAL)
+            context.set_details(str(e))
+
     async def GetFunctions(
             self,
             request,
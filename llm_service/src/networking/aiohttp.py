@@ -1,3 +1,6 @@
+import json
+from collections.abc import AsyncIterator
+
 import aiohttp
 from aiohttp import ClientError, ClientResponseError
 from aiohttp_socks import ProxyConnector
@@ -8,6 +11,21 @@ from .exception import NetworkException
 
 logger = get_logger(__name__)
 
+SSE_DATA_PREFIX = b"data:"
+SSE_DONE = "[DONE]"
+
+
+def parse_sse_data(line: bytes) -> dict | str | None:
+    """Returns the JSON payload of an SSE "data:" line, SSE_DONE for the end marker and None for other lines."""
+    line = line.strip()
+    if not line.startswith(SSE_DATA_PREFIX):
+        return None
+
+    payload = line[len(SSE_DATA_PREFIX):].strip().decode()
+    if payload == SSE_DONE:
+        return SSE_DONE
+    return json.loads(payload)
+
 
 async def send_post(url: str, data: dict, headers: dict, proxy: ProxySocks5 | None = None) -> tuple[int, dict | str]:
     """Send POST request using aiohttp, optionally with SOCKS5 proxy."""
@@ -40,3 +58,37 @@ async def send_post(url: str, data: dict, headers: dict, proxy: ProxySocks5 | No
         logger.error(f"Request error occurred during POST request to {url}: {e}")
         msg = f"Request error occurred: {e}"
         raise NetworkException(msg)
+
+
+async def stream_post(url: str, data: dict, headers: dict, proxy: ProxySocks5 | None = None) -> AsyncIterator[dict]:
+    """Send POST request and yield the JSON events of a server-sent events response as they arrive."""
+    try:
+        logger.info(f"Sending streaming POST request to {url}")
+
+        connector = None
+        if proxy:
+            connector = ProxyConnector.from_url(proxy.to_proxy_url())
+
+        async with aiohttp.ClientSession(connector=connector) as session, session.post(url, json=data, headers=headers) as response:
+            response.raise_for_status()
+
+            events = 0
+            # Строки SSE приходят по мере генерации, событие - одна строка "data: {...}"
+            async for line in response.content:
+                event = parse_sse_data(line)
+                if event is None:
+                    continue
+                if event == SSE_DONE:
+                    break
+                events += 1
+                yield event
+
+            logger.info(f"Streaming POST request to {url} finished after {events} events")
+    except ClientResponseError as e:
+        logger.error(f"HTTP error occurred during streaming POST request to {url}: {e}")
+        msg = f"HTTP error occurred: {e}"
+        raise NetworkException(msg)
+    except (ClientError, json.JSONDecodeError) as e:
+        logger.error(f"Request error occurred during streaming POST request to {url}: {e}")
+        msg = f"Request error occurred: {e}"
+        raise NetworkException(msg)
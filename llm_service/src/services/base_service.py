@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from typing import Any
 
 from core.config import ProxySocks5
@@ -14,6 +15,15 @@ class BaseLLMService(ABC):
     @abstractmethod
     async def send_post(self, data: dict, headers: dict, proxy: ProxySocks5 | None = None) -> tuple[int, Any]: ...
 
+    @abstractmethod
+    def prepare_stream_data(self, model_name: str, system_prompt: str, max_tokens: int, messages: list[dict]) -> dict: ...
+
+    @abstractmethod
+    def stream_post(self, data: dict, headers: dict, proxy: ProxySocks5 | None = None) -> AsyncIterator[dict]: ...
+
+    @abstractmethod
+    def get_delta(self, chunk: dict[str, Any]) -> tuple[str, str]: ...
+
     @abstractmethod
     def prepare_messages(self, system_prompt: str, dialogue: list[dict]) -> list[dict]: ...
 
@@ -1,7 +1,8 @@
+from collections.abc import AsyncIterator
 from typing import Any
 
 from core.logger import get_logger
-from networking.aiohttp import send_post
+from networking.aiohttp import send_post, stream_post
 from services.base_service import BaseLLMService
 
 logger = get_logger(__name__)
@@ -44,6 +45,32 @@ class OpenAIService(BaseLLMService):
         logger.info(f"Prepared data with model: {model_name}, max_tokens: {max_tokens}")
         return data
 
+    def prepare_stream_data(self,
+                            model_name: str,
+                            system_prompt: str,
+                            max_tokens: int,
+                            messages: list[dict]) -> dict:
+        data = self.prepare_data(model_name, system_prompt, max_tokens, messages)
+        data["stream"] = True
+        return data
+
+    async def stream_post(self,
+                          data: dict,
+                          headers: dict,
+                          proxy=None) -> AsyncIterator[dict]:
+        logger.info(f"Sending streaming POST request to {self._base_url}")
+        async for chunk in stream_post(self._base_url, data, headers):
+            yield chunk
+
+    def get_delta(self, chunk: dict[str, Any]) -> tuple[str, str]:
+        """Extracts the reply delta and the finish reason from a streamed chat completion chunk."""
+        try:
+            choice = chunk["choices"][0]
+        except (KeyError, IndexError):
+            # Служебные события без choices, например с usage
+            return "", ""
+        return choice.get("delta", {}).get("content") or "", choice.get("finish_reason") or ""
+
     async def send_post(self,
                         data: dict,
                         headers: dict,
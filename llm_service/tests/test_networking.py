@@ -0,0 +1,28 @@
+import os
+import sys
+import unittest
+
+from src.networking.aiohttp import SSE_DONE, parse_sse_data
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+
+class TestParseSSEData(unittest.TestCase):
+
+    def test_data_line(self):
+        self.assertEqual(parse_sse_data(b'data: {"choices": []}\n'), {"choices": []})
+
+    def test_data_line_without_space(self):
+        self.assertEqual(parse_sse_data(b'data:{"id": 1}'), {"id": 1})
+
+    def test_done_marker(self):
+        self.assertEqual(parse_sse_data(b"data: [DONE]\n"), SSE_DONE)
+
+    def test_other_lines(self):
+        for line in (b"\n", b": keep-alive\n", b"event: message\n"):
+            with self.subTest(line=line):
+                self.assertIsNone(parse_sse_data(line))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -68,6 +68,44 @@ class TestOpenAIService(unittest.IsolatedAsyncioTestCase):
         )
 
 
+    def test_prepare_stream_data(self):
+        expected_data = {
+            **self.service.prepare_data(self.model_name, self.system_prompt, self.max_tokens, self.messages),
+            "stream": True
+        }
+        self.assertEqual(
+            self.service.prepare_stream_data(
+                self.model_name, self.system_prompt, self.max_tokens, self.messages
+            ),
+            expected_data
+        )
+
+    @patch("src.services.openai.stream_post")
+    async def test_stream_post(self, mock_stream_post):
+        chunks = [{"choices": [{"delta": {"content": "test"}}]}, {"choices": [{"delta": {}, "finish_reason": "stop"}]}]
+
+        async def stream(*args, **kwargs):
+            for chunk in chunks:
+                yield chunk
+
+        mock_stream_post.side_effect = stream
+        data = {"key": "value"}
+        headers = {"header": "value"}
+        received = [chunk async for chunk in self.service.stream_post(data, headers)]
+        self.assertEqual(received, chunks)
+        mock_stream_post.assert_called_once_with(self.base_url, data, headers)
+
+    def test_get_delta(self):
+        chunk = {"choices": [{"delta": {"content": "test_delta"}, "finish_reason": None}]}
+        self.assertEqual(self.service.get_delta(chunk), ("test_delta", ""))
+
+    def test_get_delta_finish_reason(self):
+        chunk = {"choices": [{"delta": {}, "finish_reason": "stop"}]}
+        self.assertEqual(self.service.get_delta(chunk), ("", "stop"))
+
+    def test_get_delta_without_choices(self):
+        self.assertEqual(self.service.get_delta({"choices": [], "usage": {}}), ("", ""))
+
     def test_get_reply(self):
         response = {"choices": [{"message": {"content": "test_reply"}}]}
         self.assertEqual(self.service.get_reply(response), "test_reply")
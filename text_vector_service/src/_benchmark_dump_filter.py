@@ -0,0 +1,94 @@
+# Сравнение производительности фильтра страниц дампа: регулярное выражение против автомата Ахо-Корасик
+import random
+import re
+import time
+import xml.etree.ElementTree as ET
+
+from core.logger import get_logger
+from etl_wiki.from_dump_to_sqlite import (
+    DEFAULT_NAMESPACE,
+    create_matcher,
+    movie_check_length,
+    movie_phrases,
+    process_page,
+    text_stop_words,
+)
+from etl_wiki.keyword_matcher import TextMatch
+
+logger = get_logger(__name__)
+
+PAGES = 20000
+SEED = 42
+ROUNDS = 3
+
+WORDS = ["история", "город", "река", "наука", "химия", "война", "музыка", "футбол", "писатель", "роман",
+         "премия", "Москва", "год", "народ", "искусство", "театр", "кинотеатр", "киноактер", "фильмография",
+         "Oscar", "film", "[[ссылка]]", "{{шаблон}}", "''курсив''", "1984", "—", ",", "."]
+
+
+class LegacyMatcher:
+    """Прежняя реализация: регулярное выражение с альтернацией фраз и отдельный поиск каждого стоп-слова."""
+
+    def __init__(self, phrases: set[str], stop_words: list[str], check_length: int = 1024):
+        escaped_phrases = [re.escape(phrase) for phrase in phrases]
+        self.pattern: re.Pattern = re.compile(r'\b(' + '|'.join(escaped_phrases) + r')\b', re.IGNORECASE)
+        self.stop_words = stop_words
+        self.check_length = check_length
+
+    def classify(self, text: str) -> TextMatch:
+        if any(word in text for word in self.stop_words):
+            return TextMatch(stop_word=True, movie_phrase=False)
+        return TextMatch(stop_word=False, movie_phrase=bool(self.pattern.search(text[:self.check_length])))
+
+
+def make_text(rng: random.Random) -> str:
+    words = rng.choices(WORDS, k=rng.randint(80, 3000))
+    # Фразы о кино в разном регистре и на разных позициях, в том числе после проверяемого начала
+    for _ in range(rng.randint(0, 3)):
+        phrase = rng.choice(sorted(movie_phrases))
+        phrase = rng.choice([phrase, phrase.upper(), phrase.capitalize()])
+        words.insert(rng.randint(0, len(words)), phrase)
+    if rng.random() < 0.1:
+        words.insert(rng.randint(0, len(words)), rng.choice(text_stop_words))
+    return " ".join(words)
+
+
+def make_dump_slice(pages: int, seed: int) -> bytes:
+    rng = random.Random(seed)
+    parts = []
+    for page_id in range(1, pages + 1):
+        text = make_text(rng).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        parts.append(f'<page><title>Страница {page_id}</title><ns>0</ns><id>{page_id}</id>'
+                     f'<revision><id>{page_id * 10}</id><text xml:space="preserve">{text}</text></revision></page>')
+    return "".join(parts).encode()
+
+
+def run(name: str, pages: list[ET.Element], matcher, ns: dict[str, str]) -> list[int]:
+    best = float("inf")
+    matched = []
+    for _ in range(ROUNDS):
+        start_time = time.perf_counter()
+        matched = [data[0] for elem in pages if (data := process_page(elem, matcher, ns))]
+        best = min(best, time.perf_counter() - start_time)
+
+    chars = sum(len(elem.findtext('ns:revision/ns:text', namespaces=ns) or '') for elem in pages)
+    logger.info(f"{name}: {best:.2f} s, {len(pages) / best:.0f} pages/s, {chars / best / 1e6:.1f} M chars/s, "
+                f"{len(matched)} matched")
+    return matched
+
+
+def main():
+    logger.info(f"Generating a synthetic dump slice of {PAGES} pages")
+    chunk = make_dump_slice(PAGES, SEED)
+    ns = {'ns': DEFAULT_NAMESPACE}
+    root = ET.fromstring(b'<mediawiki xmlns="' + DEFAULT_NAMESPACE.encode() + b'">' + chunk + b'</mediawiki>')
+    pages = root.findall('ns:page', ns)
+
+    legacy = run("regex + substring passes", pages,
+                 LegacyMatcher(movie_phrases, text_stop_words, check_length=movie_check_length), ns)
+    current = run("Aho-Corasick", pages, create_matcher(movie_phrases), ns)
+    logger.info(f"Same pages matched: {legacy == current}")
+
+
+if __name__ == '__main__':
+    main()
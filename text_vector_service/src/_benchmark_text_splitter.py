@@ -0,0 +1,87 @@
+# Сравнение производительности TextSplitter: декодирование чанков против нарезки по смещениям
+import time
+
+from core.config import encoder_settings
+from core.logger import get_logger
+from etl_wiki.db_iterator import SQLiteIterator
+from text_splitter import TextSplitter
+from transformers import AutoTokenizer
+
+logger = get_logger(__name__)
+
+SQLITE_PATH = 'E:\\temp\\wiki\\wiki_pages.sqlite'
+MAX_DOCS = 2000
+BATCH_PAGES = 64
+CHUNK_SIZE = 512
+OVERLAP_PERCENTAGE = 15
+
+
+class DecodingTextSplitter:
+    """Прежняя реализация: токенизация заголовка и текста по отдельности и decode каждого чанка."""
+
+    def __init__(self, tokenizer, chunk_size: int = 512, overlap_percentage: int = 15):
+        self.tokenizer = tokenizer
+        self.chunk_size = chunk_size
+        self.overlap_size = int(self.chunk_size * (overlap_percentage / 100))
+
+    def split_text(self, title: str, text: str) -> list[str]:
+        title_tokens = self.tokenizer.encode(title + "\n\n", add_special_tokens=False, truncation=False)
+        adjusted_chunk_size = self.chunk_size - len(title_tokens)
+
+        tokens = self.tokenizer.encode(text, add_special_tokens=False, truncation=False)
+        if len(tokens) <= adjusted_chunk_size:
+            return [title + "\n\n" + text]
+
+        chunks_tokens = []
+        start = 0
+        while start < len(tokens):
+            end = min(start + adjusted_chunk_size, len(tokens))
+            chunks_tokens.append(tokens[start:end])
+            if end == len(tokens):
+                break
+            start = end - self.overlap_size
+
+        return [title + "\n\n" + self.tokenizer.decode(chunk_tokens, skip_special_tokens=True)
+                for chunk_tokens in chunks_tokens]
+
+
+def load_pages() -> list[tuple[str, str]]:
+    return [(f"Заголовок страницы: {doc.title}. Начало фрагмента:", doc.text)
+            for doc in SQLiteIterator(SQLITE_PATH, max_documents=MAX_DOCS, columns=("title", "wikitext"))]
+
+
+def report(name: str, pages: list[tuple[str, str]], chunks: list[list[str]], elapsed: float) -> None:
+    chunks_count = sum(len(page_chunks) for page_chunks in chunks)
+    chars = sum(len(text) for _, text in pages)
+    logger.info(f"{name}: {elapsed:.2f} s, {len(pages) / elapsed:.1f} pages/s, "
+                f"{chunks_count / elapsed:.1f} chunks/s, {chars / elapsed / 1e6:.2f} M chars/s, {chunks_count} chunks")
+
+
+def main():
+    tokenizer = AutoTokenizer.from_pretrained(encoder_settings.MODEL_NAME, cache_dir=encoder_settings.LOCAL_MODEL_PATH)
+
+    logger.info(f"Loading up to {MAX_DOCS} pages from {SQLITE_PATH}")
+    pages = load_pages()
+
+    decoding = DecodingTextSplitter(tokenizer, chunk_size=CHUNK_SIZE, overlap_percentage=OVERLAP_PERCENTAGE)
+    start_time = time.perf_counter()
+    decoded_chunks = [decoding.split_text(title, text) for title, text in pages]
+    report("decode per chunk", pages, decoded_chunks, time.perf_counter() - start_time)
+
+    splitter = TextSplitter(tokenizer=tokenizer, chunk_size=CHUNK_SIZE, overlap_percentage=OVERLAP_PERCENTAGE)
+    start_time = time.perf_counter()
+    single_chunks = [splitter.split_text(title, text) for title, text in pages]
+    report("offsets, split_text", pages, single_chunks, time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    batched_chunks = []
+    for i in range(0, len(pages), BATCH_PAGES):
+        batched_chunks.extend(splitter.split_texts(pages[i:i + BATCH_PAGES]))
+    report(f"offsets, split_texts by {BATCH_PAGES}", pages, batched_chunks, time.perf_counter() - start_time)
+
+    same_count = sum(len(old) == len(new) for old, new in zip(decoded_chunks, batched_chunks))
+    logger.info(f"Pages with the same number of chunks: {same_count} of {len(pages)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -34,6 +34,21 @@ async def run():
 
         print(f"Encoded vector: {response.vector[0:10]}")
 
+        encode_batch_request = encoder_pb2.EncodeBatchRequest(
+            texts=[phrase, phrase[:64]]
+        )
+
+        response = await stub.EncodeBatch(encode_batch_request)
+
+        print(f"EncodeBatch vectors: {[vector.vector[0:3] for vector in response.vectors]}")
+
+        async def stream_requests():
+            for i, text in enumerate([phrase, phrase[:64], phrase[:32]]):
+                yield encoder_pb2.EncodeStreamRequest(id=str(i), text=text)
+
+        async for stream_response in stub.EncodeStream(stream_requests()):
+            print(f"EncodeStream id {stream_response.id}: {stream_response.vector[0:3]}")
+
         encode_request = encoder_pb2.EncodeRequest(
             text=phrase
         )
@@ -53,7 +68,7 @@ async def run():
 
         print("Similarity search results:")
         for result in similarity_response.similar_fragments:
-            print(f"Text: {result.text}, Score: {result.score}, Meta: {result.meta}")
+            print(f"Text: {result.text}, Score: {result.score}, Page: {result.page_id} {result.title}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+import asyncio
+import contextlib
+from dataclasses import dataclass
+
+from cache import EmbeddingCache
+from core.config import EncoderSettings
+from core.logger import get_logger
+from inference import InferenceExecutor
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PendingEncode:
+    model_name: str
+    texts: list[str]
+    future: asyncio.Future
+
+
+class DynamicBatcher:
+    def __init__(self, executor: InferenceExecutor, settings: EncoderSettings, cache: EmbeddingCache | None = None):
+        """
+        Собирает конкурентные запросы на кодирование в один батч.
+
+        Запросы копятся не дольше BATCH_MAX_WAIT_MS или пока не наберётся BATCH_MAX_SIZE текстов,
+        после чего весь батч кодируется одним вызовом model.encode в пуле инференса.
+        Одновременно в работе не больше батчей, чем воркеров в пуле.
+        Тексты, найденные в кэше, в очередь не попадают.
+
+        Args:
+            executor (InferenceExecutor): пул для инференса
+            settings (EncoderSettings): настройки энкодера
+            cache (EmbeddingCache | None): кэш векторов
+        """
+        self._executor = executor
+        self._settings = settings
+        self._cache = cache
+        self._max_batch_size = settings.BATCH_MAX_SIZE
+        self._max_wait = settings.BATCH_MAX_WAIT_MS / 1000
+        self._queue: asyncio.Queue[PendingEncode] = asyncio.Queue()
+        self._slots = asyncio.Semaphore(executor.workers)
+        self._in_flight: set[asyncio.Task] = set()
+        self._worker: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+            logger.info(f"Batcher started: max batch size {self._max_batch_size}, "
+                        f"max wait {self._settings.BATCH_MAX_WAIT_MS} ms")
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+            self._worker = None
+
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+        while not self._queue.empty():
+            pending = self._queue.get_nowait()
+            if not pending.future.done():
+                pending.future.set_exception(RuntimeError("Batcher is stopped."))
+        logger.info("Batcher stopped.")
+
+    async def encode(self, texts: list[str], model_name: str | None = None,
+                     use_cache: bool = True) -> list[list[float]]:
+        """
+        Ставит тексты в очередь на кодирование и ждёт результата.
+
+        Args:
+            texts (list[str]): тексты для кодирования
+            model_name (str | None): имя модели, по умолчанию модель из настроек
+            use_cache (bool): использовать кэш векторов
+
+        Returns:
+            list[list[float]]: векторы в порядке входных текстов
+        """
+        if not texts:
+            return []
+
+        model_name = model_name or self._settings.MODEL_NAME
+        if self._cache is None or not use_cache:
+            return await self._submit(model_name, texts)
+
+        vectors = await self._cache.get_many(model_name, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            encoded = await self._submit(model_name, missing_texts)
+            await self._cache.set_many(model_name, missing_texts, encoded)
+            for i, vector in zip(missing, encoded):
+                vectors[i] = vector
+
+        return vectors
+
+    async def _submit(self, model_name: str, texts: list[str]) -> list[list[float]]:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(PendingEncode(model_name=model_name, texts=list(texts), future=future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()
+            first = await self._queue.get()
+            batch = [first]
+            batch_size = len(first.texts)
+            deadline = loop.time() + self._max_wait
+
+            while batch_size < self._max_batch_size:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        pending = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                    except TimeoutError:
+                        break
+                else:
+                    pending = self._queue.get_nowait()
+                batch.append(pending)
+                batch_size += len(pending.texts)
+
+            task = asyncio.create_task(self._process(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._on_batch_done)
+
+    def _on_batch_done(self, task: asyncio.Task) -> None:
+        self._in_flight.discard(task)
+        self._slots.release()
+
+    async def _process(self, batch: list[PendingEncode]) -> None:
+        by_model: dict[str, list[PendingEncode]] = {}
+        for pending in batch:
+            by_model.setdefault(pending.model_name, []).append(pending)
+
+        for model_name, requests in by_model.items():
+            texts = [text for pending in requests for text in pending.texts]
+            try:
+                vectors = await self._executor.encode(model_name, texts, batch_size=self._max_batch_size)
+            except Exception as e:  # noqa: BLE001
+                logger.error(f"Error encoding batch of {len(texts)} texts with model '{model_name}': {e}")
+                for pending in requests:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                continue
+
+            logger.debug(f"Encoded batch of {len(texts)} texts from {len(requests)} requests")
+            offset = 0
+            for pending in requests:
+                if not pending.future.done():
+                    pending.future.set_result(vectors[offset:offset + len(pending.texts)])
+                offset += len(pending.texts)
@@ -0,0 +1,70 @@
+import re
+import zlib
+from collections import Counter
+from functools import lru_cache
+
+import snowballstemmer
+from core.config import SparseSettings
+from qdrant_client import models
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def token_index(token: str) -> int:
+    """Индекс разреженного вектора для токена, одинаковый в ETL и в сервисе."""
+    return zlib.crc32(token.encode())
+
+
+class BM25Encoder:
+    def __init__(self, settings: SparseSettings):
+        """
+        Разреженные векторы BM25 для лексического поиска в Qdrant.
+
+        Вектор документа хранит насыщенную частоту терма с нормализацией по длине фрагмента,
+        IDF считает Qdrant по коллекции (SparseVectorParams с Modifier.IDF).
+        Вектор запроса - единичные веса его термов.
+
+        Args:
+            settings (SparseSettings): параметры BM25 и стемминга
+        """
+        self.k1 = settings.K1
+        self.b = settings.B
+        self.avg_length = settings.AVG_LENGTH
+        stemmer = snowballstemmer.stemmer(settings.LANGUAGE) if settings.LANGUAGE else None
+        # Словарь фрагментов небольшой, слова повторяются - стемминг кэшируется
+        self._stem = lru_cache(maxsize=200_000)(stemmer.stemWord) if stemmer else None
+
+    @staticmethod
+    def get_vector_params() -> models.SparseVectorParams:
+        return models.SparseVectorParams(modifier=models.Modifier.IDF)
+
+    def tokenize(self, text: str) -> list[str]:
+        words = WORD_PATTERN.findall(text.lower().replace("ё", "е"))
+        if self._stem is None:
+            return words
+        return [self._stem(word) for word in words]
+
+    def encode_document(self, text: str) -> models.SparseVector:
+        """
+        Args:
+            text (str): текст фрагмента
+
+        Returns:
+            SparseVector: вектор фрагмента для загрузки в коллекцию
+        """
+        tokens = self.tokenize(text)
+        counts = Counter(token_index(token) for token in tokens)
+        norm = self.k1 * (1 - self.b + self.b * len(tokens) / self.avg_length)
+        return models.SparseVector(indices=list(counts),
+                                   values=[tf * (self.k1 + 1) / (tf + norm) for tf in counts.values()])
+
+    def encode_query(self, text: str) -> models.SparseVector:
+        """
+        Args:
+            text (str): текст запроса
+
+        Returns:
+            SparseVector: вектор запроса
+        """
+        indices = list(dict.fromkeys(token_index(token) for token in self.tokenize(text)))
+        return models.SparseVector(indices=indices, values=[1.0] * len(indices))
@@ -0,0 +1,3 @@
+from .embeddings import EmbeddingCache
+from .lru import CacheStats, LRUCache
+from .search_results import SearchResultCache
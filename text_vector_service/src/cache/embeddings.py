@@ -0,0 +1,116 @@
+import hashlib
+import unicodedata
+from array import array
+
+from core.config import CacheSettings
+from core.logger import get_logger
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .lru import CacheStats, LRUCache
+
+logger = get_logger(__name__)
+
+# Накладные расходы на запись в OrderedDict, ключ и объект bytes
+ENTRY_OVERHEAD_BYTES = 200
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode()).hexdigest()
+
+
+def pack_vector(vector: list[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def unpack_vector(data: bytes) -> list[float]:
+    vector = array("f")
+    vector.frombytes(data)
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    def __init__(self, settings: CacheSettings, variant: str):
+        """
+        Кэш векторов запросов: LRU в памяти процесса и, опционально, Redis вторым уровнем.
+
+        Ключ - вариант инференса, имя модели и хэш нормализованного текста.
+        Вариант в ключе не даёт репликам с разными бэкендами читать векторы друг друга из общего Redis.
+
+        Args:
+            settings (CacheSettings): настройки кэша
+            variant (str): бэкенд и точность модели, например "onnx-int8-avx2"
+        """
+        self._settings = settings
+        self._variant = variant
+        self._memory = LRUCache(
+            max_bytes=int(settings.EMBEDDINGS_MAX_MB * 1024 * 1024),
+            ttl=settings.EMBEDDINGS_TTL,
+            sizeof=lambda key, value: len(value) + ENTRY_OVERHEAD_BYTES,
+        )
+        self._redis: Redis | None = None
+        self._redis_hits = 0
+        self._redis_misses = 0
+
+        if settings.REDIS_HOST:
+            self._redis = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
+            logger.info(f"Embedding cache uses Redis {settings.REDIS_HOST}:{settings.REDIS_PORT} as second tier")
+
+    @staticmethod
+    def make_key(variant: str, model_name: str, text: str) -> str:
+        return f"embedding:{variant}:{model_name}:{text_hash(text)}"
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._memory.stats
+
+    async def get_many(self, model_name: str, texts: list[str]) -> list[list[float] | None]:
+        keys = [self.make_key(self._variant, model_name, text) for text in texts]
+        packed = [self._memory.get(key) for key in keys]
+
+        missing = [i for i, value in enumerate(packed) if value is None]
+        if missing and self._redis is not None:
+            try:
+                values = await self._redis.mget([keys[i] for i in missing])
+            except RedisError as e:
+                logger.error(f"Redis embedding cache read failed: {e}")
+                values = [None] * len(missing)
+
+            for i, value in zip(missing, values):
+                if value is None:
+                    self._redis_misses += 1
+                    continue
+                self._redis_hits += 1
+                self._memory.set(keys[i], value)
+                packed[i] = value
+
+        return [unpack_vector(value) if value is not None else None for value in packed]
+
+    async def set_many(self, model_name: str, texts: list[str], vectors: list[list[float]]) -> None:
+        items = {self.make_key(self._variant, model_name, text): pack_vector(vector) for text, vector in zip(texts, vectors)}
+        for key, value in items.items():
+            self._memory.set(key, value)
+
+        if self._redis is not None:
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for key, value in items.items():
+                        pipe.set(key, value, ex=self._settings.EMBEDDINGS_TTL or None)
+                    await pipe.execute()
+            except RedisError as e:
+                logger.error(f"Redis embedding cache write failed: {e}")
+
+    def log_stats(self) -> None:
+        message = f"Embedding cache: {self.stats}"
+        if self._redis is not None:
+            message += f", redis_hits={self._redis_hits}, redis_misses={self._redis_misses}"
+        logger.info(message)
+
+    async def close(self) -> None:
+        self.log_stats()
+        if self._redis is not None:
+            await self._redis.close()
@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    items: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __str__(self) -> str:
+        return (f"hits={self.hits}, misses={self.misses}, hit_rate={self.hit_rate:.2%}, "
+                f"evictions={self.evictions}, expirations={self.expirations}, "
+                f"items={self.items}, size={self.size_bytes / 1024 / 1024:.1f} MB")
+
+
+class LRUCache:
+    def __init__(self, max_bytes: int, ttl: float = 0, sizeof: Callable[[Hashable, Any], int] | None = None):
+        """
+        LRU кэш с ограничением по памяти и временем жизни записей.
+
+        Args:
+            max_bytes (int): максимальный суммарный размер записей в байтах
+            ttl (float): время жизни записи в секундах, 0 - без ограничения
+            sizeof (Callable): функция оценки размера записи (ключ, значение) в байтах
+        """
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._sizeof = sizeof or (lambda key, value: len(value))
+        self._data: OrderedDict[Hashable, tuple[float, int, Any]] = OrderedDict()
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        self._stats.items = len(self._data)
+        return self._stats
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+
+        expires_at, size, value = entry
+        if expires_at and expires_at < time.monotonic():
+            self._remove(key)
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self._stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        size = self._sizeof(key, value)
+        if size > self._max_bytes:
+            return
+
+        if key in self._data:
+            self._remove(key)
+
+        expires_at = time.monotonic() + self._ttl if self._ttl else 0
+        self._data[key] = (expires_at, size, value)
+        self._stats.size_bytes += size
+
+        while self._stats.size_bytes > self._max_bytes:
+            oldest_key = next(iter(self._data))
+            self._remove(oldest_key)
+            self._stats.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._stats.size_bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._data.pop(key)
+        self._stats.size_bytes -= size
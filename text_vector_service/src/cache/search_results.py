@@ -0,0 +1,42 @@
+from core.config import CacheSettings
+from core.logger import get_logger
+
+from .embeddings import ENTRY_OVERHEAD_BYTES, text_hash
+from .lru import CacheStats, LRUCache
+
+logger = get_logger(__name__)
+
+
+class SearchResultCache:
+    def __init__(self, settings: CacheSettings):
+        """
+        Кэш сериализованных ответов SearchSimilarFragments.
+
+        В ключ входит версия коллекции, поэтому после загрузки новых данных ETL
+        старые записи перестают находиться и вытесняются по LRU/TTL.
+
+        Args:
+            settings (CacheSettings): настройки кэша
+        """
+        self._memory = LRUCache(
+            max_bytes=int(settings.SEARCH_MAX_MB * 1024 * 1024),
+            ttl=settings.SEARCH_TTL,
+            sizeof=lambda key, value: len(value) + ENTRY_OVERHEAD_BYTES,
+        )
+
+    @staticmethod
+    def make_key(collection: str, version: int, limit: int, text: str, **params) -> tuple:
+        return collection, version, limit, text_hash(text), tuple(sorted(params.items()))
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._memory.stats
+
+    def get(self, key: tuple) -> bytes | None:
+        return self._memory.get(key)
+
+    def set(self, key: tuple, response: bytes) -> None:
+        self._memory.set(key, response)
+
+    def log_stats(self) -> None:
+        logger.info(f"Search result cache: {self.stats}")
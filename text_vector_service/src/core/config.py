@@ -1,4 +1,4 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,6 +21,15 @@ class VectorDBSettings(BaseSettings):
     PORT: Annotated[int, Field(gt=1023, lt=65536)]
     COLLECTION_NAME: Annotated[str, Field(min_length=1)]
     VECTOR_SIZE: Annotated[int, Field(gt=64, lt=16_384)]
+    GRPC_PORT: Annotated[int, Field(gt=1023, lt=65536)] = 6334
+    PREFER_GRPC: bool = True
+    POOL_SIZE: Annotated[int, Field(gt=0)] = 4  # Number of persistent client channels.
+    TIMEOUT: Annotated[int, Field(gt=0)] = 10
+    KEEPALIVE_TIME_MS: Annotated[int, Field(gt=0)] = 30_000
+    KEEPALIVE_TIMEOUT_MS: Annotated[int, Field(gt=0)] = 10_000
+    HNSW_EF: Annotated[int, Field(ge=0)] = 0  # 0 - use the collection default.
+    SEARCH_EXACT: bool = False
+    VERSION_CHECK_INTERVAL: Annotated[float, Field(ge=0)] = 5  # Seconds between collection version reads.
 
     model_config = SettingsConfigDict(
         env_prefix='QDRANT_',
@@ -33,6 +42,16 @@ class EncoderSettings(BaseSettings):
     LOCAL_MODEL_PATH: Annotated[str, Field(min_length=1)]
     MODEL_NAME: Annotated[str, Field(min_length=1)]
     MAX_LENGTH: int = 512  # Long texts will be truncated to at most 512 tokens.
+    BACKEND: Literal["torch", "onnx", "onnx-int8"] = "torch"
+    ONNX_QUANTIZATION: Literal["arm64", "avx2", "avx512", "avx512_vnni"] = "avx2"  # Target CPU for onnx-int8.
+    PARITY_CHECK: bool = False  # Compare onnx vectors with the torch model on load.
+    PARITY_MAX_DRIFT: Annotated[float, Field(ge=0)] = 0.02  # Max allowed 1 - cos before a warning.
+    MEMORY_BUDGET_MB: Annotated[float, Field(ge=0)] = 0  # 0 - no limit on resident models.
+    MODEL_SIZES_MB: dict[str, float] = Field(default_factory=dict)  # Expected size of models not loaded yet.
+    BATCH_MAX_SIZE: Annotated[int, Field(gt=0)] = 32  # Max texts encoded in one model.encode call.
+    BATCH_MAX_WAIT_MS: Annotated[float, Field(ge=0)] = 5  # How long the batcher waits for more texts.
+    STREAM_MAX_IN_FLIGHT: Annotated[int, Field(gt=0)] = 256  # Texts of one EncodeStream being encoded.
+    WARMUP_ROUNDS: Annotated[int, Field(ge=0)] = 2  # Synthetic batches encoded before reporting SERVING.
 
     ALLOWED_MODELS: set[str] = Field(
         default_factory=lambda: {
@@ -45,6 +64,13 @@ class EncoderSettings(BaseSettings):
         }
     )
 
+    @property
+    def inference_variant(self) -> str:
+        """Бэкенд и точность весов, векторы разных вариантов одной модели не совпадают."""
+        if self.BACKEND == "onnx-int8":
+            return f"onnx-int8-{self.ONNX_QUANTIZATION}"
+        return f"{self.BACKEND}-fp32"
+
     model_config = SettingsConfigDict(
         env_prefix='ENCODER_',
         env_file='.env',
@@ -52,6 +78,89 @@ class EncoderSettings(BaseSettings):
         env_file_encoding='utf-8')
 
 
+class InferenceSettings(BaseSettings):
+    EXECUTOR: Literal["thread", "process"] = "thread"
+    WORKERS: Annotated[int, Field(gt=0)] = 1
+    TORCH_THREADS: Annotated[int, Field(ge=0)] = 0  # 0 - keep the torch default.
+
+    model_config = SettingsConfigDict(
+        env_prefix='INFERENCE_',
+        env_file='.env',
+        extra='ignore',
+        env_file_encoding='utf-8')
+
+
+class CacheSettings(BaseSettings):
+    EMBEDDINGS_ENABLED: bool = True
+    EMBEDDINGS_MAX_MB: Annotated[float, Field(gt=0)] = 64
+    EMBEDDINGS_TTL: Annotated[int, Field(ge=0)] = 86_400  # Seconds, 0 - no expiration.
+
+    SEARCH_ENABLED: bool = True
+    SEARCH_MAX_MB: Annotated[float, Field(gt=0)] = 32
+    SEARCH_TTL: Annotated[int, Field(ge=0)] = 3_600  # Seconds, 0 - no expiration.
+
+    REDIS_HOST: str | None = None  # Second cache tier is disabled when not set.
+    REDIS_PORT: Annotated[int, Field(gt=0, lt=65536)] = 6379
+    REDIS_DB: Annotated[int, Field(ge=0)] = 0
+
+    model_config = SettingsConfigDict(
+        env_prefix='CACHE_',
+        env_file='.env',
+        extra='ignore',
+        env_file_encoding='utf-8')
+
+
+class SparseSettings(BaseSettings):
+    ENABLED: bool = True  # ETL writes BM25 sparse vectors, hybrid and sparse search modes are available.
+    VECTOR_NAME: Annotated[str, Field(min_length=1)] = "bm25"
+    LANGUAGE: str = "russian"  # Snowball stemmer language, empty - no stemming.
+    K1: Annotated[float, Field(gt=0)] = 1.2
+    B: Annotated[float, Field(ge=0, le=1)] = 0.75
+    AVG_LENGTH: Annotated[float, Field(gt=0)] = 250  # Average fragment length in words.
+    HYBRID_PREFETCH: Annotated[int, Field(gt=0)] = 50  # Candidates of each retriever fused by RRF.
+
+    model_config = SettingsConfigDict(
+        env_prefix='SPARSE_',
+        env_file='.env',
+        extra='ignore',
+        env_file_encoding='utf-8')
+
+
+class RerankSettings(BaseSettings):
+    ENABLED: bool = False  # Load the cross-encoder, requests may ask for re-ranking.
+    MODEL_NAME: Annotated[str, Field(min_length=1)] = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+    MAX_LENGTH: Annotated[int, Field(gt=0)] = 512  # Query and fragment tokens scored together.
+    CANDIDATES: Annotated[int, Field(gt=0)] = 30  # Hits over-fetched for re-ranking when the request sets 0.
+    MAX_CANDIDATES: Annotated[int, Field(gt=0)] = 100
+    BATCH_SIZE: Annotated[int, Field(gt=0)] = 64  # Pairs in one cross-encoder forward pass.
+    CACHE_MAX_MB: Annotated[float, Field(gt=0)] = 16
+    CACHE_TTL: Annotated[int, Field(ge=0)] = 86_400  # Seconds, 0 - no expiration.
+
+    model_config = SettingsConfigDict(
+        env_prefix='RERANK_',
+        env_file='.env',
+        extra='ignore',
+        env_file_encoding='utf-8')
+
+
+class GroupingSettings(BaseSettings):
+    MAX_CHUNKS_PER_PAGE: Annotated[int, Field(gt=0)] = 3  # When the request sets 0.
+    MAX_TOKENS: Annotated[int, Field(ge=0)] = 0  # Token budget of returned fragments, 0 - no budget.
+    CANDIDATES: Annotated[int, Field(gt=0)] = 30  # Chunk hits over-fetched for grouping.
+    MAX_CANDIDATES: Annotated[int, Field(gt=0)] = 100
+
+    model_config = SettingsConfigDict(
+        env_prefix='GROUPING_',
+        env_file='.env',
+        extra='ignore',
+        env_file_encoding='utf-8')
+
+
 grpc_server_settings = GRPCServerSettings()
 encoder_settings = EncoderSettings()
 vector_db_settings = VectorDBSettings()
+inference_settings = InferenceSettings()
+cache_settings = CacheSettings()
+sparse_settings = SparseSettings()
+rerank_settings = RerankSettings()
+grouping_settings = GroupingSettings()
@@ -0,0 +1,155 @@
+from itertools import count
+from typing import Any
+
+import grpc
+from core.logger import get_logger
+from qdrant_client import AsyncQdrantClient, models
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+from .exception import VectorDBException
+
+logger = get_logger(__name__)
+
+QDRANT_ERRORS = (UnexpectedResponse, ResponseHandlingException, grpc.RpcError, ValueError)
+
+
+class BaseQdrantClient:
+    def __init__(self) -> None:
+        self._clients: list[AsyncQdrantClient] = []
+        self._counter = count()
+
+    async def init_client(
+            self,
+            host: str,
+            port: int,
+            grpc_port: int = 6334,
+            prefer_grpc: bool = True,
+            pool_size: int = 1,
+            timeout: int | None = None,
+            grpc_options: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Создаёт пул долгоживущих клиентов Qdrant.
+
+        Каждый клиент держит свой gRPC канал, запросы распределяются по ним по кругу.
+
+        Args:
+            host: Хост Qdrant
+            port: REST порт Qdrant
+            grpc_port: gRPC порт Qdrant
+            prefer_grpc: Использовать gRPC вместо REST
+            pool_size: Количество клиентов (каналов) в пуле
+            timeout: Таймаут запросов в секундах
+            grpc_options: Опции gRPC канала
+        """
+        # Отдельный пул сабканалов, иначе каналы с одинаковыми параметрами делят одно TCP соединение
+        options = {"grpc.use_local_subchannel_pool": 1, **(grpc_options or {})}
+
+        self._clients = [
+            AsyncQdrantClient(host=host,
+                              port=port,
+                              grpc_port=grpc_port,
+                              prefer_grpc=prefer_grpc,
+                              timeout=timeout,
+                              grpc_options=options)
+            for _ in range(pool_size)
+        ]
+        logger.info(f"Initialized Qdrant client pool: {pool_size} clients, host {host}, "
+                    f"{'gRPC port ' + str(grpc_port) if prefer_grpc else 'REST port ' + str(port)}")
+
+    @property
+    def client(self) -> AsyncQdrantClient:
+        if not self._clients:
+            msg = "Qdrant client is not initialized."
+            raise VectorDBException(msg)
+        return self._clients[next(self._counter) % len(self._clients)]
+
+    async def close_client(self) -> None:
+        for client in self._clients:
+            await client.close()
+        self._clients = []
+        logger.info("Qdrant client pool closed.")
+
+    async def _create_collection(self, collection_name: str, vector_size: int) -> None:
+        try:
+            if await self.client.collection_exists(collection_name=collection_name):
+                return
+            await self.client.create_collection(
+                collection_name=collection_name,
+                vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
+            )
+            logger.info(f"Collection '{collection_name}' created.")
+        except QDRANT_ERRORS as e:
+            error_message = f"Create collection failed: {e}"
+            logger.error(error_message)
+            raise VectorDBException(error_message)
+
+    async def _upsert_points(self, collection_name: str, points: list[models.PointStruct]) -> bool:
+        try:
+            result = await self.client.upsert(collection_name=collection_name, points=points)
+            return result.status == models.UpdateStatus.COMPLETED
+        except QDRANT_ERRORS as e:
+            error_message = f"Upsert operation failed: {e}"
+            logger.error(error_message)
+            raise VectorDBException(error_message)
+
+    async def _delete_points(self, collection_name: str, point_ids: list[str | int]) -> bool:
+        try:
+            result = await self.client.delete(collection_name=collection_name,
+                                              points_selector=models.PointIdsList(points=point_ids))
+            return result.status == models.UpdateStatus.COMPLETED
+        except QDRANT_ERRORS as e:
+            error_message = f"Delete operation failed: {e}"
+            logger.error(error_message)
+            raise VectorDBException(error_message)
+
+    async def _search_points(
+            self,
+            collection_name: str,
+            query_vector: list[float],
+            limit: int,
+            search_params: models.SearchParams | None = None,
+            query_filter: models.Filter | None = None,
+            with_payload: list[str] | bool = True,
+            score_threshold: float | None = None,
+    ) -> list[models.ScoredPoint]:
+        try:
+            return await self.client.search(collection_name=collection_name,
+                                            query_vector=query_vector,
+                                            limit=limit,
+                                            search_params=search_params,
+                                            query_filter=query_filter,
+                                            with_payload=with_payload,
+                                            score_threshold=score_threshold)
+        except QDRANT_ERRORS as e:
+            error_message = f"Search operation failed: {e}"
+            logger.error(error_message)
+            raise VectorDBException(error_message)
+
+    async def _query_points(
+            self,
+            collection_name: str,
+            query: models.Query | models.SparseVector | list[float] | None,
+            limit: int,
+            using: str | None = None,
+            prefetch: list[models.Prefetch] | None = None,
+            search_params: models.SearchParams | None = None,
+            query_filter: models.Filter | None = None,
+            with_payload: list[str] | bool = True,
+            score_threshold: float | None = None,
+    ) -> list[models.ScoredPoint]:
+        try:
+            response = await self.client.query_points(collection_name=collection_name,
+                                                      query=query,
+                                                      using=using,
+                                                      prefetch=prefetch,
+                                                      limit=limit,
+                                                      search_params=search_params,
+                                                      query_filter=query_filter,
+                                                      with_payload=with_payload,
+                                                      score_threshold=score_threshold)
+            return response.points
+        except QDRANT_ERRORS as e:
+            error_message = f"Query operation failed: {e}"
+            logger.error(error_message)
+            raise VectorDBException(error_message)
@@ -0,0 +1,230 @@
+from core.config import SparseSettings, VectorDBSettings
+from core.logger import get_logger
+from qdrant_client import models
+
+from . import QDRANT_ERRORS, BaseQdrantClient
+from .exception import VectorDBException
+from .versions import CollectionVersions
+
+logger = get_logger(__name__)
+
+
+class FragmentsDB(BaseQdrantClient):
+    def __init__(self, settings: VectorDBSettings, sparse_settings: SparseSettings | None = None) -> None:
+        """
+        Поиск текстовых фрагментов в коллекциях Qdrant.
+
+        Args:
+            settings: Настройки подключения к Qdrant
+            sparse_settings: Настройки разреженных векторов BM25, None - только плотный поиск
+        """
+        super().__init__()
+        self.settings = settings
+        self.sparse_settings = sparse_settings
+        self._versions = CollectionVersions(check_interval=settings.VERSION_CHECK_INTERVAL)
+
+    async def initialize(self) -> None:
+        """Инициализация пула клиентов."""
+        await self.init_client(
+            host=self.settings.HOST,
+            port=self.settings.PORT,
+            grpc_port=self.settings.GRPC_PORT,
+            prefer_grpc=self.settings.PREFER_GRPC,
+            pool_size=self.settings.POOL_SIZE,
+            timeout=self.settings.TIMEOUT,
+            grpc_options={
+                "grpc.keepalive_time_ms": self.settings.KEEPALIVE_TIME_MS,
+                "grpc.keepalive_timeout_ms": self.settings.KEEPALIVE_TIMEOUT_MS,
+                "grpc.keepalive_permit_without_calls": 1,
+            },
+        )
+
+    def get_search_params(self, hnsw_ef: int = 0, exact: bool | None = None) -> models.SearchParams | None:
+        """
+        Параметры поиска с учётом значений из запроса и настроек по умолчанию.
+
+        Args:
+            hnsw_ef: Размер списка кандидатов HNSW, 0 - значение из настроек
+            exact: Точный поиск без индекса, None - значение из настроек
+
+        Returns:
+            SearchParams | None: None, если используются параметры коллекции
+        """
+        hnsw_ef = hnsw_ef or self.settings.HNSW_EF
+        if exact is None:
+            exact = self.settings.SEARCH_EXACT
+
+        if not hnsw_ef and not exact:
+            return None
+        return models.SearchParams(hnsw_ef=hnsw_ef or None, exact=exact)
+
+    @staticmethod
+    def make_filter(
+            lang: str = "",
+            page_ids: list[int] | None = None,
+            time_request_from: str = "",
+            time_request_to: str = "",
+    ) -> models.Filter | None:
+        """
+        Фильтр по payload фрагментов.
+
+        Args:
+            lang: Язык страницы, "" - любой
+            page_ids: Страницы, None или пустой список - любые
+            time_request_from: Нижняя граница time_request в ISO 8601, "" - без границы
+            time_request_to: Верхняя граница time_request в ISO 8601, "" - без границы
+
+        Returns:
+            Filter | None: None, если условий нет
+        """
+        conditions = []
+        if lang:
+            conditions.append(models.FieldCondition(key="lang", match=models.MatchValue(value=lang)))
+        if page_ids:
+            conditions.append(models.FieldCondition(key="page_id", match=models.MatchAny(any=list(page_ids))))
+        if time_request_from or time_request_to:
+            conditions.append(models.FieldCondition(key="time_request",
+                                                    range=models.DatetimeRange(gte=time_request_from or None,
+                                                                               lte=time_request_to or None)))
+        return models.Filter(must=conditions) if conditions else None
+
+    async def search(
+            self,
+            collection_name: str,
+            query_vector: list[float],
+            limit: int,
+            hnsw_ef: int = 0,
+            exact: bool | None = None,
+            query_filter: models.Filter | None = None,
+            with_payload: list[str] | bool = True,
+            score_threshold: float | None = None,
+    ) -> list[models.ScoredPoint]:
+        """
+        Поиск ближайших фрагментов.
+
+        Args:
+            collection_name: Имя коллекции
+            query_vector: Векторное представление запроса
+            limit: Количество результатов
+            hnsw_ef: Размер списка кандидатов HNSW, 0 - значение из настроек
+            exact: Точный поиск без индекса, None - значение из настроек
+            query_filter: Фильтр по payload
+            with_payload: Возвращаемые поля payload, True - весь payload
+            score_threshold: Минимальный score, None - без порога
+
+        Returns:
+            list[ScoredPoint]: Найденные точки с payload и score
+        """
+        return await self._search_points(collection_name,
+                                         query_vector,
+                                         limit,
+                                         search_params=self.get_search_params(hnsw_ef, exact),
+                                         query_filter=query_filter,
+                                         with_payload=with_payload,
+                                         score_threshold=score_threshold)
+
+    def _get_sparse_settings(self) -> SparseSettings:
+        if self.sparse_settings is None:
+            msg = "Sparse search is not configured."
+            raise VectorDBException(msg)
+        return self.sparse_settings
+
+    async def search_sparse(
+            self,
+            collection_name: str,
+            query_sparse: models.SparseVector,
+            limit: int,
+            query_filter: models.Filter | None = None,
+            with_payload: list[str] | bool = True,
+            score_threshold: float | None = None,
+    ) -> list[models.ScoredPoint]:
+        """
+        Лексический поиск фрагментов по разреженным векторам BM25.
+
+        Args:
+            collection_name: Имя коллекции
+            query_sparse: Разреженный вектор запроса
+            limit: Количество результатов
+            query_filter: Фильтр по payload
+            with_payload: Возвращаемые поля payload, True - весь payload
+            score_threshold: Минимальный score BM25, None - без порога
+
+        Returns:
+            list[ScoredPoint]: Найденные точки с payload и score BM25
+        """
+        return await self._query_points(collection_name,
+                                        query_sparse,
+                                        limit,
+                                        using=self._get_sparse_settings().VECTOR_NAME,
+                                        query_filter=query_filter,
+                                        with_payload=with_payload,
+                                        score_threshold=score_threshold)
+
+    async def search_hybrid(
+            self,
+            collection_name: str,
+            query_vector: list[float],
+            query_sparse: models.SparseVector,
+            limit: int,
+            hnsw_ef: int = 0,
+            exact: bool | None = None,
+            query_filter: models.Filter | None = None,
+            with_payload: list[str] | bool = True,
+            score_threshold: float | None = None,
+    ) -> list[models.ScoredPoint]:
+        """
+        Гибридный поиск: кандидаты плотного и BM25 поиска объединяются в Qdrant по reciprocal rank fusion.
+
+        Args:
+            collection_name: Имя коллекции
+            query_vector: Векторное представление запроса
+            query_sparse: Разреженный вектор запроса
+            limit: Количество результатов
+            hnsw_ef: Размер списка кандидатов HNSW, 0 - значение из настроек
+            exact: Точный поиск без индекса, None - значение из настроек
+            query_filter: Фильтр по payload, применяется к кандидатам обоих поисков
+            with_payload: Возвращаемые поля payload, True - весь payload
+            score_threshold: Минимальный score плотного поиска для кандидатов, None - без порога
+
+        Returns:
+            list[ScoredPoint]: Найденные точки с payload и score RRF
+        """
+        sparse_settings = self._get_sparse_settings()
+        prefetch_limit = max(limit, sparse_settings.HYBRID_PREFETCH)
+        prefetch = [
+            models.Prefetch(query=query_vector,
+                            limit=prefetch_limit,
+                            params=self.get_search_params(hnsw_ef, exact),
+                            filter=query_filter,
+                            score_threshold=score_threshold),
+            models.Prefetch(query=query_sparse,
+                            using=sparse_settings.VECTOR_NAME,
+                            limit=prefetch_limit,
+                            filter=query_filter),
+        ]
+        return await self._query_points(collection_name,
+                                        models.FusionQuery(fusion=models.Fusion.RRF),
+                                        limit,
+                                        prefetch=prefetch,
+                                        with_payload=with_payload)
+
+    async def get_collection_version(self, collection_name: str) -> int:
+        """
+        Версия коллекции, которую увеличивает ETL после загрузки данных.
+
+        Args:
+            collection_name: Имя коллекции
+
+        Returns:
+            int: Версия коллекции, 0 - если ETL ещё не отмечал версию
+        """
+        try:
+            return await self._versions.get(self.client, collection_name)
+        except QDRANT_ERRORS as e:
+            error_message = f"Reading collection version failed: {e}"
+            logger.error(error_message)
+            raise VectorDBException(error_message)
+
+    async def cleanup(self) -> None:
+        """Закрытие соединений."""
+        await self.close_client()
@@ -0,0 +1,87 @@
+import time
+import uuid
+
+from core.logger import get_logger
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
+
+logger = get_logger(__name__)
+
+VERSIONS_COLLECTION = "collection_versions"
+
+
+def version_point_id(collection_name: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"qdrant-collection-version/{collection_name}"))
+
+
+def bump_collection_version(client: QdrantClient, collection_name: str,
+                            versions_collection: str = VERSIONS_COLLECTION) -> int:
+    """
+    Увеличивает версию коллекции. Вызывается ETL после загрузки данных,
+    чтобы сервис сбросил закэшированные результаты поиска по этой коллекции.
+
+    В Qdrant нет условной записи, поэтому версия - время записи в миллисекундах, но не меньше
+    прочитанной версии + 1. Два ETL, завершившиеся одновременно, пишут разные версии,
+    и кэш сбрасывается после каждой загрузки, а не только после первой.
+
+    Args:
+        client: Синхронный клиент Qdrant
+        collection_name: Имя коллекции с документами
+        versions_collection: Служебная коллекция с версиями
+
+    Returns:
+        int: Новая версия коллекции
+    """
+    if not client.collection_exists(collection_name=versions_collection):
+        client.create_collection(
+            collection_name=versions_collection,
+            vectors_config=models.VectorParams(size=1, distance=models.Distance.DOT),
+        )
+
+    point_id = version_point_id(collection_name)
+    points = client.retrieve(collection_name=versions_collection, ids=[point_id], with_payload=True)
+    previous = points[0].payload.get("version", 0) if points else 0
+    version = max(previous + 1, time.time_ns() // 1_000_000)
+
+    client.upsert(
+        collection_name=versions_collection,
+        points=[models.PointStruct(id=point_id,
+                                   vector=[1.0],
+                                   payload={"collection": collection_name, "version": version})],
+    )
+    logger.info(f"Collection '{collection_name}' version bumped to {version}")
+    return version
+
+
+class CollectionVersions:
+    def __init__(self, check_interval: float, versions_collection: str = VERSIONS_COLLECTION):
+        """
+        Версии коллекций, прочитанные из Qdrant не чаще одного раза в check_interval секунд.
+
+        Args:
+            check_interval: Интервал перечитывания версии в секундах
+            versions_collection: Служебная коллекция с версиями
+        """
+        self._check_interval = check_interval
+        self._versions_collection = versions_collection
+        self._versions: dict[str, tuple[float, int]] = {}
+
+    async def get(self, client: AsyncQdrantClient, collection_name: str) -> int:
+        checked_at, version = self._versions.get(collection_name, (0.0, 0))
+        now = time.monotonic()
+        if checked_at and now - checked_at < self._check_interval:
+            return version
+
+        new_version = await self._fetch(client, collection_name)
+        if new_version != version and checked_at:
+            logger.info(f"Collection '{collection_name}' version changed: {version} -> {new_version}")
+        self._versions[collection_name] = (now, new_version)
+        return new_version
+
+    async def _fetch(self, client: AsyncQdrantClient, collection_name: str) -> int:
+        if not await client.collection_exists(collection_name=self._versions_collection):
+            return 0
+
+        points = await client.retrieve(collection_name=self._versions_collection,
+                                       ids=[version_point_id(collection_name)],
+                                       with_payload=True)
+        return points[0].payload.get("version", 0) if points else 0
@@ -1,65 +1,122 @@
 import sqlite3
-from collections.abc import Iterator
+from collections.abc import Iterator, Sequence
+from contextlib import closing
 from datetime import datetime
 
-from .model import WikiPage
+from .model import WikiRow
+
+PAGE_COLUMNS = ("page_id", "title", "wikitext", "url", "source", "lang", "revision_id",
+                "created_at", "updated_at", "time_request")
+
+
+def parse_datetime(value: str | None) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
 
 
 class SQLiteIterator:
-    def __init__(self, db_path: str, max_documents:int | None = None):
+    def __init__(self,
+                 db_path: str,
+                 max_documents: int | None = None,
+                 after_page_id: int | None = None,
+                 last_page_id: int | None = None,
+                 columns: Sequence[str] = PAGE_COLUMNS,
+                 page_size: int = 1000):
         """
         Инициализирует итератор.
 
+        Строки читаются страницами по page_id (WHERE page_id > последний прочитанный),
+        на каждую страницу открывается короткое соединение, поэтому итератор можно
+        обходить из любого потока или процесса, а диапазоны page_id читать параллельно.
+
         :param db_path: Путь к SQLite базе данных.
         :param max_documents: Максимальное количество документов для возврата. Если None, возвращаются все документы.
+        :param after_page_id: Вернуть только страницы с page_id больше указанного, для продолжения с контрольной точки.
+        :param last_page_id: Вернуть только страницы с page_id не больше указанного.
+        :param columns: Читаемые колонки, page_id читается всегда.
+        :param page_size: Количество строк, читаемых одним запросом.
         """
+        unknown = set(columns) - set(PAGE_COLUMNS)
+        if unknown:
+            msg = f"Unknown wiki_page columns: {sorted(unknown)}"
+            raise ValueError(msg)
+
         self.db_path = db_path
         self.max_documents = max_documents
+        self.after_page_id = after_page_id
+        self.last_page_id = last_page_id
+        self.columns = ("page_id", *(column for column in columns if column != "page_id"))
+        self.page_size = page_size
+
+    def _copy(self, **changes) -> "SQLiteIterator":
+        params = {
+            "db_path": self.db_path,
+            "max_documents": self.max_documents,
+            "after_page_id": self.after_page_id,
+            "last_page_id": self.last_page_id,
+            "columns": self.columns,
+            "page_size": self.page_size,
+        }
+        params.update(changes)
+        return SQLiteIterator(**params)
+
+    def with_columns(self, *columns: str) -> "SQLiteIterator":
+        """
+        :param columns: Колонки для чтения.
+        :return: Итератор по тем же страницам, читающий только указанные колонки.
+        """
+        return self._copy(columns=columns)
+
+    def with_range(self, after_page_id: int | None, last_page_id: int | None) -> "SQLiteIterator":
+        """
+        :return: Итератор по страницам с after_page_id < page_id <= last_page_id.
+        """
+        return self._copy(after_page_id=after_page_id, last_page_id=last_page_id, max_documents=None)
+
+    def _where(self, after_page_id: int | None) -> tuple[str, tuple]:
+        conditions, params = [], []
+        if after_page_id is not None:
+            conditions.append("page_id > ?")
+            params.append(after_page_id)
+        if self.last_page_id is not None:
+            conditions.append("page_id <= ?")
+            params.append(self.last_page_id)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return where, tuple(params)
+
+    def iter_rows(self) -> Iterator[tuple]:
+        """
+        Возвращает строки таблицы кортежами в порядке колонок self.columns, по возрастанию page_id.
+
+        :return: Итератор по строкам.
+        """
+        after_page_id = self.after_page_id
+        remaining = self.max_documents
+
+        while remaining is None or remaining > 0:
+            limit = self.page_size if remaining is None else min(self.page_size, remaining)
+            where, params = self._where(after_page_id)
+            query = f"SELECT {', '.join(self.columns)} FROM wiki_page{where} ORDER BY page_id LIMIT ?"
+
+            with closing(sqlite3.connect(self.db_path)) as conn:
+                rows = conn.execute(query, (*params, limit)).fetchall()
+            if not rows:
+                break
+
+            yield from rows
+            after_page_id = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+            if len(rows) < limit:
+                break
 
-    def __iter__(self) -> Iterator[WikiPage]:
+    def __iter__(self) -> Iterator[WikiRow]:
         """
         Возвращает итератор по документам.
 
-        :return: Итератор, возвращающий объекты WikiPage.
+        :return: Итератор, возвращающий объекты WikiRow, wikitext разбирается при обращении к text.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        query = "SELECT page_id, title, wikitext, url, source, lang, revision_id, created_at, updated_at, time_request FROM wiki_page"
-
-        if self.max_documents is not None:
-            query += f" LIMIT {self.max_documents}"
-
-        cursor.execute(query)
-
-        for row in cursor:
-            try:
-                created_at = datetime.fromisoformat(row[7])
-            except ValueError:
-                created_at = None
-
-            try:
-                updated_at = datetime.fromisoformat(row[8])
-            except ValueError:
-                updated_at = None
-
-            try:
-                time_request = datetime.fromisoformat(row[9])
-            except ValueError:
-                time_request = None
-
-            document = WikiPage(
-                page_id=row[0],
-                title=row[1],
-                wikitext=row[2],
-                url=row[3],
-                source=row[4],
-                lang=row[5],
-                revision_id=row[6],
-                created_at=created_at,
-                updated_at=updated_at,
-                time_request=time_request
-            )
-            yield document
-
-        conn.close()
+        for row in self.iter_rows():
+            yield WikiRow(**dict(zip(self.columns, row)))
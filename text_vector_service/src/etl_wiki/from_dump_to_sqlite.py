@@ -1,11 +1,19 @@
-import re
+import argparse
+import bz2
 import logging
+import os
+import re
 import sqlite3
-
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Pattern
+from typing import BinaryIO
 
-import xml.etree.ElementTree as ET
+from etl_wiki.keyword_matcher import KeywordMatcher
 
 # https://dumps.wikimedia.org/ruwiki/20241101/
 
@@ -25,6 +33,16 @@ movie_phrases = {
 title_stop_words = ["(значения)"]
 text_stop_words = ["#перенаправление", "к удалению", "<noinclude>", "#REDIRECT"]
 min_length_text = 512
+movie_check_length = 1024  # Фразы о кино ищутся в начале текста
+
+DEFAULT_NAMESPACE = 'http://www.mediawiki.org/xml/export-0.11/'
+READ_BLOCK_SIZE = 16 * 1024 * 1024
+CHUNK_SIZE = 8 * 1024 * 1024  # Примерный размер куска дампа, отдаваемого воркеру
+BATCH_SIZE = 20000  # Строк в одной транзакции записи
+REPORT_INTERVAL = 30.0
+
+PAGE_START = b'<page>'
+PAGE_END = b'</page>'
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -50,18 +68,6 @@ def create_database(db_file: str) -> None:
     conn.close()
 
 
-def compile_phrase_pattern(phrases: set[str]) -> Pattern:
-    escaped_phrases = [re.escape(phrase) for phrase in phrases]
-    pattern = re.compile(r'\b(' + '|'.join(escaped_phrases) + r')\b', re.IGNORECASE)
-    return pattern
-
-
-def contains_movie_phrase(text: str, pattern: Pattern) -> bool:
-    check_length = min(1024, len(text))
-    text_to_check = text[:check_length]
-    return bool(pattern.search(text_to_check))
-
-
 def get_revision_id(revision: ET.Element, ns: dict[str, str]) -> str | None:
     rev_id_elem = revision.find('ns:id', ns)
     return rev_id_elem.text if rev_id_elem is not None else None
@@ -75,7 +81,7 @@ def insert_batch(cursor: sqlite3.Cursor, batch: list[tuple]) -> None:
     ''', batch)
 
 
-def process_page(elem: ET.Element, pattern: Pattern, ns: dict[str, str]) -> tuple | None:
+def process_page(elem: ET.Element, matcher: KeywordMatcher, ns: dict[str, str]) -> tuple | None:
     ns_text = elem.findtext('ns:ns', namespaces=ns)
     if ns_text != '0':
         return None
@@ -101,10 +107,13 @@ def process_page(elem: ET.Element, pattern: Pattern, ns: dict[str, str]) -> tupl
     text_elem = revision.find('ns:text', namespaces=ns)
     text = text_elem.text if text_elem is not None else ''
 
-    if len(text) < min_length_text or any(word in text for word in text_stop_words):
+    if len(text) < min_length_text:
         return None
 
-    if contains_movie_phrase(text, pattern):
+    # Стоп-слова заголовка проверены выше, стоп-слова текста ищутся отдельными поисками подстроки,
+    # фразы о кино - одним проходом автомата по началу текста
+    match = matcher.classify(text)
+    if not match.stop_word and match.movie_phrase:
         current_time = datetime.now().isoformat()
         data = (
             int(page_id),
@@ -123,47 +132,198 @@ def process_page(elem: ET.Element, pattern: Pattern, ns: dict[str, str]) -> tupl
         return None
 
 
-def process_dump(dump_file: str, db_file: str, movie_phrases: set[str]) -> None:
+@contextmanager
+def open_dump(dump_file: str) -> Iterator[BinaryIO]:
+    """
+    :param dump_file: Путь к дампу, сжатому bz2 или несжатому.
+    :return: Контекстный менеджер с открытым в бинарном режиме дампом.
+    """
+    if dump_file.endswith('.bz2'):
+        with bz2.open(dump_file, 'rb') as dump:
+            yield dump
+    else:
+        with open(dump_file, 'rb') as dump:
+            yield dump
+
+
+def iter_page_chunks(dump: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[str, bytes]]:
+    """
+    Читает дамп блоками и режет его на куски из целых элементов <page> без разбора XML.
+
+    :param dump: Открытый в бинарном режиме дамп.
+    :param chunk_size: Примерный размер куска в байтах.
+    :return: Итератор пар (пространство имён дампа, байты подряд идущих элементов <page>).
+    """
+    namespace = DEFAULT_NAMESPACE
+    buffer = b''
+    header_done = False
+
+    while block := dump.read(READ_BLOCK_SIZE):
+        buffer += block
+
+        if not header_done:
+            # Заголовок <mediawiki> и <siteinfo> до первой страницы
+            start = buffer.find(PAGE_START)
+            if start < 0:
+                continue
+            match = re.search(rb'<mediawiki[^>]*\sxmlns="([^"]+)"', buffer[:start])
+            if match:
+                namespace = match.group(1).decode()
+            buffer = buffer[start:]
+            header_done = True
+
+        while len(buffer) >= chunk_size:
+            end = buffer.rfind(PAGE_END, 0, chunk_size)
+            if end < 0:
+                # Страница больше куска - отдаём её целиком
+                end = buffer.find(PAGE_END, chunk_size)
+                if end < 0:
+                    break
+            end += len(PAGE_END)
+            yield namespace, buffer[:end]
+            buffer = buffer[end:]
+
+    end = buffer.rfind(PAGE_END)
+    if end >= 0:
+        yield namespace, buffer[:end + len(PAGE_END)]
+
+
+def create_matcher(phrases: set[str]) -> KeywordMatcher:
+    return KeywordMatcher(phrases, text_stop_words, check_length=movie_check_length)
+
+
+# Автомат ключевых слов внутри процесса-воркера, строится один раз при старте процесса
+_matcher: KeywordMatcher | None = None
+
+
+def _init_worker(phrases: set[str]) -> None:
+    global _matcher
+    _matcher = create_matcher(phrases)
+
+
+def process_chunk(namespace: str, chunk: bytes) -> tuple[int, list[tuple]]:
+    """
+    Разбирает кусок дампа и отбирает страницы о кино. Выполняется в процессе-воркере.
+
+    :param namespace: Пространство имён XML дампа.
+    :param chunk: Байты подряд идущих элементов <page>.
+    :return: Количество страниц в куске и строки для таблицы wiki_page.
+    """
+    ns = {'ns': namespace}
+    root = ET.fromstring(b'<mediawiki xmlns="' + namespace.encode() + b'">' + chunk + b'</mediawiki>')
+
+    pages = root.findall('ns:page', ns)
+    rows = []
+    for elem in pages:
+        data = process_page(elem, _matcher, ns)
+        if data:
+            rows.append(data)
+    return len(pages), rows
+
+
+def open_database(db_file: str) -> sqlite3.Connection:
     conn = sqlite3.connect(db_file)
+    # WAL и большие транзакции: запись не ждёт fsync на каждую сотню строк
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+def process_dump(dump_file: str,
+                 db_file: str,
+                 movie_phrases: set[str],
+                 batch_size: int = BATCH_SIZE,
+                 workers: int | None = None,
+                 chunk_size: int = CHUNK_SIZE) -> None:
+    """
+    Потоково читает дамп (в том числе .bz2), разбирает куски страниц в пуле процессов
+    и записывает отобранные страницы в SQLite большими транзакциями.
+
+    :param dump_file: Путь к XML дампу Wikipedia.
+    :param db_file: Путь к SQLite базе данных.
+    :param movie_phrases: Фразы, по которым отбираются страницы.
+    :param batch_size: Количество строк в одной транзакции записи.
+    :param workers: Количество процессов разбора, по умолчанию - количество CPU без одного.
+    :param chunk_size: Примерный размер куска дампа, отдаваемого воркеру, в байтах.
+    """
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    conn = open_database(db_file)
     cursor = conn.cursor()
 
     batch = []
-    batch_size = 100
     page_count = 0
     matched_pages = 0
+    read_bytes = 0
+    started_at = last_report = time.perf_counter()
 
-    pattern = compile_phrase_pattern(movie_phrases)
-    ns = {'ns': 'http://www.mediawiki.org/xml/export-0.11/'}
-
-    context = ET.iterparse(dump_file, events=('end',))
-    for _, elem in context:
-        if elem.tag == '{http://www.mediawiki.org/xml/export-0.11/}page':
-            page_count += 1
-
-            data = process_page(elem, pattern, ns)
-            if data:
-                matched_pages += 1
-                batch.append(data)
-
-                if len(batch) >= batch_size:
-                    insert_batch(cursor, batch)
-                    conn.commit()
-                    batch = []
-                    logging.info(f'Обработано страниц: {page_count}, найдено совпадений: {matched_pages}')
+    def write(rows: list[tuple]) -> None:
+        insert_batch(cursor, rows)
+        conn.commit()
 
-            elem.clear()  # Очистка элемента для освобождения памяти
+    def report(final: bool = False) -> None:
+        elapsed = max(time.perf_counter() - started_at, 1e-9)
+        message = 'Завершена обработка' if final else 'Обработано'
+        logging.info(f'{message}: страниц {page_count} ({page_count / elapsed:.0f}/с), '
+                     f'найдено совпадений: {matched_pages}, '
+                     f'прочитано {read_bytes / 2 ** 20:.0f} МБ ({read_bytes / 2 ** 20 / elapsed:.1f} МБ/с) '
+                     f'за {elapsed:.0f} с')
+
+    with open_dump(dump_file) as dump, ProcessPoolExecutor(max_workers=workers,
+                                                           initializer=_init_worker,
+                                                           initargs=(movie_phrases,)) as pool:
+        # Кусков в работе вдвое больше воркеров, результаты забираются в порядке дампа
+        in_flight: deque[Future] = deque()
+        chunks = iter_page_chunks(dump, chunk_size)
+
+        while True:
+            for namespace, chunk in chunks:
+                read_bytes += len(chunk)
+                in_flight.append(pool.submit(process_chunk, namespace, chunk))
+                if len(in_flight) >= workers * 2:
+                    break
+            if not in_flight:
+                break
+
+            pages, rows = in_flight.popleft().result()
+            page_count += pages
+            matched_pages += len(rows)
+            batch.extend(rows)
+
+            if len(batch) >= batch_size:
+                write(batch)
+                batch = []
+
+            if time.perf_counter() - last_report >= REPORT_INTERVAL:
+                last_report = time.perf_counter()
+                report()
 
     if batch:
-        insert_batch(cursor, batch)
-        conn.commit()
+        write(batch)
 
     conn.close()
-    logging.info(f'Завершена обработка. Всего страниц: {page_count}, найдено совпадений: {matched_pages}')
+    report(final=True)
 
 
 def main() -> None:
-    create_database(DATABASE_FILE)
-    process_dump(DUMP_FILE, DATABASE_FILE, movie_phrases)
+    parser = argparse.ArgumentParser(
+        description="Отбор страниц о кино из XML дампа Wikipedia в SQLite."
+    )
+    parser.add_argument("-d", "--dump", default=DUMP_FILE, help="Путь к дампу, .xml или .xml.bz2")
+    parser.add_argument("-o", "--database", default=DATABASE_FILE, help="Путь к SQLite базе данных")
+    parser.add_argument("-b", "--batch-size", type=int, default=BATCH_SIZE,
+                        help="Количество строк в одной транзакции записи")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Количество процессов разбора, по умолчанию - количество CPU без одного")
+    parser.add_argument("--chunk-mb", type=int, default=CHUNK_SIZE // 2 ** 20,
+                        help="Размер куска дампа, отдаваемого воркеру, в МБ")
+
+    args = parser.parse_args()
+
+    create_database(args.database)
+    process_dump(args.dump, args.database, movie_phrases,
+                 batch_size=args.batch_size,
+                 workers=args.workers,
+                 chunk_size=args.chunk_mb * 2 ** 20)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,99 @@
+import sqlite3
+import uuid
+from collections.abc import Iterable
+from datetime import UTC, datetime
+
+# Пространство имён для детерминированных идентификаторов точек
+POINT_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "text-vector-service/wiki-fragment")
+
+
+def fragment_point_id(page_id: int, revision_id: int, chunk_index: int) -> str:
+    """
+    Идентификатор точки, одинаковый при каждом запуске ETL для одного и того же чанка ревизии страницы.
+    """
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{page_id}:{revision_id}:{chunk_index}"))
+
+
+class IndexState:
+    def __init__(self, db_path: str, collection_name: str):
+        """
+        Состояние индексации в отдельной SQLite базе: проиндексированные ревизии страниц
+        и контрольная точка незавершённого запуска.
+
+        :param db_path: Путь к SQLite базе состояния.
+        :param collection_name: Коллекция Qdrant, к которой относится состояние.
+        """
+        self.collection_name = collection_name
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS etl_index_state (
+                collection TEXT NOT NULL,
+                page_id INTEGER NOT NULL,
+                revision_id INTEGER NOT NULL,
+                chunks INTEGER NOT NULL,
+                indexed_at TEXT NOT NULL,
+                PRIMARY KEY (collection, page_id)
+            );
+            CREATE TABLE IF NOT EXISTS etl_checkpoint (
+                collection TEXT PRIMARY KEY,
+                last_page_id INTEGER NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+        ''')
+        self.conn.commit()
+
+    def get_revisions(self, page_ids: list[int]) -> dict[int, int]:
+        """
+        Возвращает проиндексированные ревизии для указанных страниц.
+
+        :param page_ids: Идентификаторы страниц.
+        :return: Словарь page_id -> revision_id для уже проиндексированных страниц.
+        """
+        if not page_ids:
+            return {}
+
+        placeholders = ", ".join("?" * len(page_ids))
+        cursor = self.conn.execute(
+            f"SELECT page_id, revision_id FROM etl_index_state "
+            f"WHERE collection = ? AND page_id IN ({placeholders})",
+            (self.collection_name, *page_ids),
+        )
+        return dict(cursor.fetchall())
+
+    def mark_indexed(self, pages: Iterable[tuple[int, int, int]]) -> None:
+        """
+        Отмечает страницы проиндексированными.
+
+        :param pages: Тройки (page_id, revision_id, количество чанков).
+        """
+        indexed_at = datetime.now(UTC).isoformat()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO etl_index_state (collection, page_id, revision_id, chunks, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(self.collection_name, page_id, revision_id, chunks, indexed_at)
+             for page_id, revision_id, chunks in pages],
+        )
+        self.conn.commit()
+
+    def get_checkpoint(self) -> int | None:
+        """
+        :return: page_id, до которого включительно обработаны все страницы незавершённого запуска.
+        """
+        row = self.conn.execute("SELECT last_page_id FROM etl_checkpoint WHERE collection = ?",
+                                (self.collection_name,)).fetchone()
+        return row[0] if row else None
+
+    def save_checkpoint(self, last_page_id: int) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO etl_checkpoint (collection, last_page_id, updated_at) VALUES (?, ?, ?)",
+            (self.collection_name, last_page_id, datetime.now(UTC).isoformat()),
+        )
+        self.conn.commit()
+
+    def clear_checkpoint(self) -> None:
+        """Удаляет контрольную точку после успешного завершения запуска."""
+        self.conn.execute("DELETE FROM etl_checkpoint WHERE collection = ?", (self.collection_name,))
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
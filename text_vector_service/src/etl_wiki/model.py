@@ -1,24 +1,29 @@
-from datetime import datetime
+from dataclasses import dataclass
+from functools import cached_property
 
 import mwparserfromhell
-from pydantic import BaseModel
 
 
-class WikiPage(BaseModel):
-    page_id: int
-    title: str
-    wikitext: str
-    text: str | None = None
-    url: str
-    source: str
-    lang: str
-    revision_id: int
-    created_at: datetime
-    updated_at: datetime
-    time_request: datetime
+@dataclass
+class WikiRow:
+    """
+    Лёгкая строка wiki_page: значения колонок как есть, wikitext разбирается только при обращении к text.
 
-    def model_post_init(self, __context):
-        if self.text is None and self.wikitext:
-            wikicode = mwparserfromhell.parse(self.wikitext)
-            self.text = wikicode.strip_code()
+    Колонки, не выбранные запросом, остаются None.
+    """
+    page_id: int
+    title: str | None = None
+    wikitext: str | None = None
+    url: str | None = None
+    source: str | None = None
+    lang: str | None = None
+    revision_id: int | None = None
+    created_at: str | None = None
+    updated_at: str | None = None
+    time_request: str | None = None
 
+    @cached_property
+    def text(self) -> str:
+        if not self.wikitext:
+            return ""
+        return mwparserfromhell.parse(self.wikitext).strip_code()
@@ -0,0 +1,356 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+from bm25 import BM25Encoder
+from core.config import SparseSettings
+from core.logger import get_logger
+from qdrant_client import AsyncQdrantClient, models
+from qdrant_client.http.models import PointStruct
+from text_splitter import TextSplitter
+from transformers import AutoTokenizer
+
+from etl_wiki.db_iterator import SQLiteIterator, parse_datetime
+from etl_wiki.index_state import IndexState, fragment_point_id
+
+logger = get_logger(__name__)
+
+# Текст чанка, payload будущей точки и разреженный вектор BM25, если он включён
+Fragment = tuple[str, dict, models.SparseVector | None]
+Encoder = Callable[[list[str]], list[list[float]]]
+
+# Сплиттер и энкодер BM25 внутри процесса-воркера, создаются один раз при старте процесса
+_splitter: TextSplitter | None = None
+_sparse_encoder: BM25Encoder | None = None
+
+
+def _init_worker(model_name: str, cache_dir: str, chunk_size: int, overlap_percentage: int,
+                 sparse_settings: SparseSettings | None) -> None:
+    global _splitter, _sparse_encoder
+    tokenizer = AutoTokenizer.from_pretrained(model_name, cache_dir=cache_dir)
+    _splitter = TextSplitter(tokenizer=tokenizer, chunk_size=chunk_size, overlap_percentage=overlap_percentage)
+    _sparse_encoder = BM25Encoder(sparse_settings) if sparse_settings is not None else None
+
+
+def split_range(pages: SQLiteIterator, page_ids: list[int]) -> list[Fragment]:
+    """
+    Читает диапазон страниц wiki_page, разбирает wikitext и режет тексты на чанки. Выполняется в процессе-воркере.
+
+    Args:
+        pages (SQLiteIterator): итератор по диапазону page_id задачи, воркер читает его своим соединением
+        page_ids (list[int]): страницы диапазона, которые нужно нарезать
+
+    Returns:
+        list[Fragment]: чанки всех страниц с payload и разреженными векторами
+    """
+    if _splitter is None:
+        msg = "Text splitter is not initialized in the ETL worker."
+        raise RuntimeError(msg)
+
+    wanted = set(page_ids)
+    rows = [row for row in pages if row.page_id in wanted]
+    titles = [f"Заголовок страницы: {row.title}. Начало фрагмента:" for row in rows]
+    pages_chunks = _splitter.split_texts([(title, row.text) for title, row in zip(titles, rows)])
+
+    fragments = []
+    for row, chunks in zip(rows, pages_chunks):
+        time_request = parse_datetime(row.time_request)
+        for chunk_index, chunk in enumerate(chunks):
+            payload = {
+                "text": chunk,
+                "page_id": row.page_id,
+                "revision_id": row.revision_id,
+                "chunk_index": chunk_index,
+                "title": row.title,
+                "lang": row.lang,
+                "time_request": time_request.isoformat() if time_request else None
+            }
+            sparse_vector = _sparse_encoder.encode_document(chunk) if _sparse_encoder is not None else None
+            fragments.append((chunk, payload, sparse_vector))
+    return fragments
+
+
+@dataclass
+class PipelineConfig:
+    workers: int = max(1, (os.cpu_count() or 2) - 1)  # Процессы для разбора и нарезки
+    pages_per_task: int = 64  # Страниц в одной задаче воркеру
+    encode_batch_size: int = 256  # Чанков разных страниц в одном вызове энкодера
+    upsert_batch_size: int = 1000
+    upload_concurrency: int = 4  # Одновременных upsert в Qdrant
+    queue_size: int = 8  # Размер очередей между стадиями, в батчах
+    report_interval: float = 10.0
+
+
+@dataclass
+class PipelineStats:
+    pages: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    encoded: int = 0
+    uploaded: int = 0
+    indexed: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def __str__(self) -> str:
+        elapsed = max(time.perf_counter() - self.started_at, 1e-9)
+        return (f"split {self.pages} pages ({self.pages / elapsed:.1f}/s) into {self.chunks} chunks, "
+                f"skipped {self.skipped} unchanged pages, "
+                f"encoded {self.encoded} ({self.encoded / elapsed:.1f}/s), "
+                f"uploaded {self.uploaded} ({self.uploaded / elapsed:.1f}/s), "
+                f"indexed {self.indexed} pages in {elapsed:.0f} s")
+
+
+@dataclass
+class PageProgress:
+    revision_id: int
+    chunks: int = 0
+    remaining: int | None = None  # None - страница ещё не нарезана
+
+
+class WikiETLPipeline:
+    def __init__(self,
+                 pages: SQLiteIterator,
+                 encoder: Encoder,
+                 client: AsyncQdrantClient,
+                 collection_name: str,
+                 model_name: str,
+                 cache_dir: str,
+                 chunk_size: int,
+                 overlap_percentage: int = 15,
+                 config: PipelineConfig | None = None,
+                 state: IndexState | None = None,
+                 sparse_settings: SparseSettings | None = None):
+        """
+        Конвейер загрузки страниц wiki в Qdrant.
+
+        Стадии работают одновременно и связаны ограниченными очередями:
+        основной процесс читает только page_id и revision_id и раздаёт воркерам диапазоны page_id,
+        пул процессов сам читает свои диапазоны, разбирает wikitext и режет тексты на чанки, энкодер кодирует
+        чанки многих страниц большими батчами, загрузчик параллельно выполняет upsert.
+
+        С состоянием индексации страницы с уже проиндексированной ревизией пропускаются,
+        после загрузки всех чанков страницы удаляются её чанки прежних ревизий,
+        а контрольная точка сдвигается на последний page_id, до которого обработаны все страницы.
+
+        Args:
+            pages (SQLiteIterator): страницы wiki_page для загрузки
+            encoder (Encoder): синхронная функция кодирования батча текстов
+            client (AsyncQdrantClient): асинхронный клиент Qdrant
+            collection_name (str): коллекция для загрузки
+            model_name (str): модель, чей токенизатор загружают воркеры
+            cache_dir (str): папка с моделями
+            chunk_size (int): максимальный размер чанка в токенах
+            overlap_percentage (int): процент пересечения чанков
+            config (PipelineConfig | None): параметры конвейера
+            state (IndexState | None): состояние индексации, None - загружать все страницы
+            sparse_settings (SparseSettings | None): настройки BM25, воркеры добавляют точкам разреженные векторы,
+                None - только плотные векторы
+        """
+        self.pages = pages
+        self.encoder = encoder
+        self.client = client
+        self.collection_name = collection_name
+        self.splitter_args = (model_name, cache_dir, chunk_size, overlap_percentage, sparse_settings)
+        self.sparse_vector_name = sparse_settings.VECTOR_NAME if sparse_settings is not None else None
+        self.config = config or PipelineConfig()
+        self.state = state
+        self.stats = PipelineStats()
+        # Страницы в порядке чтения, по ним сдвигается контрольная точка
+        self._pages: dict[int, PageProgress] = {}
+        self._order: deque[int] = deque()
+
+    async def run(self) -> PipelineStats:
+        self.stats = PipelineStats()
+        self._pages.clear()
+        self._order.clear()
+        fragments_queue: asyncio.Queue[list[Fragment] | None] = asyncio.Queue(maxsize=self.config.queue_size)
+        points_queue: asyncio.Queue[list[PointStruct] | None] = asyncio.Queue(maxsize=self.config.queue_size)
+
+        logger.info(f"Starting ETL pipeline: {self.config}")
+        pool = ProcessPoolExecutor(max_workers=self.config.workers,
+                                   mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_init_worker,
+                                   initargs=self.splitter_args)
+        reporter = asyncio.create_task(self._report(fragments_queue, points_queue))
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._split_stage(pool, fragments_queue))
+                tg.create_task(self._encode_stage(fragments_queue, points_queue))
+                tg.create_task(self._upload_stage(points_queue))
+        finally:
+            reporter.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        if self.state is not None:
+            self.state.clear_checkpoint()
+        logger.info(f"ETL pipeline finished: {self.stats}")
+        return self.stats
+
+    async def _split_stage(self, pool: ProcessPoolExecutor, out: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        # Задач в работе вдвое больше воркеров, чтобы процессы не простаивали между задачами
+        slots = asyncio.Semaphore(self.config.workers * 2)
+
+        async def split(task_pages: SQLiteIterator, page_ids: list[int]) -> None:
+            try:
+                fragments = await loop.run_in_executor(pool, split_range, task_pages, page_ids)
+            finally:
+                slots.release()
+            self.stats.pages += len(page_ids)
+            self.stats.chunks += len(fragments)
+            for _, payload, _ in fragments:
+                progress = self._pages[payload["page_id"]]
+                progress.chunks += 1
+                # Ревизия могла смениться между чтением ключей и чтением страницы воркером
+                progress.revision_id = payload["revision_id"]
+            for page_id in page_ids:
+                progress = self._pages[page_id]
+                progress.remaining = progress.chunks
+            # Страница без чанков или исчезнувшая до чтения воркером не получит ни одной точки
+            empty = [page_id for page_id in page_ids if self._pages[page_id].chunks == 0]
+            if empty:
+                await self._finish_pages(empty)
+            await out.put(fragments)
+
+        # Основной процесс читает только ключи, тексты страниц читают воркеры
+        keys_iterator = iter(self.pages.with_columns("page_id", "revision_id").iter_rows())
+        after_page_id = self.pages.after_page_id
+        async with asyncio.TaskGroup() as tg:
+            while True:
+                await slots.acquire()
+                keys = list(islice(keys_iterator, self.config.pages_per_task))
+                if not keys:
+                    slots.release()
+                    break
+
+                task_pages = self.pages.with_range(after_page_id, keys[-1][0])
+                after_page_id = keys[-1][0]
+                page_ids = self._register_pages(keys)
+                if not page_ids:
+                    slots.release()
+                    continue
+                tg.create_task(split(task_pages, page_ids))
+
+        await out.put(None)
+
+    def _register_pages(self, keys: list[tuple[int, int]]) -> list[int]:
+        """Запоминает порядок страниц и отбрасывает страницы, чья ревизия уже проиндексирована."""
+        indexed = self.state.get_revisions([page_id for page_id, _ in keys]) if self.state is not None else {}
+
+        changed = []
+        for page_id, revision_id in keys:
+            self._order.append(page_id)
+            if indexed.get(page_id) == revision_id:
+                self.stats.skipped += 1
+                continue
+            self._pages[page_id] = PageProgress(revision_id=revision_id)
+            changed.append(page_id)
+
+        if len(changed) < len(keys):
+            self._advance_checkpoint()
+        return changed
+
+    async def _encode_stage(self, inp: asyncio.Queue, out: asyncio.Queue) -> None:
+        buffer: list[Fragment] = []
+        while (fragments := await inp.get()) is not None:
+            buffer.extend(fragments)
+            while len(buffer) >= self.config.encode_batch_size:
+                batch, buffer = buffer[:self.config.encode_batch_size], buffer[self.config.encode_batch_size:]
+                await out.put(await self._encode(batch))
+
+        if buffer:
+            await out.put(await self._encode(buffer))
+        await out.put(None)
+
+    async def _encode(self, batch: list[Fragment]) -> list[PointStruct]:
+        vectors = await asyncio.to_thread(self.encoder, [text for text, _, _ in batch])
+        self.stats.encoded += len(batch)
+        return [PointStruct(id=fragment_point_id(payload["page_id"], payload["revision_id"], payload["chunk_index"]),
+                            # Плотный вектор остаётся безымянным, как в коллекциях без BM25
+                            vector=vector if sparse_vector is None else {"": vector,
+                                                                         self.sparse_vector_name: sparse_vector},
+                            payload=payload)
+                for (_, payload, sparse_vector), vector in zip(batch, vectors)]
+
+    async def _upload_stage(self, inp: asyncio.Queue) -> None:
+        slots = asyncio.Semaphore(self.config.upload_concurrency)
+
+        async def upsert(points: list[PointStruct]) -> None:
+            try:
+                await self.client.upsert(collection_name=self.collection_name, points=points)
+                await self._complete_pages(points)
+            finally:
+                slots.release()
+
+        buffer: list[PointStruct] = []
+        async with asyncio.TaskGroup() as tg:
+            while (points := await inp.get()) is not None:
+                buffer.extend(points)
+                while len(buffer) >= self.config.upsert_batch_size:
+                    await slots.acquire()
+                    batch, buffer = buffer[:self.config.upsert_batch_size], buffer[self.config.upsert_batch_size:]
+                    tg.create_task(upsert(batch))
+
+            if buffer:
+                await slots.acquire()
+                tg.create_task(upsert(buffer))
+
+    async def _complete_pages(self, points: list[PointStruct]) -> None:
+        """Учитывает загруженные чанки и завершает страницы, у которых загружены все чанки."""
+        self.stats.uploaded += len(points)
+
+        completed = []
+        for point in points:
+            page_id = point.payload["page_id"]
+            progress = self._pages[page_id]
+            progress.remaining -= 1
+            if progress.remaining == 0:
+                completed.append(page_id)
+
+        if completed:
+            await self._finish_pages(completed)
+
+    async def _finish_pages(self, completed: list[int]) -> None:
+        """Удаляет чанки прежних ревизий, отмечает страницы проиндексированными и сдвигает контрольную точку."""
+        await self._delete_stale_chunks(completed)
+        if self.state is not None:
+            self.state.mark_indexed(
+                (page_id, self._pages[page_id].revision_id, self._pages[page_id].chunks) for page_id in completed
+            )
+        for page_id in completed:
+            del self._pages[page_id]
+        self.stats.indexed += len(completed)
+        self._advance_checkpoint()
+
+    async def _delete_stale_chunks(self, page_ids: list[int]) -> None:
+        """Удаляет чанки прежних ревизий страниц, в том числе точки без revision_id."""
+        stale = models.Filter(should=[
+            models.Filter(
+                must=[models.FieldCondition(key="page_id", match=models.MatchValue(value=page_id))],
+                must_not=[models.FieldCondition(key="revision_id",
+                                                match=models.MatchValue(value=self._pages[page_id].revision_id))],
+            )
+            for page_id in page_ids
+        ])
+        await self.client.delete(collection_name=self.collection_name,
+                                 points_selector=models.FilterSelector(filter=stale))
+
+    def _advance_checkpoint(self) -> None:
+        last_page_id = None
+        while self._order and self._order[0] not in self._pages:
+            last_page_id = self._order.popleft()
+
+        if last_page_id is not None and self.state is not None:
+            self.state.save_checkpoint(last_page_id)
+
+    async def _report(self, fragments_queue: asyncio.Queue, points_queue: asyncio.Queue) -> None:
+        while True:
+            await asyncio.sleep(self.config.report_interval)
+            logger.info(f"ETL progress: {self.stats}; queues: split->encode {fragments_queue.qsize()}, "
+                        f"encode->upload {points_queue.qsize()}")
@@ -0,0 +1,120 @@
+import queue
+import sys
+import threading
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from itertools import count
+from pathlib import Path
+
+import grpc
+from core.logger import get_logger
+
+# ruff: noqa: E402
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve() / 'grpc_generated'))
+from grpc_generated import encoder_pb2, encoder_pb2_grpc
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PendingBatch:
+    vectors: list[list[float] | None]
+    remaining: int
+    future: Future = field(default_factory=Future)
+
+
+class RemoteEncoder:
+    def __init__(self, address: str):
+        """
+        Кодирование текстов через EncodeStream text_vector_service вместо локальной копии модели.
+
+        Все батчи запуска идут в один долгоживущий поток, он открывается при первом вызове encode
+        и закрывается в close. Ответы приходят в порядке запросов.
+
+        Args:
+            address (str): адрес сервиса, например "localhost:50052"
+        """
+        self.address = address
+        self._channel = grpc.insecure_channel(address)
+        self._stub = encoder_pb2_grpc.EncoderServiceStub(self._channel)
+        self._lock = threading.Lock()
+        self._ids = count()
+        # Запросы уходят в поток в том же порядке, в каком записаны в _pending
+        self._requests: queue.Queue[encoder_pb2.EncodeStreamRequest | None] | None = None
+        self._pending: deque[tuple[str, PendingBatch, int]] = deque()
+        self._reader: threading.Thread | None = None
+
+    def _open_stream(self) -> None:
+        requests: queue.Queue[encoder_pb2.EncodeStreamRequest | None] = queue.Queue()
+        responses = self._stub.EncodeStream(iter(requests.get, None))
+        self._requests = requests
+        self._reader = threading.Thread(target=self._read_responses, args=(responses,),
+                                        name="encode-stream", daemon=True)
+        self._reader.start()
+        logger.info(f"EncodeStream to {self.address} opened")
+
+    def _read_responses(self, responses: Iterator[encoder_pb2.EncodeStreamResponse]) -> None:
+        error: Exception | None = None
+        try:
+            for response in responses:
+                with self._lock:
+                    request_id, batch, index = self._pending.popleft()
+                if response.id != request_id:
+                    msg = f"EncodeStream returned id '{response.id}', expected '{request_id}'"
+                    raise RuntimeError(msg)
+
+                batch.vectors[index] = list(response.vector)
+                batch.remaining -= 1
+                if batch.remaining == 0:
+                    batch.future.set_result(batch.vectors)
+        except (grpc.RpcError, RuntimeError) as e:
+            error = e
+
+        with self._lock:
+            if error is None and self._pending:
+                error = RuntimeError("EncodeStream closed before all texts were encoded")
+            if error is not None:
+                logger.error(f"EncodeStream to {self.address} failed: {error}")
+                # Следующий вызов encode откроет новый поток
+                if self._requests is not None:
+                    self._requests.put(None)
+                self._requests = None
+                while self._pending:
+                    _, batch, _ = self._pending.popleft()
+                    if not batch.future.done():
+                        batch.future.set_exception(error)
+
+    def encode(self, texts: list[str]) -> list[list[float]]:
+        """
+        Кодирует батч текстов в общем потоке EncodeStream.
+
+        Args:
+            texts (list[str]): тексты
+
+        Returns:
+            list[list[float]]: векторы в порядке текстов
+        """
+        if not texts:
+            return []
+
+        batch = PendingBatch(vectors=[None] * len(texts), remaining=len(texts))
+        with self._lock:
+            if self._requests is None:
+                self._open_stream()
+            for index, text in enumerate(texts):
+                request_id = str(next(self._ids))
+                self._pending.append((request_id, batch, index))
+                self._requests.put(encoder_pb2.EncodeStreamRequest(id=request_id, text=text))
+        return batch.future.result()
+
+    def close(self) -> None:
+        with self._lock:
+            requests, self._requests = self._requests, None
+        if requests is not None:
+            requests.put(None)
+        if self._reader is not None:
+            self._reader.join()
+            self._reader = None
+        self._channel.close()
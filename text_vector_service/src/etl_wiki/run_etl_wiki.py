@@ -1,24 +1,71 @@
+import asyncio
 import time
-
-from core.config import encoder_settings, vector_db_settings
+from functools import partial
+
+from bm25 import BM25Encoder
+from core.config import (
+    SparseSettings,
+    encoder_settings,
+    sparse_settings,
+    vector_db_settings,
+)
 from core.logger import get_logger
+from database.versions import bump_collection_version
 from model_manager import ModelManager
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, PointStruct, VectorParams
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.http.models import Distance, PayloadSchemaType, VectorParams
 from sentence_transformers import SentenceTransformer
-from text_splitter import TextSplitter
 
 from etl_wiki.db_iterator import SQLiteIterator
+from etl_wiki.index_state import IndexState
+from etl_wiki.pipeline import Encoder, PipelineConfig, WikiETLPipeline
+from etl_wiki.remote_encoder import RemoteEncoder
 
 logger = get_logger(__name__)
 
 BATCH_SIZE = 1000
 
 SQLITE_PATH = 'E:\\temp\\wiki\\wiki_pages.sqlite'
+# Проиндексированные ревизии страниц и контрольная точка незавершённого запуска
+STATE_PATH = 'E:\\temp\\wiki\\etl_state.sqlite'
+
+PAYLOAD_INDEXES = {
+    "page_id": PayloadSchemaType.INTEGER,
+    "revision_id": PayloadSchemaType.INTEGER,
+    "lang": PayloadSchemaType.KEYWORD,
+    "time_request": PayloadSchemaType.DATETIME,
+}
+
+# Адрес text_vector_service: ETL кодирует через EncodeStream и делит пул инференса с сервисом.
+# None - загрузить собственную копию модели
+ENCODER_ADDRESS = None
+# ENCODER_ADDRESS = 'localhost:50052'
 
 
 def get_vector_from_texts(model: SentenceTransformer, texts: list[str]) -> list[list[float]]:
-    return model.encode(texts, show_progress_bar=True, convert_to_numpy=True).tolist()
+    return model.encode(texts, show_progress_bar=False, convert_to_numpy=True).tolist()
+
+
+async def load_pages(wiki_pages: SQLiteIterator, encoder: Encoder, state: IndexState,
+                     sparse: SparseSettings | None) -> None:
+    client = AsyncQdrantClient(host=vector_db_settings.HOST, port=vector_db_settings.PORT)
+    pipeline = WikiETLPipeline(
+        pages=wiki_pages,
+        encoder=encoder,
+        client=client,
+        collection_name=vector_db_settings.COLLECTION_NAME,
+        model_name=encoder_settings.MODEL_NAME,
+        cache_dir=encoder_settings.LOCAL_MODEL_PATH,
+        chunk_size=encoder_settings.MAX_LENGTH,
+        overlap_percentage=15,
+        config=PipelineConfig(upsert_batch_size=BATCH_SIZE),
+        state=state,
+        sparse_settings=sparse,
+    )
+    try:
+        await pipeline.run()
+    finally:
+        await client.close()
 
 
 def main():
@@ -30,73 +77,64 @@ def main():
     # max_docs = 120
     max_docs = None
 
-    logger.info("Setting up model manager and loading model.")
-    model_manager = ModelManager(settings=encoder_settings)
-    model = model_manager.get_model()
+    remote_encoder = None
+    if ENCODER_ADDRESS:
+        logger.info(f"Encoding through text_vector_service at {ENCODER_ADDRESS}.")
+        remote_encoder = RemoteEncoder(ENCODER_ADDRESS)
+        encoder = remote_encoder.encode
+        vector_size = vector_db_settings.VECTOR_SIZE
+    else:
+        logger.info("Setting up model manager and loading model.")
+        model_manager = ModelManager(settings=encoder_settings)
+        model = model_manager.get_model()
+        encoder = partial(get_vector_from_texts, model)
+        vector_size = model.get_sentence_embedding_dimension()
 
-    logger.info("Configuring text splitter.")
-    text_splitter = TextSplitter(
-        model=model,
-        chunk_size=encoder_settings.MAX_LENGTH,
-        overlap_percentage=15
-    )
+    state = IndexState(STATE_PATH, collection_name=vector_db_settings.COLLECTION_NAME)
+    checkpoint = state.get_checkpoint()
+    if checkpoint is not None:
+        logger.info(f"Resuming the interrupted run after page_id {checkpoint}.")
 
     logger.info("Initializing SQLite iterator for wiki pages.")
-    wiki_pages = SQLiteIterator(db_path, max_documents=max_docs)
+    wiki_pages = SQLiteIterator(db_path, max_documents=max_docs, after_page_id=checkpoint)
 
     if not client.collection_exists(collection_name=vector_db_settings.COLLECTION_NAME):
         logger.info("Collection does not exist in Qdrant, creating new collection.")
-        vector_size = model.get_sentence_embedding_dimension()
+        sparse_vectors_config = None
+        if sparse_settings.ENABLED:
+            sparse_vectors_config = {sparse_settings.VECTOR_NAME: BM25Encoder.get_vector_params()}
         client.create_collection(
             collection_name=vector_db_settings.COLLECTION_NAME,
             vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+            sparse_vectors_config=sparse_vectors_config,
         )
     else:
         logger.info("Collection already exists in Qdrant.")
 
-    points_buffer = []
-    point_id = 0
-
-    for i, doc in enumerate(wiki_pages):
-        logger.info(f"Processing wiki page {i}: ID {doc.page_id}, Title '{doc.title}'")
-
-        title = f"Заголовок страницы: {doc.title}. Начало фрагмента:"
-        chunks = text_splitter.split_text(title=title, text=doc.text)
-        # logger.info(f"Text split into {len(chunks)} chunks.")
-
-        vectors = get_vector_from_texts(model=model, texts=chunks)
-        for chunk, vector in zip(chunks, vectors):
-            payload = {
-                "text": chunk,
-                "page_id": doc.page_id,
-                "title": doc.title,
-                "time_request": doc.time_request.isoformat() if doc.time_request else None
-            }
-
-            point = PointStruct(
-                id=point_id,
-                vector=vector,
-                payload=payload
-            )
-            points_buffer.append(point)
-            point_id += 1
-
-            if len(points_buffer) >= BATCH_SIZE:
-                # logger.info(f"Upserting {len(points_buffer)} points to Qdrant.")
-                client.upsert(
-                    collection_name=vector_db_settings.COLLECTION_NAME,
-                    points=points_buffer
-                )
-                # logger.info(f"Inserted {len(points_buffer)} points into Qdrant.")
-                points_buffer = []
-
-    if points_buffer:
-        logger.info(f"Final upsert of remaining {len(points_buffer)} points to Qdrant.")
-        client.upsert(
-            collection_name=vector_db_settings.COLLECTION_NAME,
-            points=points_buffer
-        )
-        logger.info(f"Inserted remaining {len(points_buffer)} points into Qdrant.")
+    # page_id и revision_id - для удаления чанков прежних ревизий страницы, остальные - для фильтров поиска.
+    # Повторное создание существующего индекса ничего не меняет
+    for field_name, field_schema in PAYLOAD_INDEXES.items():
+        client.create_payload_index(collection_name=vector_db_settings.COLLECTION_NAME,
+                                    field_name=field_name,
+                                    field_schema=field_schema)
+
+    sparse = sparse_settings if sparse_settings.ENABLED else None
+    sparse_vectors = client.get_collection(vector_db_settings.COLLECTION_NAME).config.params.sparse_vectors or {}
+    if sparse is not None and sparse.VECTOR_NAME not in sparse_vectors:
+        logger.warning(f"Collection has no sparse vector '{sparse.VECTOR_NAME}', BM25 vectors are not loaded. "
+                       f"Recreate the collection and the ETL state to enable hybrid search.")
+        sparse = None
+
+    try:
+        asyncio.run(load_pages(wiki_pages, encoder, state, sparse))
+    finally:
+        state.close()
+
+    # Сервис сбрасывает кэш результатов поиска при смене версии коллекции
+    bump_collection_version(client, vector_db_settings.COLLECTION_NAME)
+
+    if remote_encoder is not None:
+        remote_encoder.close()
 
 
 if __name__ == '__main__':
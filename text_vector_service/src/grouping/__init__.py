@@ -0,0 +1,176 @@
+from dataclasses import dataclass, field
+from functools import cached_property
+
+# Чанк в ETL - заголовок, пустая строка и срез текста страницы
+TITLE_SEPARATOR = "\n\n"
+# Длина начала следующего чанка, по которой ищется перекрытие с предыдущим
+OVERLAP_PROBE_LENGTH = 32
+
+
+@dataclass
+class ChunkHit:
+    score: float
+    payload: dict
+
+    @property
+    def page_id(self) -> int | None:
+        return self.payload.get("page_id")
+
+    @property
+    def chunk_index(self) -> int | None:
+        return self.payload.get("chunk_index")
+
+    @property
+    def text(self) -> str:
+        return self.payload.get("text") or ""
+
+
+@dataclass
+class PageFragment:
+    score: float
+    payload: dict
+    chunk_index: int | None
+    chunk_count: int = 1
+    chunks: list[str] = field(default_factory=list, repr=False)
+
+    @cached_property
+    def text(self) -> str:
+        return merge_chunks(self.chunks)
+
+
+def split_title(text: str) -> tuple[str, str]:
+    """
+    Отделяет заголовок, который ETL добавляет в начало каждого чанка.
+
+    Args:
+        text (str): текст чанка
+
+    Returns:
+        tuple[str, str]: заголовок вместе с разделителем и текст фрагмента
+    """
+    position = text.find(TITLE_SEPARATOR)
+    if position == -1:
+        return "", text
+    position += len(TITLE_SEPARATOR)
+    return text[:position], text[position:]
+
+
+def merge_overlap(left: str, right: str) -> str:
+    """
+    Склеивает соседние срезы текста, убирая общий хвост левого и начало правого.
+
+    Перекрытие - самый длинный суффикс left, совпадающий с началом right.
+    Если перекрытия нет, срезы соединяются пробелом.
+
+    Args:
+        left (str): предыдущий срез
+        right (str): следующий срез
+
+    Returns:
+        str: склеенный текст
+    """
+    probe = right[:OVERLAP_PROBE_LENGTH]
+    if not probe:
+        return left
+
+    # Первое вхождение начала right даёт самое длинное перекрытие
+    start = left.find(probe)
+    while start != -1:
+        if right.startswith(left[start:]):
+            return left + right[len(left) - start:]
+        start = left.find(probe, start + 1)
+    return f"{left} {right}"
+
+
+def merge_chunks(chunks: list[str]) -> str:
+    """
+    Args:
+        chunks (list[str]): тексты соседних чанков одной страницы по порядку
+
+    Returns:
+        str: один фрагмент с заголовком первого чанка и без повторов перекрытий
+    """
+    if not chunks:
+        return ""
+
+    title, merged = split_title(chunks[0])
+    for chunk in chunks[1:]:
+        merged = merge_overlap(merged, chunk[len(title):] if title and chunk.startswith(title) else chunk)
+    return title + merged
+
+
+def group_hits(hits: list[ChunkHit], max_pages: int, max_chunks_per_page: int) -> list[PageFragment]:
+    """
+    Группирует найденные чанки по страницам.
+
+    Берутся max_pages страниц с лучшими чанками, с каждой - не больше max_chunks_per_page
+    лучших чанков, идущие подряд чанки склеиваются в один фрагмент.
+    Страницы упорядочены по лучшему чанку, фрагменты страницы - по порядку в тексте.
+
+    Args:
+        hits (list[ChunkHit]): чанки в порядке убывания релевантности
+        max_pages (int): максимум страниц
+        max_chunks_per_page (int): максимум чанков с одной страницы
+
+    Returns:
+        list[PageFragment]: фрагменты страниц
+    """
+    pages: dict[object, list[ChunkHit]] = {}
+    for hit in hits:
+        # Чанки без page_id не группируются
+        key = hit.page_id if hit.page_id is not None else object()
+        if key not in pages and len(pages) >= max_pages:
+            continue
+        page_hits = pages.setdefault(key, [])
+        if len(page_hits) < max_chunks_per_page:
+            page_hits.append(hit)
+
+    fragments = []
+    for page_hits in pages.values():
+        page_hits.sort(key=lambda hit: hit.chunk_index if hit.chunk_index is not None else 0)
+        fragment = None
+        for hit in page_hits:
+            if (fragment is not None and hit.chunk_index is not None and fragment.chunk_index is not None
+                    and hit.chunk_index == fragment.chunk_index + fragment.chunk_count):
+                fragment.score = max(fragment.score, hit.score)
+                fragment.chunk_count += 1
+                fragment.chunks.append(hit.text)
+                continue
+
+            fragment = PageFragment(score=hit.score, payload=hit.payload, chunk_index=hit.chunk_index,
+                                    chunks=[hit.text])
+            fragments.append(fragment)
+    return fragments
+
+
+def count_tokens(tokenizer, texts: list[str]) -> list[int]:
+    """Токены каждого текста без специальных, одним вызовом токенизатора."""
+    if not texts:
+        return []
+    return [len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]]
+
+
+def fit_token_budget(fragments: list[PageFragment], token_counts: list[int], max_tokens: int) -> list[PageFragment]:
+    """
+    Жадно набирает фрагменты в порядке списка, пока хватает бюджета токенов.
+
+    Фрагмент, который не помещается, пропускается, следующие более короткие ещё могут войти.
+
+    Args:
+        fragments (list[PageFragment]): фрагменты по убыванию приоритета
+        token_counts (list[int]): токены каждого фрагмента
+        max_tokens (int): бюджет токенов, 0 - без ограничения
+
+    Returns:
+        list[PageFragment]: вошедшие фрагменты
+    """
+    if max_tokens <= 0:
+        return fragments
+
+    result = []
+    remaining = max_tokens
+    for fragment, tokens in zip(fragments, token_counts):
+        if tokens <= remaining:
+            result.append(fragment)
+            remaining -= tokens
+    return result
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rencoder.proto\x12\x0e\x65ncoderservice\"\x1d\n\rEncodeRequest\x12\x0c\n\x04text\x18\x01 \x01(\t\" \n\x0e\x45ncodeResponse\x12\x0e\n\x06vector\x18\x01 \x03(\x02\"\"\n\x12\x43ountTokensRequest\x12\x0c\n\x04text\x18\x01 \x01(\t\"*\n\x13\x43ountTokensResponse\x12\x13\n\x0btoken_count\x18\x01 \x01(\x05\"E\n\x10SplitTextRequest\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x12\n\nchunk_size\x18\x02 \x01(\x05\x12\x0f\n\x07overlap\x18\x03 \x01(\x05\"&\n\x11SplitTextResponse\x12\x11\n\tfragments\x18\x01 \x03(\t2\x83\x02\n\x0e\x45ncoderService\x12G\n\x06\x45ncode\x12\x1d.encoderservice.EncodeRequest\x1a\x1e.encoderservice.EncodeResponse\x12V\n\x0b\x43ountTokens\x12\".encoderservice.CountTokensRequest\x1a#.encoderservice.CountTokensResponse\x12P\n\tSplitText\x12 .encoderservice.SplitTextRequest\x1a!.encoderservice.SplitTextResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rencoder.proto\x12\x0e\x65ncoderservice\"\x1d\n\rEncodeRequest\x12\x0c\n\x04text\x18\x01 \x01(\t\" \n\x0e\x45ncodeResponse\x12\x0e\n\x06vector\x18\x01 \x03(\x02\"#\n\x12\x45ncodeBatchRequest\x12\r\n\x05texts\x18\x01 \x03(\t\"F\n\x13\x45ncodeBatchResponse\x12/\n\x07vectors\x18\x01 \x03(\x0b\x32\x1e.encoderservice.EncodeResponse\"/\n\x13\x45ncodeStreamRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04text\x18\x02 \x01(\t\"2\n\x14\x45ncodeStreamResponse\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0e\n\x06vector\x18\x02 \x03(\x02\"\"\n\x12\x43ountTokensRequest\x12\x0c\n\x04text\x18\x01 \x01(\t\"*\n\x13\x43ountTokensResponse\x12\x13\n\x0btoken_count\x18\x01 \x01(\x05\"(\n\x17\x43ountTokensBatchRequest\x12\r\n\x05texts\x18\x01 \x03(\t\"0\n\x18\x43ountTokensBatchResponse\x12\x14\n\x0ctoken_counts\x18\x01 \x03(\x05\"E\n\x10SplitTextRequest\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x12\n\nchunk_size\x18\x02 \x01(\x05\x12\x0f\n\x07overlap\x18\x03 \x01(\x05\"&\n\x11SplitTextResponse\x12\x11\n\tfragments\x18\x01 \x03(\t2\xa1\x04\n\x0e\x45ncoderService\x12G\n\x06\x45ncode\x12\x1d.encoderservice.EncodeRequest\x1a\x1e.encoderservice.EncodeResponse\x12V\n\x0b\x45ncodeBatch\x12\".encoderservice.EncodeBatchRequest\x1a#.encoderservice.EncodeBatchResponse\x12]\n\x0c\x45ncodeStream\x12#.encoderservice.EncodeStreamRequest\x1a$.encoderservice.EncodeStreamResponse(\x01\x30\x01\x12V\n\x0b\x43ountTokens\x12\".encoderservice.CountTokensRequest\x1a#.encoderservice.CountTokensResponse\x12\x65\n\x10\x43ountTokensBatch\x12\'.encoderservice.CountTokensBatchRequest\x1a(.encoderservice.CountTokensBatchResponse\x12P\n\tSplitText\x12 .encoderservice.SplitTextRequest\x1a!.encoderservice.SplitTextResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -35,14 +35,26 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_ENCODEREQUEST']._serialized_end=62
   _globals['_ENCODERESPONSE']._serialized_start=64
   _globals['_ENCODERESPONSE']._serialized_end=96
-  _globals['_COUNTTOKENSREQUEST']._serialized_start=98
-  _globals['_COUNTTOKENSREQUEST']._serialized_end=132
-  _globals['_COUNTTOKENSRESPONSE']._serialized_start=134
-  _globals['_COUNTTOKENSRESPONSE']._serialized_end=176
-  _globals['_SPLITTEXTREQUEST']._serialized_start=178
-  _globals['_SPLITTEXTREQUEST']._serialized_end=247
-  _globals['_SPLITTEXTRESPONSE']._serialized_start=249
-  _globals['_SPLITTEXTRESPONSE']._serialized_end=287
-  _globals['_ENCODERSERVICE']._serialized_start=290
-  _globals['_ENCODERSERVICE']._serialized_end=549
+  _globals['_ENCODEBATCHREQUEST']._serialized_start=98
+  _globals['_ENCODEBATCHREQUEST']._serialized_end=133
+  _globals['_ENCODEBATCHRESPONSE']._serialized_start=135
+  _globals['_ENCODEBATCHRESPONSE']._serialized_end=205
+  _globals['_ENCODESTREAMREQUEST']._serialized_start=207
+  _globals['_ENCODESTREAMREQUEST']._serialized_end=254
+  _globals['_ENCODESTREAMRESPONSE']._serialized_start=256
+  _globals['_ENCODESTREAMRESPONSE']._serialized_end=306
+  _globals['_COUNTTOKENSREQUEST']._serialized_start=308
+  _globals['_COUNTTOKENSREQUEST']._serialized_end=342
+  _globals['_COUNTTOKENSRESPONSE']._serialized_start=344
+  _globals['_COUNTTOKENSRESPONSE']._serialized_end=386
+  _globals['_COUNTTOKENSBATCHREQUEST']._serialized_start=388
+  _globals['_COUNTTOKENSBATCHREQUEST']._serialized_end=428
+  _globals['_COUNTTOKENSBATCHRESPONSE']._serialized_start=430
+  _globals['_COUNTTOKENSBATCHRESPONSE']._serialized_end=478
+  _globals['_SPLITTEXTREQUEST']._serialized_start=480
+  _globals['_SPLITTEXTREQUEST']._serialized_end=549
+  _globals['_SPLITTEXTRESPONSE']._serialized_start=551
+  _globals['_SPLITTEXTRESPONSE']._serialized_end=589
+  _globals['_ENCODERSERVICE']._serialized_start=592
+  _globals['_ENCODERSERVICE']._serialized_end=1137
 # @@protoc_insertion_point(module_scope)
@@ -39,11 +39,26 @@ class EncoderServiceStub(object):
                 request_serializer=encoder__pb2.EncodeRequest.SerializeToString,
                 response_deserializer=encoder__pb2.EncodeResponse.FromString,
                 _registered_method=True)
+        self.EncodeBatch = channel.unary_unary(
+                '/encoderservice.EncoderService/EncodeBatch',
+                request_serializer=encoder__pb2.EncodeBatchRequest.SerializeToString,
+                response_deserializer=encoder__pb2.EncodeBatchResponse.FromString,
+                _registered_method=True)
+        self.EncodeStream = channel.stream_stream(
+                '/encoderservice.EncoderService/EncodeStream',
+                request_serializer=encoder__pb2.EncodeStreamRequest.SerializeToString,
+                response_deserializer=encoder__pb2.EncodeStreamResponse.FromString,
+                _registered_method=True)
         self.CountTokens = channel.unary_unary(
                 '/encoderservice.EncoderService/CountTokens',
                 request_serializer=encoder__pb2.CountTokensRequest.SerializeToString,
                 response_deserializer=encoder__pb2.CountTokensResponse.FromString,
                 _registered_method=True)
+        self.CountTokensBatch = channel.unary_unary(
+                '/encoderservice.EncoderService/CountTokensBatch',
+                request_serializer=encoder__pb2.CountTokensBatchRequest.SerializeToString,
+                response_deserializer=encoder__pb2.CountTokensBatchResponse.FromString,
+                _registered_method=True)
         self.SplitText = channel.unary_unary(
                 '/encoderservice.EncoderService/SplitText',
                 request_serializer=encoder__pb2.SplitTextRequest.SerializeToString,
@@ -60,12 +75,30 @@ class EncoderServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def EncodeBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def EncodeStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def CountTokens(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def CountTokensBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def SplitText(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -80,11 +113,26 @@ def add_EncoderServiceServicer_to_server(servicer, server):
                     request_deserializer=encoder__pb2.EncodeRequest.FromString,
                     response_serializer=encoder__pb2.EncodeResponse.SerializeToString,
             ),
+            'EncodeBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.EncodeBatch,
+                    request_deserializer=encoder__pb2.EncodeBatchRequest.FromString,
+                    response_serializer=encoder__pb2.EncodeBatchResponse.SerializeToString,
+            ),
+            'EncodeStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.EncodeStream,
+                    request_deserializer=encoder__pb2.EncodeStreamRequest.FromString,
+                    response_serializer=encoder__pb2.EncodeStreamResponse.SerializeToString,
+            ),
             'CountTokens': grpc.unary_unary_rpc_method_handler(
                     servicer.CountTokens,
                     request_deserializer=encoder__pb2.CountTokensRequest.FromString,
                     response_serializer=encoder__pb2.CountTokensResponse.SerializeToString,
             ),
+            'CountTokensBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.CountTokensBatch,
+                    request_deserializer=encoder__pb2.CountTokensBatchRequest.FromString,
+                    response_serializer=encoder__pb2.CountTokensBatchResponse.SerializeToString,
+            ),
             'SplitText': grpc.unary_unary_rpc_method_handler(
                     servicer.SplitText,
                     request_deserializer=encoder__pb2.SplitTextRequest.FromString,
@@ -128,6 +176,60 @@ class EncoderService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def EncodeBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/encoderservice.EncoderService/EncodeBatch',
+            encoder__pb2.EncodeBatchRequest.SerializeToString,
+            encoder__pb2.EncodeBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def EncodeStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/encoderservice.EncoderService/EncodeStream',
+            encoder__pb2.EncodeStreamRequest.SerializeToString,
+            encoder__pb2.EncodeStreamResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def CountTokens(request,
             target,
@@ -155,6 +257,33 @@ class EncoderService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def CountTokensBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/encoderservice.EncoderService/CountTokensBatch',
+            encoder__pb2.CountTokensBatchRequest.SerializeToString,
+            encoder__pb2.CountTokensBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def SplitText(request,
             target,
@@ -1,4 +1,7 @@
+import asyncio
+
 from core.logger import get_logger
+from grouping import count_tokens
 from grpc_generated import encoder_pb2, encoder_pb2_grpc
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
@@ -6,22 +9,75 @@ logger = get_logger(__name__)
 
 
 class EncoderServicer(encoder_pb2_grpc.EncoderServiceServicer):
-    def __init__(self, manager_model):
+    def __init__(self, manager_model, batcher, stream_max_in_flight=256):
         self.manager_model = manager_model
+        self.batcher = batcher
+        self.stream_max_in_flight = stream_max_in_flight
         self.text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
 
-    def Encode(self, request, context):
-        model = self.manager_model.get_model("intfloat/multilingual-e5-small")
-        vector = model.encode(request.text).tolist()
-        return encoder_pb2.EncodeResponse(vector=vector)
+    async def Encode(self, request, context):
+        vectors = await self.batcher.encode([request.text], model_name="intfloat/multilingual-e5-small")
+        return encoder_pb2.EncodeResponse(vector=vectors[0])
+
+    async def EncodeBatch(self, request, context):
+        vectors = await self.batcher.encode(list(request.texts), model_name="intfloat/multilingual-e5-small")
+        return encoder_pb2.EncodeBatchResponse(
+            vectors=[encoder_pb2.EncodeResponse(vector=vector) for vector in vectors]
+        )
+
+    async def EncodeStream(self, request_iterator, context):
+        """
+        Потоковое кодирование: ответы идут в порядке запросов.
+
+        Одновременно кодируется не больше stream_max_in_flight текстов, после этого чтение
+        запросов приостанавливается и клиента сдерживает flow control HTTP/2.
+        """
+        in_flight: asyncio.Queue = asyncio.Queue(maxsize=self.stream_max_in_flight)
 
-    def CountTokens(self, request, context):
-        model = self.manager_model.get_model("intfloat/multilingual-e5-small")
-        token_count = len(model.tokenizer.encode(request.text, add_special_tokens=False))
+        async def read_requests():
+            try:
+                async for request in request_iterator:
+                    # Массовая индексация не вытесняет из кэша векторы пользовательских запросов
+                    task = asyncio.ensure_future(
+                        self.batcher.encode([request.text],
+                                            model_name="intfloat/multilingual-e5-small",
+                                            use_cache=False)
+                    )
+                    await in_flight.put((request.id, task))
+            finally:
+                await in_flight.put(None)
 
+        reader = asyncio.create_task(read_requests())
+        try:
+            while (item := await in_flight.get()) is not None:
+                request_id, task = item
+                vectors = await task
+                yield encoder_pb2.EncodeStreamResponse(id=request_id, vector=vectors[0])
+            await reader
+        finally:
+            reader.cancel()
+            while not in_flight.empty():
+                item = in_flight.get_nowait()
+                if item is not None:
+                    item[1].cancel()
+
+    async def _get_tokenizer(self):
+        # Токенизатор загружается вне цикла событий и без весов модели
+        return await asyncio.to_thread(self.manager_model.get_tokenizer, "intfloat/multilingual-e5-small")
+
+    async def CountTokens(self, request, context):
+        tokenizer = await self._get_tokenizer()
+        token_count = (await asyncio.to_thread(count_tokens, tokenizer, [request.text]))[0]
 
         return encoder_pb2.CountTokensResponse(token_count=token_count)
 
+    async def CountTokensBatch(self, request, context):
+        tokenizer = await self._get_tokenizer()
+        # Все тексты токенизируются одним вызовом быстрого токенизатора вне цикла событий
+        token_counts = await asyncio.to_thread(count_tokens, tokenizer, list(request.texts))
+
+        return encoder_pb2.CountTokensBatchResponse(token_counts=token_counts)
+
     def SplitText(self, request, context):
         self.text_splitter.chunk_size = request.chunk_size
         self.text_splitter.chunk_overlap = request.overlap
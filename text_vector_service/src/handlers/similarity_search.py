@@ -1,64 +1,237 @@
-import json
+import asyncio
 
 import grpc
+from bm25 import BM25Encoder
+from cache import SearchResultCache
+from core.config import GroupingSettings
 from core.logger import get_logger
+from database.exception import VectorDBException
+from database.fragments import FragmentsDB
+from grouping import ChunkHit, count_tokens, fit_token_budget, group_hits
 from grpc_generated import similarity_search_pb2, similarity_search_pb2_grpc
-from qdrant_client import QdrantClient
+from reranker import Reranker
 
 logger = get_logger(__name__)
 
+# Поля payload, которые можно запросить в with_payload, совпадают с полями FragmentResult
+PAYLOAD_FIELDS = ("text", "page_id", "title", "time_request", "revision_id", "chunk_index", "lang")
+DEFAULT_PAYLOAD_FIELDS = ("text", "page_id", "title", "time_request")
+# Поля, без которых нельзя склеить чанки страницы
+GROUPING_FIELDS = ("text", "page_id", "chunk_index")
+
 
 class SimilaritySearchServicer(similarity_search_pb2_grpc.SimilaritySearchServiceServicer):
-    def __init__(self, settings, manager_model):
+    def __init__(self, settings, manager_model, batcher, fragments_db: FragmentsDB,
+                 result_cache: SearchResultCache | None = None, sparse_encoder: BM25Encoder | None = None,
+                 reranker: Reranker | None = None, grouping_settings: GroupingSettings | None = None):
         self.settings = settings
         self.manager_model = manager_model
-        self.qdrant_client = QdrantClient(host=settings.HOST, port=settings.PORT)
+        self.batcher = batcher
+        self.fragments_db = fragments_db
+        self.result_cache = result_cache
+        self.sparse_encoder = sparse_encoder
+        self.reranker = reranker
+        self.grouping_settings = grouping_settings or GroupingSettings()
+
+    async def _get_cache_key(self, request, limit: int, fields: tuple[str, ...], exact: bool | None) -> tuple | None:
+        if self.result_cache is None:
+            return None
+
+        try:
+            version = await self.fragments_db.get_collection_version(request.collection)
+        except VectorDBException as e:
+            logger.warning(f"Search result cache is skipped: {e}")
+            return None
+
+        return SearchResultCache.make_key(request.collection, version, limit, request.text,
+                                          hnsw_ef=request.hnsw_ef, exact=exact, mode=request.mode,
+                                          rerank=request.rerank, candidates=request.candidates,
+                                          filter=request.filter.SerializeToString(deterministic=True),
+                                          with_payload=fields, score_threshold=request.score_threshold,
+                                          group_pages=request.group_pages,
+                                          max_chunks_per_page=request.max_chunks_per_page,
+                                          max_tokens=request.max_tokens)
+
+    @staticmethod
+    def _make_result(score: float, payload: dict, fields: tuple[str, ...], **values):
+        return similarity_search_pb2.FragmentResult(
+            score=score,
+            **{field: payload[field] for field in fields if payload.get(field) is not None},
+            **values
+        )
+
+    async def _group_fragments(self, request, hits: list[ChunkHit], limit: int, fields: tuple[str, ...],
+                               tokenizer) -> list:
+        max_chunks_per_page = request.max_chunks_per_page or self.grouping_settings.MAX_CHUNKS_PER_PAGE
+        max_tokens = request.max_tokens or self.grouping_settings.MAX_TOKENS
+
+        fragments = group_hits(hits, max_pages=limit, max_chunks_per_page=max_chunks_per_page)
+        if max_tokens:
+            token_counts = await asyncio.to_thread(count_tokens, tokenizer, [fragment.text for fragment in fragments])
+            selected = fit_token_budget(fragments, token_counts, max_tokens)
+            logger.info(f"Token budget {max_tokens}: {len(selected)} of {len(fragments)} grouped fragments fit")
+            fragments = selected
+
+        return [
+            self._make_result(fragment.score,
+                              {**fragment.payload, "text": fragment.text},
+                              fields,
+                              chunk_count=fragment.chunk_count)
+            for fragment in fragments
+        ]
+
+    async def GetCollectionVersion(self, request, context):
+        try:
+            version = await self.fragments_db.get_collection_version(request.collection)
+        except VectorDBException as e:
+            logger.error(f"Error reading collection version: {e}")
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            context.set_details("Collection version is not available.")
+            return similarity_search_pb2.CollectionVersionResponse()
+
+        return similarity_search_pb2.CollectionVersionResponse(version=version)
 
     async def SearchSimilarFragments(self, request, context):
-        logger.info(f"Received search request: text='{request.text}', collection='{request.collection}', limit={request.limit}")
+        logger.info(f"Received search request: text='{request.text}', collection='{request.collection}', "
+                    f"limit={request.limit}, mode={request.mode}, rerank={request.rerank}, "
+                    f"group_pages={request.group_pages}")
+
+        limit = min(request.limit, 10)
+        fields = tuple(request.with_payload) or DEFAULT_PAYLOAD_FIELDS
+        unknown_fields = set(fields) - set(PAYLOAD_FIELDS)
+        if unknown_fields:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Unknown payload fields: {', '.join(sorted(unknown_fields))}.")
+            return similarity_search_pb2.SearchResponse()
 
         try:
-            model = self.manager_model.get_model("intfloat/multilingual-e5-small")
-            if model is None:
-                logger.warning("Model intfloat/multilingual-e5-small not found")
-                context.set_code(grpc.StatusCode.NOT_FOUND)
-                context.set_details("Model intfloat/multilingual-e5-small not found.")
+            query_filter = self.fragments_db.make_filter(lang=request.filter.lang,
+                                                         page_ids=list(request.filter.page_ids),
+                                                         time_request_from=request.filter.time_request_from,
+                                                         time_request_to=request.filter.time_request_to)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Invalid search filter: {e}")
+            return similarity_search_pb2.SearchResponse()
+
+        # Кросс-энкодеру нужен текст фрагмента, склейке - ещё и положение чанка, даже если клиент их не запросил
+        required_fields = GROUPING_FIELDS if request.group_pages else ("text",) if request.rerank else ()
+        fetch_fields = list(dict.fromkeys([*fields, *required_fields]))
+        score_threshold = request.score_threshold or None
+        # Не заданный в запросе exact берётся из настроек, заданный false выключает точный поиск
+        exact = request.exact if request.HasField("exact") else None
+
+        cache_key = await self._get_cache_key(request, limit, fields, exact)
+        if cache_key is not None:
+            cached_response = self.result_cache.get(cache_key)
+            if cached_response is not None:
+                logger.info("Returning cached search response")
+                return similarity_search_pb2.SearchResponse.FromString(cached_response)
+
+        dense = request.mode != similarity_search_pb2.SEARCH_MODE_SPARSE
+        sparse = request.mode != similarity_search_pb2.SEARCH_MODE_DENSE
+        if sparse and self.sparse_encoder is None:
+            logger.warning("Sparse search requested, but it is disabled")
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            context.set_details("Sparse and hybrid search are disabled.")
+            return similarity_search_pb2.SearchResponse()
+
+        fetch_limit = limit
+        if request.group_pages:
+            # Несколько чанков одной страницы занимают одно место в выдаче
+            candidates = request.candidates or self.grouping_settings.CANDIDATES
+            fetch_limit = max(limit, min(candidates, self.grouping_settings.MAX_CANDIDATES))
+        if request.rerank:
+            if self.reranker is None or not self.reranker.is_loaded:
+                logger.warning("Re-ranking requested, but the cross-encoder is disabled or not loaded yet")
+                context.set_code(grpc.StatusCode.FAILED_PRECONDITION if self.reranker is None
+                                 else grpc.StatusCode.UNAVAILABLE)
+                context.set_details("Re-ranking is not available.")
                 return similarity_search_pb2.SearchResponse()
+            # Кросс-энкодер выбирает лучшие limit из большего числа кандидатов
+            candidates = request.candidates or self.reranker.settings.CANDIDATES
+            fetch_limit = max(fetch_limit, min(candidates, self.reranker.settings.MAX_CANDIDATES))
+
+        # Бюджет токенов считается токенизатором модели сервиса
+        count_budget = request.group_pages and bool(request.max_tokens or self.grouping_settings.MAX_TOKENS)
+
+        try:
+            query_vector = None
+            tokenizer = None
+            if count_budget:
+                # Токенизатор загружается вне цикла событий и без весов модели
+                tokenizer = await asyncio.to_thread(self.manager_model.get_tokenizer,
+                                                    "intfloat/multilingual-e5-small")
 
-            logger.info("Encoding query text into vector")
-            query_vector = model.encode(request.text).tolist()
+            if dense:
+                logger.info("Encoding query text into vector")
+                query_vector = (await self.batcher.encode([request.text],
+                                                          model_name="intfloat/multilingual-e5-small"))[0]
+
+            query_sparse = self.sparse_encoder.encode_query(request.text) if sparse else None
 
             try:
-                logger.info(f"Searching in collection '{request.collection}' with limit {min(request.limit, 10)}")
-                search_results = self.qdrant_client.search(
-                    collection_name=request.collection,
-                    query_vector=query_vector,
-                    limit=min(request.limit, 10)
-                )
-            except (ValueError, TypeError) as e:
+                logger.info(f"Searching in collection '{request.collection}' with limit {fetch_limit}")
+                if dense and sparse:
+                    search_results = await self.fragments_db.search_hybrid(
+                        collection_name=request.collection,
+                        query_vector=query_vector,
+                        query_sparse=query_sparse,
+                        limit=fetch_limit,
+                        hnsw_ef=request.hnsw_ef,
+                        exact=exact,
+                        query_filter=query_filter,
+                        with_payload=fetch_fields,
+                        score_threshold=score_threshold
+                    )
+                elif sparse:
+                    search_results = await self.fragments_db.search_sparse(
+                        collection_name=request.collection,
+                        query_sparse=query_sparse,
+                        limit=fetch_limit,
+                        query_filter=query_filter,
+                        with_payload=fetch_fields,
+                        score_threshold=score_threshold
+                    )
+                else:
+                    search_results = await self.fragments_db.search(
+                        collection_name=request.collection,
+                        query_vector=query_vector,
+                        limit=fetch_limit,
+                        hnsw_ef=request.hnsw_ef,
+                        exact=exact,
+                        query_filter=query_filter,
+                        with_payload=fetch_fields,
+                        score_threshold=score_threshold
+                    )
+            except (VectorDBException, TypeError) as e:
                 logger.error(f"Error searching Qdrant: {e}")
                 context.set_code(grpc.StatusCode.INTERNAL)
                 context.set_details("Error processing the search request.")
                 return similarity_search_pb2.SearchResponse()
 
-            fragment_results = []
-            for result in search_results:
-                meta = {
-                    "page_id": result.payload.get("page_id"),
-                    "title": result.payload.get("title"),
-                    "time_request": result.payload.get("time_request"),
-                }
-
-                fragment_results.append(
-                    similarity_search_pb2.FragmentResult(
-                        text=result.payload.get("text", ""),
-                        meta=json.dumps(meta, ensure_ascii=False),
-                        score=result.score
-                    )
-                )
+            scores = [result.score for result in search_results]
+            if request.rerank:
+                scores = await self.reranker.score(request.text,
+                                                   [result.payload.get("text", "") for result in search_results])
+                ranked = sorted(zip(scores, search_results), key=lambda item: item[0], reverse=True)
+                scores = [score for score, _ in ranked]
+                search_results = [result for _, result in ranked]
+
+            if request.group_pages:
+                hits = [ChunkHit(score=score, payload=result.payload or {})
+                        for result, score in zip(search_results, scores)]
+                fragment_results = await self._group_fragments(request, hits, limit, fields, tokenizer=tokenizer)
+            else:
+                fragment_results = [self._make_result(score, result.payload or {}, fields)
+                                    for result, score in zip(search_results[:limit], scores)]
+
+            response = similarity_search_pb2.SearchResponse(similar_fragments=fragment_results)
+            if cache_key is not None:
+                self.result_cache.set(cache_key, response.SerializeToString())
 
             logger.info("Returning search response with results")
-            return similarity_search_pb2.SearchResponse(similar_fragments=fragment_results)
+            return response
 
         except (grpc.RpcError, ValueError, TypeError) as e:
             logger.error(f"Error during similarity search: {e}")
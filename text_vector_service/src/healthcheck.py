@@ -0,0 +1,20 @@
+import sys
+
+import grpc
+from core.config import grpc_server_settings as settings
+from grpc_health.v1 import health_pb2, health_pb2_grpc
+
+
+def main() -> int:
+    """Проверка готовности для healthcheck контейнера: 0 - SERVING, 1 - иначе."""
+    with grpc.insecure_channel(f"localhost:{settings.PORT}") as channel:
+        stub = health_pb2_grpc.HealthStub(channel)
+        try:
+            response = stub.Check(health_pb2.HealthCheckRequest(service=""), timeout=2)
+        except grpc.RpcError:
+            return 1
+    return 0 if response.status == health_pb2.HealthCheckResponse.SERVING else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+import asyncio
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+import torch
+from core.config import EncoderSettings, InferenceSettings
+from core.logger import get_logger
+from model_manager import ModelManager
+
+logger = get_logger(__name__)
+
+# Копия менеджера моделей внутри процесса-воркера (только для режима "process")
+_worker_manager: ModelManager | None = None
+
+
+def _pin_torch_threads(torch_threads: int) -> None:
+    if torch_threads > 0:
+        torch.set_num_threads(torch_threads)
+
+
+def _init_process_worker(encoder_settings: EncoderSettings, torch_threads: int) -> None:
+    global _worker_manager
+    _pin_torch_threads(torch_threads)
+    _worker_manager = ModelManager(settings=encoder_settings)
+
+
+def _load_model(manager_model: ModelManager | None, model_name: str) -> None:
+    manager = manager_model or _worker_manager
+    if manager is None:
+        msg = "Model manager is not initialized in the inference worker."
+        raise RuntimeError(msg)
+
+    manager.get_model(model_name)
+
+
+def _encode(manager_model: ModelManager | None, model_name: str, texts: list[str], batch_size: int) -> list[list[float]]:
+    manager = manager_model or _worker_manager
+    if manager is None:
+        msg = "Model manager is not initialized in the inference worker."
+        raise RuntimeError(msg)
+
+    model = manager.get_model(model_name)
+    return model.encode(texts, batch_size=batch_size, convert_to_numpy=True).tolist()
+
+
+class InferenceExecutor:
+    def __init__(self, manager_model: ModelManager, encoder_settings: EncoderSettings, settings: InferenceSettings):
+        """
+        Пул для выполнения блокирующего инференса вне event loop grpc.aio сервера.
+
+        В режиме "thread" воркеры используют общий ModelManager (torch отпускает GIL на время инференса),
+        в режиме "process" каждый процесс-воркер загружает собственную копию модели.
+
+        Args:
+            manager_model (ModelManager): менеджер моделей основного процесса
+            encoder_settings (EncoderSettings): настройки энкодера
+            settings (InferenceSettings): настройки пула
+        """
+        self._manager_model = manager_model
+        self._settings = settings
+        self._pool: Executor = self._create_pool(encoder_settings)
+
+    @property
+    def workers(self) -> int:
+        return self._settings.WORKERS
+
+    def _create_pool(self, encoder_settings: EncoderSettings) -> Executor:
+        logger.info(f"Starting inference executor: mode '{self._settings.EXECUTOR}', "
+                    f"workers {self._settings.WORKERS}, torch threads {self._settings.TORCH_THREADS or 'default'}")
+
+        if self._settings.EXECUTOR == "process":
+            return ProcessPoolExecutor(
+                max_workers=self._settings.WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process_worker,
+                initargs=(encoder_settings, self._settings.TORCH_THREADS),
+            )
+
+        _pin_torch_threads(self._settings.TORCH_THREADS)
+        return ThreadPoolExecutor(max_workers=self._settings.WORKERS, thread_name_prefix="inference")
+
+    @property
+    def _pool_manager_model(self) -> ModelManager | None:
+        return None if self._settings.EXECUTOR == "process" else self._manager_model
+
+    async def load_model(self, model_name: str) -> None:
+        """
+        Загружает модель во всех воркерах пула.
+
+        В режиме "process" задача отправляется по числу воркеров, чтобы модель
+        загрузилась в каждом процессе до первого запроса.
+
+        Args:
+            model_name (str): имя модели
+        """
+        calls = self.workers if self._settings.EXECUTOR == "process" else 1
+        await asyncio.gather(*(self.run(_load_model, self._pool_manager_model, model_name) for _ in range(calls)))
+
+    async def encode(self, model_name: str, texts: list[str], batch_size: int = 32) -> list[list[float]]:
+        return await self.run(_encode, self._pool_manager_model, model_name, texts, batch_size)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, partial(func, *args))
+
+    async def shutdown(self) -> None:
+        # Ожидание воркеров в отдельном потоке, чтобы не блокировать event loop
+        await asyncio.to_thread(self._pool.shutdown, wait=True, cancel_futures=True)
+        logger.info("Inference executor stopped.")
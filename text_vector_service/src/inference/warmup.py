@@ -0,0 +1,79 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+from core.config import EncoderSettings
+from core.logger import get_logger
+from model_manager import ModelManager
+
+from . import InferenceExecutor
+
+logger = get_logger(__name__)
+
+WARMUP_QUERY = "query: Какой актер сыграл главную роль в фильме?"
+WARMUP_PASSAGE_PART = "Заголовок страницы: фильм. Фрагмент текста для прогрева модели."
+
+
+@dataclass
+class StartupTimings:
+    imports: float = 0.0
+    download: float = 0.0
+    load: float = 0.0
+    warmup: float = 0.0
+
+    def __str__(self) -> str:
+        return (f"imports={self.imports:.1f} s, download={self.download:.1f} s, "
+                f"load={self.load:.1f} s, warmup={self.warmup:.1f} s")
+
+
+def make_warmup_batches(settings: EncoderSettings) -> list[list[str]]:
+    """
+    Синтетические батчи: одиночный короткий запрос, полный батч коротких запросов
+    и полный батч длинных фрагментов, которые обрезаются до MAX_LENGTH токенов.
+    """
+    passage = "passage: " + " ".join([WARMUP_PASSAGE_PART] * (settings.MAX_LENGTH // 8))
+    return [
+        [WARMUP_QUERY],
+        [WARMUP_QUERY] * settings.BATCH_MAX_SIZE,
+        [passage] * settings.BATCH_MAX_SIZE,
+    ]
+
+
+async def warm_up(executor: InferenceExecutor,
+                  manager_model: ModelManager,
+                  settings: EncoderSettings,
+                  timings: StartupTimings) -> None:
+    """
+    Скачивает и загружает модель по умолчанию и её токенизатор, затем прогоняет синтетические батчи,
+    чтобы первый запрос не платил за инициализацию токенизатора и ядер.
+
+    Args:
+        executor (InferenceExecutor): пул инференса
+        manager_model (ModelManager): менеджер моделей основного процесса
+        settings (EncoderSettings): настройки энкодера
+        timings (StartupTimings): сюда записываются длительности этапов
+    """
+    model_name = settings.MODEL_NAME
+
+    started_at = time.perf_counter()
+    try:
+        await asyncio.to_thread(manager_model.download_model, model_name)
+    except OSError as e:
+        # Без сети модель ещё может загрузиться из LOCAL_MODEL_PATH
+        logger.warning(f"Model '{model_name}' download failed, trying local files: {e}")
+    timings.download = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    await executor.load_model(model_name)
+    # Токенизатор для подсчёта токенов в основном процессе, в режиме "process" без копии весов
+    await asyncio.to_thread(manager_model.get_tokenizer, model_name)
+    timings.load = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    batches = make_warmup_batches(settings)
+    for _ in range(settings.WARMUP_ROUNDS):
+        for batch in batches:
+            # По батчу на каждого воркера, чтобы прогрелись все процессы пула
+            await asyncio.gather(*(executor.encode(model_name, batch, batch_size=settings.BATCH_MAX_SIZE)
+                                   for _ in range(executor.workers)))
+    timings.warmup = time.perf_counter() - started_at
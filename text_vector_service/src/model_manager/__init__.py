@@ -1,10 +1,67 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+
 import torch
 from core.config import EncoderSettings, encoder_settings
 from core.logger import get_logger
+from huggingface_hub import snapshot_download
 from sentence_transformers import SentenceTransformer
+from transformers import AutoTokenizer, PreTrainedTokenizerBase
+
+from .onnx_backend import check_parity, get_model_file, load_onnx_model
 
 logger = get_logger(__name__)
 
+# Каталоги других форматов весов в репозиториях моделей
+SKIPPED_WEIGHT_DIRS = {"onnx", "openvino"}
+
+
+@dataclass
+class ModelManagerStats:
+    hits: int = 0
+    loads: int = 0
+    load_seconds: float = 0.0
+    evictions: int = 0
+    resident_bytes: int = 0
+    model_sizes: dict[str, int] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        return (f"hits={self.hits}, loads={self.loads}, load_seconds={self.load_seconds:.1f}, "
+                f"evictions={self.evictions}, resident={self.resident_bytes / 1024 / 1024:.0f} MB, "
+                f"models={list(self.model_sizes)}")
+
+
+def get_repo_id(model_name: str) -> str:
+    # SentenceTransformer так же дополняет короткие имена организацией sentence-transformers
+    return model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+
+
+def get_weights_size(cache_dir: str, model_name: str) -> int:
+    """
+    Размер torch весов модели, уже скачанной в кэш Hugging Face.
+
+    Args:
+        cache_dir (str): каталог кэша моделей
+        model_name (str): имя модели
+
+    Returns:
+        int: размер в байтах, 0 - модель не скачана
+    """
+    snapshots = Path(cache_dir) / f"models--{get_repo_id(model_name).replace('/', '--')}" / "snapshots"
+    size = 0
+    for snapshot in snapshots.glob("*"):
+        for pattern in ("*.safetensors", "pytorch_model.bin"):
+            files = [path for path in snapshot.rglob(pattern)
+                     if not SKIPPED_WEIGHT_DIRS.intersection(path.relative_to(snapshot).parts)]
+            if files:
+                size = max(size, sum(path.stat().st_size for path in files))
+                break
+    return size
+
 
 class ModelManager:
     _instance = None
@@ -19,31 +76,140 @@ class ModelManager:
             return
 
         self._settings = settings
-        self._models = {}
-        self._load_model(self._settings.MODEL_NAME)
+        self._models: OrderedDict[str, SentenceTransformer] = OrderedDict()
+        self._tokenizers: dict[str, PreTrainedTokenizerBase] = {}
+        self._model_sizes: dict[str, int] = {}  # Размеры сохраняются и после выгрузки модели
+        self._memory_budget = int(settings.MEMORY_BUDGET_MB * 1024 * 1024)
+        self._stats = ModelManagerStats()
+        self._lock = threading.Lock()
+        self._load_locks: dict[str, threading.Lock] = {}
         self._initialized = True  # Mark the instance as initialized
 
     def _load_model(self, model_name):
         if model_name in self._models:
             logger.info(f"Model '{model_name}' is already loaded, retrieving from cache.")
+            with self._lock:
+                self._stats.hits += 1
             return self._models[model_name]
         else:
             logger.info(f"Starting to load model '{model_name}'")
+            # Место освобождается до загрузки, иначе новая модель временно выходит за бюджет
+            self._make_room(self._estimate_size_before_load(model_name), keep=model_name)
+            started_at = time.perf_counter()
 
             cuda_available = torch.cuda.is_available()
             device = 'cuda' if cuda_available else 'cpu'
-            logger.info(f"CUDA available: {cuda_available}. Loading model on '{device}'.")
+            backend = self._settings.BACKEND
+            logger.info(f"CUDA available: {cuda_available}. Loading model on '{device}' with backend '{backend}'.")
 
-            model = SentenceTransformer(
-                model_name_or_path=model_name,
-                device=device,
-                cache_folder=self._settings.LOCAL_MODEL_PATH
-            )
+            if backend == "torch":
+                model = self._load_torch_model(model_name, device)
+            else:
+                model = load_onnx_model(model_name, self._settings, device, quantized=backend == "onnx-int8")
+                if self._settings.PARITY_CHECK:
+                    self._check_parity(model_name, model, device)
 
-            self._models[model_name] = model
-            logger.info(f"Model '{model_name}' loaded successfully on '{device}'")
+            load_seconds = time.perf_counter() - started_at
+            size = self._estimate_model_size(model_name, model)
+
+            with self._lock:
+                self._models[model_name] = model
+                self._model_sizes[model_name] = size
+                self._stats.loads += 1
+                self._stats.load_seconds += load_seconds
+
+            logger.info(f"Model '{model_name}' loaded successfully on '{device}' in {load_seconds:.1f} s, "
+                        f"size {size / 1024 / 1024:.0f} MB")
+            self._make_room(0, keep=model_name)
             return model
 
+    def _load_torch_model(self, model_name, device) -> SentenceTransformer:
+        return SentenceTransformer(
+            model_name_or_path=model_name,
+            device=device,
+            cache_folder=self._settings.LOCAL_MODEL_PATH
+        )
+
+    def _check_parity(self, model_name, model, device) -> None:
+        reference = self._load_torch_model(model_name, device)
+        mean_drift, max_drift = check_parity(reference, model)
+        del reference
+
+        message = (f"Parity check for '{model_name}' ({self._settings.BACKEND} vs torch): "
+                   f"mean cosine drift {mean_drift:.5f}, max {max_drift:.5f}")
+        if max_drift > self._settings.PARITY_MAX_DRIFT:
+            logger.warning(f"{message} exceeds the allowed {self._settings.PARITY_MAX_DRIFT}")
+        else:
+            logger.info(message)
+
+    def _estimate_size_before_load(self, model_name) -> int:
+        if model_name in self._model_sizes:
+            return self._model_sizes[model_name]
+
+        configured_mb = self._settings.MODEL_SIZES_MB.get(model_name)
+        if configured_mb:
+            return int(configured_mb * 1024 * 1024)
+
+        backend = self._settings.BACKEND
+        if backend != "torch":
+            model_file = get_model_file(self._settings, model_name, quantized=backend == "onnx-int8")
+            if model_file.exists():
+                return model_file.stat().st_size
+
+        size = get_weights_size(self._settings.LOCAL_MODEL_PATH, model_name)
+        if backend == "onnx-int8":
+            # Ещё не квантованная модель: int8 веса вчетверо меньше fp32
+            size //= 4
+        if not size:
+            logger.warning(f"Size of model '{model_name}' is unknown before loading, "
+                           f"set it in ENCODER_MODEL_SIZES_MB to free memory in advance")
+        return size
+
+    def _estimate_model_size(self, model_name, model) -> int:
+        size = sum(tensor.numel() * tensor.element_size() for tensor in chain(model.parameters(), model.buffers()))
+        if size == 0 and self._settings.BACKEND != "torch":
+            # У ONNX Runtime моделей нет torch параметров, оцениваем по размеру файла модели
+            model_file = get_model_file(self._settings, model_name, quantized=self._settings.BACKEND == "onnx-int8")
+            size = model_file.stat().st_size if model_file.exists() else 0
+        return size
+
+    def _resident_bytes(self) -> int:
+        return sum(self._model_sizes.get(model_name, 0) for model_name in self._models)
+
+    def _make_room(self, required_bytes: int, keep: str) -> None:
+        """
+        Выгружает давно не использованные модели, пока не хватит бюджета памяти.
+
+        Модель по умолчанию и модель keep не выгружаются.
+        """
+        if not self._memory_budget:
+            return
+
+        evicted = []
+        with self._lock:
+            for model_name in list(self._models):
+                if self._resident_bytes() + required_bytes <= self._memory_budget:
+                    break
+                if model_name in (keep, self._settings.MODEL_NAME):
+                    continue
+                del self._models[model_name]
+                self._stats.evictions += 1
+                evicted.append(model_name)
+
+        for model_name in evicted:
+            logger.info(f"Model '{model_name}' evicted to stay within the memory budget "
+                        f"of {self._settings.MEMORY_BUDGET_MB} MB")
+
+        if evicted and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+        if self._resident_bytes() + required_bytes > self._memory_budget:
+            logger.warning(f"Memory budget of {self._settings.MEMORY_BUDGET_MB} MB is exceeded by pinned models")
+
+    def _get_load_lock(self, model_name) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(model_name, threading.Lock())
+
     def get_model(self, model_name=None) -> SentenceTransformer:
         if model_name is None or model_name == "":
             model_name = self._settings.MODEL_NAME
@@ -52,15 +218,78 @@ class ModelManager:
             error_message = f"Model '{model_name}' is not allowed."
             raise ValueError(error_message)
 
-        if model_name not in self._models:
-            self._load_model(model_name)
-        return self._models[model_name]
+        with self._lock:
+            model = self._models.get(model_name)
+            if model is not None:
+                self._models.move_to_end(model_name)
+                self._stats.hits += 1
+                return model
+
+        # Конкурентные запросы одной и той же модели ждут единственную загрузку
+        with self._get_load_lock(model_name):
+            return self._load_model(model_name)
+
+    def get_tokenizer(self, model_name=None) -> PreTrainedTokenizerBase:
+        """
+        Токенизатор модели без загрузки её весов.
+
+        Если модель уже загружена в этом процессе, возвращается её токенизатор,
+        иначе загружается только токенизатор (в режиме "process" веса живут в воркерах пула).
+
+        Args:
+            model_name (str | None): имя модели, по умолчанию MODEL_NAME
+
+        Returns:
+            PreTrainedTokenizerBase: токенизатор
+        """
+        model_name = model_name or self._settings.MODEL_NAME
+        if model_name not in self._settings.ALLOWED_MODELS:
+            error_message = f"Model '{model_name}' is not allowed."
+            raise ValueError(error_message)
+
+        with self._lock:
+            model = self._models.get(model_name)
+            tokenizer = model.tokenizer if model is not None else self._tokenizers.get(model_name)
+        if tokenizer is not None:
+            return tokenizer
+
+        with self._get_load_lock(f"tokenizer:{model_name}"):
+            if model_name not in self._tokenizers:
+                logger.info(f"Loading tokenizer of model '{model_name}'")
+                self._tokenizers[model_name] = AutoTokenizer.from_pretrained(
+                    get_repo_id(model_name), cache_dir=self._settings.LOCAL_MODEL_PATH
+                )
+            return self._tokenizers[model_name]
+
+    def download_model(self, model_name=None) -> str:
+        """
+        Скачивает файлы модели в LOCAL_MODEL_PATH без загрузки в память.
+
+        Args:
+            model_name (str | None): имя модели, по умолчанию MODEL_NAME
+
+        Returns:
+            str: путь к локальной копии модели
+        """
+        model_name = model_name or self._settings.MODEL_NAME
+        return snapshot_download(repo_id=get_repo_id(model_name), cache_dir=self._settings.LOCAL_MODEL_PATH)
+
+    def get_stats(self) -> ModelManagerStats:
+        with self._lock:
+            return ModelManagerStats(hits=self._stats.hits,
+                                     loads=self._stats.loads,
+                                     load_seconds=self._stats.load_seconds,
+                                     evictions=self._stats.evictions,
+                                     resident_bytes=self._resident_bytes(),
+                                     model_sizes={name: self._model_sizes[name] for name in self._models})
+
     def unload_models(self):
-        logger.info("Unloading all models to free up memory.")
-        for model_name, model in self._models.items():
-            del model
-            logger.info(f"Model '{model_name}' unloaded.")
-        self._models.clear()
+        logger.info(f"Unloading all models to free up memory. Stats: {self.get_stats()}")
+        with self._lock:
+            for model_name, model in self._models.items():
+                del model
+                logger.info(f"Model '{model_name}' unloaded.")
+            self._models.clear()
 
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
@@ -0,0 +1,95 @@
+from pathlib import Path
+
+from core.config import EncoderSettings
+from core.logger import get_logger
+from sentence_transformers import (
+    SentenceTransformer,
+    export_dynamic_quantized_onnx_model,
+)
+
+logger = get_logger(__name__)
+
+ONNX_FILE_NAME = "onnx/model.onnx"
+
+PARITY_TEXTS = [
+    "query: Какой актер играл Ломоносова?",
+    "query: Кто снял фильм «Белое солнце пустыни»?",
+    "passage: Заголовок страницы: Чапаев (фильм). Начало фрагмента: советский художественный фильм 1934 года.",
+    "passage: «Ну, погоди!» — советский и российский мультипликационный сериал студии «Союзмультфильм».",
+    "query: Which movies did Federico Fellini direct?",
+]
+
+
+def get_export_path(settings: EncoderSettings, model_name: str) -> Path:
+    return Path(settings.LOCAL_MODEL_PATH) / "onnx" / model_name.replace("/", "__")
+
+
+def get_quantized_file_name(quantization: str) -> str:
+    return f"onnx/model_qint8_{quantization}.onnx"
+
+
+def get_model_file(settings: EncoderSettings, model_name: str, quantized: bool) -> Path:
+    file_name = get_quantized_file_name(settings.ONNX_QUANTIZATION) if quantized else ONNX_FILE_NAME
+    return get_export_path(settings, model_name) / file_name
+
+
+def load_onnx_model(model_name: str, settings: EncoderSettings, device: str, quantized: bool) -> SentenceTransformer:
+    """
+    Загружает ONNX версию модели, при первом запуске экспортирует её в LOCAL_MODEL_PATH.
+
+    Args:
+        model_name (str): имя модели
+        settings (EncoderSettings): настройки энкодера
+        device (str): устройство для инференса
+        quantized (bool): использовать динамически квантованную int8 модель
+
+    Returns:
+        SentenceTransformer: модель с ONNX Runtime бэкендом
+    """
+    export_path = get_export_path(settings, model_name)
+
+    if not (export_path / ONNX_FILE_NAME).exists():
+        logger.info(f"Exporting model '{model_name}' to ONNX into '{export_path}'")
+        model = SentenceTransformer(model_name_or_path=model_name,
+                                    device=device,
+                                    backend="onnx",
+                                    cache_folder=settings.LOCAL_MODEL_PATH)
+        model.save_pretrained(str(export_path))
+
+    file_name = ONNX_FILE_NAME
+    if quantized:
+        file_name = get_quantized_file_name(settings.ONNX_QUANTIZATION)
+        if not (export_path / file_name).exists():
+            logger.info(f"Quantizing ONNX model '{model_name}' to int8 ({settings.ONNX_QUANTIZATION})")
+            model = SentenceTransformer(model_name_or_path=str(export_path),
+                                        device=device,
+                                        backend="onnx",
+                                        model_kwargs={"file_name": ONNX_FILE_NAME})
+            export_dynamic_quantized_onnx_model(model, settings.ONNX_QUANTIZATION, str(export_path))
+
+    return SentenceTransformer(model_name_or_path=str(export_path),
+                               device=device,
+                               backend="onnx",
+                               model_kwargs={"file_name": file_name})
+
+
+def check_parity(reference: SentenceTransformer,
+                 candidate: SentenceTransformer,
+                 texts: list[str] | None = None) -> tuple[float, float]:
+    """
+    Косинусный дрейф векторов candidate относительно эталонной модели.
+
+    Args:
+        reference (SentenceTransformer): эталонная модель (torch)
+        candidate (SentenceTransformer): проверяемая модель
+        texts (list[str] | None): тексты для сравнения
+
+    Returns:
+        tuple[float, float]: средний и максимальный дрейф (1 - cos)
+    """
+    texts = texts or PARITY_TEXTS
+    reference_vectors = reference.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    candidate_vectors = candidate.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+
+    drift = 1 - (reference_vectors * candidate_vectors).sum(axis=1)
+    return float(drift.mean()), float(drift.max())
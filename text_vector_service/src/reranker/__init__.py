@@ -0,0 +1,84 @@
+import asyncio
+
+from cache import CacheStats, LRUCache
+from cache.embeddings import ENTRY_OVERHEAD_BYTES, text_hash
+from core.config import RerankSettings
+from core.logger import get_logger
+from sentence_transformers import CrossEncoder
+
+logger = get_logger(__name__)
+
+
+class Reranker:
+    def __init__(self, settings: RerankSettings, cache_dir: str):
+        """
+        Переранжирование кандидатов поиска кросс-энкодером.
+
+        Пары (запрос, фрагмент) оцениваются одним батчем, оценки кэшируются,
+        поэтому повторные запросы оценивают только новые фрагменты.
+
+        Args:
+            settings (RerankSettings): настройки кросс-энкодера
+            cache_dir (str): папка с моделями
+        """
+        self.settings = settings
+        self.cache_dir = cache_dir
+        self._model: CrossEncoder | None = None
+        self._cache = LRUCache(
+            max_bytes=int(settings.CACHE_MAX_MB * 1024 * 1024),
+            ttl=settings.CACHE_TTL,
+            sizeof=lambda key, value: ENTRY_OVERHEAD_BYTES + sum(len(part) for part in key),
+        )
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def load(self) -> None:
+        """Загружает кросс-энкодер, вызывается в фоне при старте сервиса."""
+        logger.info(f"Loading cross-encoder {self.settings.MODEL_NAME}")
+        self._model = CrossEncoder(self.settings.MODEL_NAME,
+                                   max_length=self.settings.MAX_LENGTH,
+                                   cache_dir=self.cache_dir)
+
+    def _score(self, pairs: list[tuple[str, str]]) -> list[float]:
+        scores = self._model.predict(pairs,
+                                     batch_size=self.settings.BATCH_SIZE,
+                                     show_progress_bar=False,
+                                     convert_to_numpy=True)
+        return scores.tolist()
+
+    async def score(self, query: str, texts: list[str]) -> list[float]:
+        """
+        Оценивает релевантность фрагментов запросу.
+
+        Args:
+            query (str): текст запроса
+            texts (list[str]): тексты фрагментов
+
+        Returns:
+            list[float]: оценки в порядке текстов, больше - релевантнее
+        """
+        if self._model is None:
+            msg = "Cross-encoder is not loaded."
+            raise RuntimeError(msg)
+
+        query_hash = text_hash(query)
+        keys = [(self.settings.MODEL_NAME, query_hash, text_hash(text)) for text in texts]
+        scores = [self._cache.get(key) for key in keys]
+
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            new_scores = await asyncio.to_thread(self._score, [(query, texts[i]) for i in missing])
+            for i, score in zip(missing, new_scores):
+                scores[i] = score
+                self._cache.set(keys[i], score)
+
+        return scores
+
+    def log_stats(self) -> None:
+        logger.info(f"Re-rank score cache: {self.stats}")
@@ -1,3 +1,7 @@
+import time
+
+STARTED_AT = time.perf_counter()
+
 import asyncio
 import signal
 import sys
@@ -6,10 +10,26 @@ from pathlib import Path
 
 import grpc
 import grpc_reflection.v1alpha.reflection as reflection
-from core.config import encoder_settings, vector_db_settings
+from batcher import DynamicBatcher
+from bm25 import BM25Encoder
+from cache import EmbeddingCache, SearchResultCache
+from core.config import (
+    cache_settings,
+    encoder_settings,
+    grouping_settings,
+    inference_settings,
+    rerank_settings,
+    sparse_settings,
+    vector_db_settings,
+)
 from core.config import grpc_server_settings as settings
 from core.logger import get_logger
+from database.fragments import FragmentsDB
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+from inference import InferenceExecutor
+from inference.warmup import StartupTimings, warm_up
 from model_manager import ModelManager
+from reranker import Reranker
 
 warnings.filterwarnings("ignore", category=UserWarning)
 
@@ -26,35 +46,104 @@ from grpc_generated import (
 from handlers.encoder import EncoderServicer
 from handlers.similarity_search import SimilaritySearchServicer
 
+IMPORTS_SECONDS = time.perf_counter() - STARTED_AT
+
 logger = get_logger(__name__)
 
 
-async def stop_server(server, db_connection, manager_model):
+async def load_models(health_servicer, service_names, executor, manager_model, reranker, timings):
+    """Фоновая загрузка и прогрев моделей, после которых сервис отвечает SERVING."""
+    try:
+        await warm_up(executor=executor, manager_model=manager_model, settings=encoder_settings, timings=timings)
+        if reranker is not None:
+            await asyncio.to_thread(reranker.load)
+            await reranker.score("warm-up", ["warm-up"])
+    except (OSError, RuntimeError, ValueError) as e:
+        logger.error(f"Model warm-up failed, the service stays NOT_SERVING: {e}")
+        return
+
+    for service_name in service_names:
+        await health_servicer.set(service_name, health_pb2.HealthCheckResponse.SERVING)
+    logger.info(f"Service is ready in {time.perf_counter() - STARTED_AT:.1f} s. Startup timings: {timings}")
+
+
+async def stop_server(server, health_servicer, warmup_task, fragments_db, manager_model, batcher, executor,
+                      embedding_cache, result_cache, reranker):
+    await health_servicer.enter_graceful_shutdown()
+    warmup_task.cancel()
     await server.stop(settings.TIMEOUT)
     logger.info("Server stopped successfully.")
 
+    await batcher.stop()
+    await executor.shutdown()
+
+    if embedding_cache is not None:
+        await embedding_cache.close()
+    if result_cache is not None:
+        result_cache.log_stats()
+    if reranker is not None:
+        reranker.log_stats()
+
     manager_model.unload_models()
     logger.info("Models unloaded successfully.")
 
-    db_connection = False  # noqa F841
+    await fragments_db.cleanup()
     logger.info("Database connection closed successfully.")
 
 
 async def serve():
+    timings = StartupTimings(imports=IMPORTS_SECONDS)
     server = grpc.aio.server()
 
     manager_model = ModelManager(settings=encoder_settings)
-
-    encode_servicer = EncoderServicer(manager_model=manager_model)
+    executor = InferenceExecutor(manager_model=manager_model,
+                                 encoder_settings=encoder_settings,
+                                 settings=inference_settings)
+    embedding_cache = None
+    if cache_settings.EMBEDDINGS_ENABLED:
+        embedding_cache = EmbeddingCache(settings=cache_settings, variant=encoder_settings.inference_variant)
+    batcher = DynamicBatcher(executor=executor, settings=encoder_settings, cache=embedding_cache)
+    batcher.start()
+
+    fragments_db = FragmentsDB(settings=vector_db_settings,
+                               sparse_settings=sparse_settings if sparse_settings.ENABLED else None)
+    await fragments_db.initialize()
+    result_cache = SearchResultCache(settings=cache_settings) if cache_settings.SEARCH_ENABLED else None
+    sparse_encoder = BM25Encoder(settings=sparse_settings) if sparse_settings.ENABLED else None
+    reranker = None
+    if rerank_settings.ENABLED:
+        reranker = Reranker(settings=rerank_settings, cache_dir=encoder_settings.LOCAL_MODEL_PATH)
+
+    encode_servicer = EncoderServicer(manager_model=manager_model,
+                                      batcher=batcher,
+                                      stream_max_in_flight=encoder_settings.STREAM_MAX_IN_FLIGHT)
     similarity_search_servicer = SimilaritySearchServicer(settings=vector_db_settings,
-                                                          manager_model=manager_model)
+                                                          manager_model=manager_model,
+                                                          batcher=batcher,
+                                                          fragments_db=fragments_db,
+                                                          result_cache=result_cache,
+                                                          sparse_encoder=sparse_encoder,
+                                                          reranker=reranker,
+                                                          grouping_settings=grouping_settings)
 
     encoder_pb2_grpc.add_EncoderServiceServicer_to_server(encode_servicer, server)
     similarity_search_pb2_grpc.add_SimilaritySearchServiceServicer_to_server(similarity_search_servicer, server)
 
-    service_names = (
+    health_servicer = health.aio.HealthServicer()
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+
+    # "" - общий статус сервера
+    health_service_names = (
+        "",
         encoder_pb2.DESCRIPTOR.services_by_name['EncoderService'].full_name,
         similarity_search_pb2.DESCRIPTOR.services_by_name['SimilaritySearchService'].full_name,
+    )
+    for service_name in health_service_names:
+        await health_servicer.set(service_name, health_pb2.HealthCheckResponse.NOT_SERVING)
+
+    service_names = (
+        *health_service_names[1:],
+        health_pb2.DESCRIPTOR.services_by_name['Health'].full_name,
         reflection.SERVICE_NAME,
     )
 
@@ -63,13 +152,14 @@ async def serve():
     server.add_insecure_port(f'{settings.HOST}:{settings.PORT}')
     logger.info(f"The server is running on host: {settings.HOST}, port:{settings.PORT}")
 
-    db_connection = True
-
     await server.start()
+    warmup_task = asyncio.create_task(load_models(health_servicer, health_service_names,
+                                                  executor, manager_model, reranker, timings))
 
     def graceful_shutdown(signum, frame):
         logger.info("Shutting down gracefully...")
-        asyncio.create_task(stop_server(server, db_connection, manager_model))
+        asyncio.create_task(stop_server(server, health_servicer, warmup_task, fragments_db, manager_model,
+                                        batcher, executor, embedding_cache, result_cache, reranker))
         logger.info("Server successfully stopped")
 
     signal.signal(signal.SIGINT, graceful_shutdown)
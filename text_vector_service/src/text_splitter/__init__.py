@@ -1,18 +1,24 @@
 from sentence_transformers import SentenceTransformer
+from transformers import PreTrainedTokenizerBase
 
 
 class TextSplitter:
-    def __init__(self, model: SentenceTransformer, chunk_size: int = 512, overlap_percentage: int = 15):
+    def __init__(self, model: SentenceTransformer | None = None, chunk_size: int = 512, overlap_percentage: int = 15,
+                 tokenizer: PreTrainedTokenizerBase | None = None):
         """
                 Инициализация сплиттера текста
 
                 Args:
-                    model (SentenceTransformer): модель
+                    model (SentenceTransformer | None): модель
                     chunk_size (int): Максимальный размер чанка в токенах
                     overlap_percentage (int): Процент пересечения между чанками (0-100)
+                    tokenizer (PreTrainedTokenizerBase | None): токенизатор, если модель не загружается
                 """
         self.model = model
-        self.tokenizer = self.model.tokenizer
+        self.tokenizer = tokenizer or self.model.tokenizer
+        if not self.tokenizer.is_fast:
+            msg = "TextSplitter requires a fast tokenizer with offset mapping support."
+            raise ValueError(msg)
         self.tokenizer.model_max_length = int(1e30)
         self.chunk_size = min(chunk_size, self.tokenizer.model_max_length)
         self.overlap_size = int(self.chunk_size * (overlap_percentage / 100))
@@ -28,32 +34,54 @@ class TextSplitter:
                 Returns:
                     List[str]: Список строк-чанков
                 """
-        title_tokens = self.tokenizer.encode(title + "\n\n", add_special_tokens=False, truncation=False)
-        title_length = len(title_tokens)
+        return self.split_texts([(title, text)])[0]
 
-        # Уменьшаем размер чанка на длину заголовка
-        adjusted_chunk_size = self.chunk_size - title_length
+    def split_texts(self, pages: list[tuple[str, str]]) -> list[list[str]]:
+        """
+                Разбивает несколько страниц за один вызов токенизатора.
 
-        tokens = self.tokenizer.encode(text, add_special_tokens=False, truncation=False)
+                Текст токенизируется один раз, чанки вырезаются из исходной строки
+                по смещениям токенов, без декодирования.
 
-        if len(tokens) <= adjusted_chunk_size:
-            return [title + "\n\n" + text]
+                Args:
+                    pages (list[tuple[str, str]]): Пары (заголовок, текст)
 
-        chunks_tokens = []
-        start = 0
+                Returns:
+                    list[list[str]]: Чанки для каждой страницы в порядке входа
+                """
+        if not pages:
+            return []
+
+        prefixes = [title + "\n\n" for title, _ in pages]
+        title_encodings = self.tokenizer(prefixes, add_special_tokens=False, truncation=False)
+        text_encodings = self.tokenizer([text for _, text in pages],
+                                        add_special_tokens=False,
+                                        truncation=False,
+                                        return_offsets_mapping=True)
+
+        result = []
+        for prefix, (_, text), title_ids, offsets in zip(prefixes,
+                                                         pages,
+                                                         title_encodings["input_ids"],
+                                                         text_encodings["offset_mapping"]):
+            # Уменьшаем размер чанка на длину заголовка
+            adjusted_chunk_size = self.chunk_size - len(title_ids)
+            result.append([prefix + chunk for chunk in self._split_by_offsets(text, offsets, adjusted_chunk_size)])
+        return result
+
+    def _split_by_offsets(self, text: str, offsets: list[tuple[int, int]], chunk_size: int) -> list[str]:
+        if len(offsets) <= chunk_size:
+            return [text]
 
-        while start < len(tokens):
-            end = min(start + adjusted_chunk_size, len(tokens))
-            chunks_tokens.append(tokens[start:end])
-            if end == len(tokens):
+        chunks = []
+        start = 0
+        while start < len(offsets):
+            end = min(start + chunk_size, len(offsets))
+            chunks.append(text[offsets[start][0]:offsets[end - 1][1]])
+            if end == len(offsets):
                 break
             start = end - self.overlap_size
 
-        chunks = []
-        for chunk_tokens in chunks_tokens:
-            chunk_text = self.tokenizer.decode(chunk_tokens, skip_special_tokens=True)
-            chunks.append(title + "\n\n" + chunk_text)
-
         return chunks
 
     def get_tokens_count(self, text: str) -> int:
@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+
+from bm25 import BM25Encoder, token_index
+from core.config import SparseSettings
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+
+class TestBM25Encoder(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = BM25Encoder(SparseSettings(LANGUAGE="russian", K1=1.2, B=0.75, AVG_LENGTH=4))
+
+    def weights(self, text: str) -> dict[int, float]:
+        vector = self.encoder.encode_document(text)
+        return dict(zip(vector.indices, vector.values))
+
+    def test_tokenize_stems_and_folds_yo(self):
+        self.assertEqual(self.encoder.tokenize("Актёр сыграл"), self.encoder.tokenize("актер СЫГРАЛ"))
+        self.assertEqual(self.encoder.tokenize("фильмы фильмов"), ["фильм", "фильм"])
+
+    def test_tokenize_without_stemming(self):
+        encoder = BM25Encoder(SparseSettings(LANGUAGE=""))
+        self.assertEqual(encoder.tokenize("Фильмы, фильмов!"), ["фильмы", "фильмов"])
+
+    def test_term_frequency_saturates(self):
+        once = self.weights("фильм а б в")[token_index("фильм")]
+        twice = self.weights("фильм фильм а б")[token_index("фильм")]
+        self.assertGreater(twice, once)
+        self.assertLess(twice, 2 * once)
+        self.assertLess(max(self.weights("фильм " * 100).values()), self.encoder.k1 + 1)
+
+    def test_long_fragments_are_normalized(self):
+        short = self.weights("фильм а б в")[token_index("фильм")]
+        long = self.weights("фильм " + "а " * 20)[token_index("фильм")]
+        self.assertGreater(short, long)
+
+    def test_query_has_unit_weights_without_duplicates(self):
+        vector = self.encoder.encode_query("фильм фильмы режиссер")
+        self.assertEqual(vector.indices, [token_index("фильм"), token_index("режиссер")])
+        self.assertEqual(vector.values, [1.0, 1.0])
+
+    def test_document_and_query_share_indices(self):
+        document = self.encoder.encode_document("Режиссёр снял фильм")
+        query = self.encoder.encode_query("режиссер фильма")
+        self.assertTrue(set(query.indices) <= set(document.indices))
+
+
+if __name__ == '__main__':
+    unittest.main()
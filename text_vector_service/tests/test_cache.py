@@ -0,0 +1,113 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+from cache import EmbeddingCache, LRUCache, SearchResultCache
+from cache.embeddings import pack_vector, text_hash, unpack_vector
+from core.config import CacheSettings
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.redis.data[key] = value
+
+    async def execute(self):
+        pass
+
+
+def make_cache(variant, redis=None):
+    cache = EmbeddingCache(CacheSettings(REDIS_HOST=None), variant=variant)
+    cache._redis = redis
+    return cache
+
+
+class TestEmbeddingCache(unittest.IsolatedAsyncioTestCase):
+
+    def test_key_depends_on_variant(self):
+        self.assertNotEqual(EmbeddingCache.make_key("torch-fp32", "e5", "текст"),
+                            EmbeddingCache.make_key("onnx-int8-avx2", "e5", "текст"))
+
+    def test_key_normalizes_text(self):
+        self.assertEqual(text_hash("Какой  актер\nиграл"), text_hash(" Какой актер играл "))
+
+    def test_pack_vector(self):
+        self.assertEqual(unpack_vector(pack_vector([0.5, -1.25, 3.0])), [0.5, -1.25, 3.0])
+
+    async def test_memory_hit_and_miss(self):
+        cache = make_cache("torch-fp32")
+        await cache.set_many("e5", ["один"], [[1.0, 2.0]])
+
+        self.assertEqual(await cache.get_many("e5", ["один", "два"]), [[1.0, 2.0], None])
+        self.assertEqual(await cache.get_many("other-model", ["один"]), [None])
+
+    async def test_shared_redis_is_split_by_variant(self):
+        redis = FakeRedis()
+        await make_cache("torch-fp32", redis).set_many("e5", ["один"], [[1.0, 2.0]])
+
+        self.assertEqual(await make_cache("onnx-int8-avx2", redis).get_many("e5", ["один"]), [None])
+        self.assertEqual(await make_cache("torch-fp32", redis).get_many("e5", ["один"]), [[1.0, 2.0]])
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_bytes=2, sizeof=lambda key, value: 1)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_skips_oversized_value(self):
+        cache = LRUCache(max_bytes=2)
+        cache.set("a", b"abc")
+        self.assertIsNone(cache.get("a"))
+
+    def test_expires(self):
+        cache = LRUCache(max_bytes=10, ttl=5, sizeof=lambda key, value: 1)
+        with patch("cache.lru.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("cache.lru.time.monotonic", return_value=104.0):
+            self.assertEqual(cache.get("a"), 1)
+        with patch("cache.lru.time.monotonic", return_value=106.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats.expirations, 1)
+
+
+class TestSearchResultCache(unittest.TestCase):
+
+    def test_key_depends_on_version_and_params(self):
+        key = SearchResultCache.make_key("docs", 1, 5, "запрос", exact=None, mode=0)
+        self.assertEqual(key, SearchResultCache.make_key("docs", 1, 5, "запрос", mode=0, exact=None))
+        self.assertNotEqual(key, SearchResultCache.make_key("docs", 2, 5, "запрос", exact=None, mode=0))
+        self.assertNotEqual(key, SearchResultCache.make_key("docs", 1, 5, "запрос", exact=False, mode=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from contextlib import closing
+
+from etl_wiki.db_iterator import SQLiteIterator, parse_datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+PAGE_IDS = [3, 5, 8, 13, 21, 34, 55]
+
+
+class TestSQLiteIterator(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(handle)
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            conn.execute("""
+                CREATE TABLE wiki_page (
+                    page_id INTEGER PRIMARY KEY, title TEXT, wikitext TEXT, url TEXT, source TEXT, lang TEXT,
+                    revision_id INTEGER, created_at TEXT, updated_at TEXT, time_request TEXT
+                )
+            """)
+            # Вставка не по порядку: итератор сортирует по page_id
+            conn.executemany(
+                "INSERT INTO wiki_page (page_id, title, wikitext, revision_id, time_request) VALUES (?, ?, ?, ?, ?)",
+                [(page_id, f"Страница {page_id}", f"'''Текст''' {page_id}", page_id * 10, "2024-11-01T10:00:00")
+                 for page_id in reversed(PAGE_IDS)],
+            )
+            conn.commit()
+
+    def tearDown(self):
+        os.remove(self.db_path)
+
+    def page_ids(self, iterator: SQLiteIterator) -> list[int]:
+        return [row[0] for row in iterator.iter_rows()]
+
+    def test_reads_all_pages_across_page_boundaries(self):
+        for page_size in (1, 2, 3, 7, 100):
+            with self.subTest(page_size=page_size):
+                self.assertEqual(self.page_ids(SQLiteIterator(self.db_path, page_size=page_size)), PAGE_IDS)
+
+    def test_max_documents(self):
+        iterator = SQLiteIterator(self.db_path, max_documents=4, page_size=3)
+        self.assertEqual(self.page_ids(iterator), PAGE_IDS[:4])
+
+    def test_resume_after_page_id(self):
+        iterator = SQLiteIterator(self.db_path, after_page_id=13, page_size=2)
+        self.assertEqual(self.page_ids(iterator), [21, 34, 55])
+
+    def test_range(self):
+        iterator = SQLiteIterator(self.db_path, max_documents=2, page_size=2).with_range(5, 34)
+        self.assertEqual(self.page_ids(iterator), [8, 13, 21, 34])
+
+    def test_consecutive_ranges_cover_all_pages(self):
+        iterator = SQLiteIterator(self.db_path, page_size=2)
+        bounds = [None, 8, 21, 55]
+        page_ids = [page_id for start, end in zip(bounds, bounds[1:])
+                    for page_id in self.page_ids(iterator.with_range(start, end))]
+        self.assertEqual(page_ids, PAGE_IDS)
+
+    def test_columns(self):
+        iterator = SQLiteIterator(self.db_path).with_columns("revision_id")
+        self.assertEqual(next(iterator.iter_rows()), (3, 30))
+
+        row = next(iter(iterator))
+        self.assertEqual((row.page_id, row.revision_id, row.title), (3, 30, None))
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            SQLiteIterator(self.db_path, columns=("page_id", "body"))
+
+    def test_rows_parse_wikitext_lazily(self):
+        row = next(iter(SQLiteIterator(self.db_path)))
+        self.assertEqual(row.title, "Страница 3")
+        self.assertEqual(row.text, "Текст 3")
+        self.assertEqual(parse_datetime(row.time_request).year, 2024)
+
+    def test_parse_datetime(self):
+        self.assertIsNone(parse_datetime(None))
+        self.assertIsNone(parse_datetime("не дата"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import sys
+import unittest
+
+from grouping import (
+    OVERLAP_PROBE_LENGTH,
+    ChunkHit,
+    count_tokens,
+    fit_token_budget,
+    group_hits,
+    merge_chunks,
+    merge_overlap,
+)
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+TITLE = "Заголовок страницы: Чапаев. Начало фрагмента:\n\n"
+# Общая часть соседних чанков не короче пробы, иначе перекрытие не ищется
+OVERLAP = "советский художественный фильм 1934 года братьев Васильевых"
+
+
+def make_hit(score, page_id, chunk_index, text=""):
+    return ChunkHit(score=score, payload={"page_id": page_id, "chunk_index": chunk_index, "text": text})
+
+
+class TestMergeOverlap(unittest.TestCase):
+
+    def test_probe_covers_the_overlap(self):
+        self.assertGreaterEqual(len(OVERLAP), OVERLAP_PROBE_LENGTH)
+
+    def test_no_overlap(self):
+        self.assertEqual(merge_overlap("первый срез", "второй срез"), "первый срез второй срез")
+
+    def test_partial_overlap(self):
+        merged = merge_overlap(f"Чапаев - {OVERLAP}", f"{OVERLAP}, снятый по роману")
+        self.assertEqual(merged, f"Чапаев - {OVERLAP}, снятый по роману")
+
+    def test_repeated_probe(self):
+        # Первое вхождение начала правого среза не продолжается до конца левого, перекрытие - второе
+        left = f"{OVERLAP} в прокате. Ремейк: {OVERLAP} в цвете"
+        right = f"{OVERLAP} в цвете вышел в 1960 году"
+        self.assertEqual(merge_overlap(left, right), f"{left} вышел в 1960 году")
+
+    def test_longest_overlap_wins(self):
+        left = f"начало {OVERLAP} {OVERLAP}"
+        right = f"{OVERLAP} {OVERLAP} конец"
+        self.assertEqual(merge_overlap(left, right), f"начало {OVERLAP} {OVERLAP} конец")
+
+    def test_empty_right(self):
+        self.assertEqual(merge_overlap("текст", ""), "текст")
+
+    def test_merge_chunks_keeps_one_title(self):
+        chunks = [f"{TITLE}Чапаев - {OVERLAP}", f"{TITLE}{OVERLAP}, снятый по роману"]
+        self.assertEqual(merge_chunks(chunks), f"{TITLE}Чапаев - {OVERLAP}, снятый по роману")
+
+    def test_merge_chunks_empty(self):
+        self.assertEqual(merge_chunks([]), "")
+
+
+class TestGroupHits(unittest.TestCase):
+
+    def test_max_pages(self):
+        hits = [make_hit(0.9, 1, 0), make_hit(0.8, 2, 0), make_hit(0.7, 1, 5), make_hit(0.6, 3, 0)]
+        fragments = group_hits(hits, max_pages=2, max_chunks_per_page=3)
+        self.assertEqual([(fragment.payload["page_id"], fragment.chunk_index) for fragment in fragments],
+                         [(1, 0), (1, 5), (2, 0)])
+
+    def test_max_chunks_per_page(self):
+        hits = [make_hit(0.9, 1, 4), make_hit(0.8, 1, 0), make_hit(0.7, 1, 2)]
+        fragments = group_hits(hits, max_pages=5, max_chunks_per_page=2)
+        self.assertEqual([fragment.chunk_index for fragment in fragments], [0, 4])
+
+    def test_adjacent_chunks_merged(self):
+        hits = [make_hit(0.7, 1, 3, f"{TITLE}{OVERLAP}, снятый по роману"),
+                make_hit(0.9, 1, 2, f"{TITLE}Чапаев - {OVERLAP}")]
+        fragments = group_hits(hits, max_pages=5, max_chunks_per_page=3)
+
+        self.assertEqual(len(fragments), 1)
+        self.assertEqual(fragments[0].chunk_index, 2)
+        self.assertEqual(fragments[0].chunk_count, 2)
+        self.assertAlmostEqual(fragments[0].score, 0.9)
+        self.assertEqual(fragments[0].text, f"{TITLE}Чапаев - {OVERLAP}, снятый по роману")
+
+    def test_hits_without_page_id_are_not_grouped(self):
+        hits = [ChunkHit(score=0.9, payload={"text": "а"}), ChunkHit(score=0.8, payload={"text": "б"})]
+        fragments = group_hits(hits, max_pages=2, max_chunks_per_page=3)
+        self.assertEqual([fragment.text for fragment in fragments], ["а", "б"])
+
+
+class TestTokenBudget(unittest.TestCase):
+
+    def test_oversized_fragment_skipped(self):
+        fragments = group_hits([make_hit(0.9, 1, 0), make_hit(0.8, 2, 0), make_hit(0.7, 3, 0)],
+                               max_pages=3, max_chunks_per_page=1)
+        selected = fit_token_budget(fragments, [6, 8, 3], max_tokens=10)
+        self.assertEqual([fragment.payload["page_id"] for fragment in selected], [1, 3])
+
+    def test_no_budget(self):
+        fragments = group_hits([make_hit(0.9, 1, 0), make_hit(0.8, 2, 0)], max_pages=2, max_chunks_per_page=1)
+        self.assertEqual(fit_token_budget(fragments, [100, 100], max_tokens=0), fragments)
+
+    def test_count_tokens(self):
+        def tokenizer(texts, add_special_tokens):
+            self.assertFalse(add_special_tokens)
+            return {"input_ids": [text.split() for text in texts]}
+
+        self.assertEqual(count_tokens(tokenizer, ["один два", "три"]), [2, 1])
+        self.assertEqual(count_tokens(tokenizer, []), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
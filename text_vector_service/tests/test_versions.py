@@ -0,0 +1,109 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from database.versions import (
+    CollectionVersions,
+    bump_collection_version,
+    version_point_id,
+)
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+
+class FakeQdrant:
+    def __init__(self):
+        self.collections = set()
+        self.points = {}
+
+    def collection_exists(self, collection_name):
+        return collection_name in self.collections
+
+    def create_collection(self, collection_name, vectors_config):
+        self.collections.add(collection_name)
+
+    def retrieve(self, collection_name, ids, with_payload):
+        return [SimpleNamespace(payload=self.points[point_id]) for point_id in ids if point_id in self.points]
+
+    def upsert(self, collection_name, points):
+        for point in points:
+            self.points[point.id] = point.payload
+
+
+class FakeAsyncQdrant:
+    def __init__(self, client: FakeQdrant):
+        self.client = client
+        self.retrieved = 0
+
+    async def collection_exists(self, collection_name):
+        return self.client.collection_exists(collection_name)
+
+    async def retrieve(self, collection_name, ids, with_payload):
+        self.retrieved += 1
+        return self.client.retrieve(collection_name, ids, with_payload)
+
+
+class TestBumpCollectionVersion(unittest.TestCase):
+
+    def test_version_grows(self):
+        client = FakeQdrant()
+        first = bump_collection_version(client, "docs")
+        second = bump_collection_version(client, "docs")
+
+        self.assertGreater(first, 0)
+        self.assertGreater(second, first)
+        self.assertEqual(client.points[version_point_id("docs")]["version"], second)
+
+    def test_version_grows_when_the_clock_goes_back(self):
+        client = FakeQdrant()
+        with patch("database.versions.time.time_ns", return_value=2_000_000_000_000):
+            first = bump_collection_version(client, "docs")
+        with patch("database.versions.time.time_ns", return_value=1_000_000_000_000):
+            second = bump_collection_version(client, "docs")
+        self.assertEqual(second, first + 1)
+
+    def test_concurrent_runs_write_different_versions(self):
+        # Оба запуска прочитали версию до записи другого
+        client = FakeQdrant()
+        bump_collection_version(client, "docs")
+        stale_points = dict(client.points)
+
+        with patch("database.versions.time.time_ns", return_value=3_000_000_000_000_000_000):
+            first = bump_collection_version(client, "docs")
+        client.points = stale_points
+        with patch("database.versions.time.time_ns", return_value=3_000_000_000_001_000_000):
+            second = bump_collection_version(client, "docs")
+        self.assertNotEqual(first, second)
+
+    def test_collections_are_independent(self):
+        client = FakeQdrant()
+        bump_collection_version(client, "docs")
+        self.assertNotIn(version_point_id("other"), client.points)
+
+
+class TestCollectionVersions(unittest.IsolatedAsyncioTestCase):
+
+    async def test_never_loaded(self):
+        versions = CollectionVersions(check_interval=5)
+        self.assertEqual(await versions.get(FakeAsyncQdrant(FakeQdrant()), "docs"), 0)
+
+    async def test_reads_once_per_interval(self):
+        client = FakeQdrant()
+        async_client = FakeAsyncQdrant(client)
+        versions = CollectionVersions(check_interval=5)
+        version = bump_collection_version(client, "docs")
+
+        with patch("database.versions.time.monotonic", return_value=100.0):
+            self.assertEqual(await versions.get(async_client, "docs"), version)
+        new_version = bump_collection_version(client, "docs")
+        with patch("database.versions.time.monotonic", return_value=104.0):
+            self.assertEqual(await versions.get(async_client, "docs"), version)
+        with patch("database.versions.time.monotonic", return_value=106.0):
+            self.assertEqual(await versions.get(async_client, "docs"), new_version)
+        self.assertEqual(async_client.retrieved, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()